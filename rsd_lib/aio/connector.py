@@ -0,0 +1,154 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import logging
+import os
+import ssl
+from urllib import parse
+
+from sushy import exceptions
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 100
+"""Default number of simultaneous connections to the Redfish service"""
+
+
+class Response(object):
+    """A fully read HTTP response, mimicking the requests library one."""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+
+class Connector(object):
+
+    def __init__(self, url, username=None, password=None, verify=True,
+                 limit=DEFAULT_LIMIT):
+        """An asyncio HTTP connector to a Redfish service
+
+        :param url: The base URL to the Redfish controller.
+        :param username: User account with admin/server-profile access
+            privilege
+        :param password: User account password
+        :param verify: Either a boolean value, a path to a CA_BUNDLE
+            file or directory with certificates of trusted CAs.
+        :param limit: The maximum number of simultaneous connections,
+            additional requests wait for a free connection.
+        """
+        if aiohttp is None:
+            raise ImportError('The asyncio support of rsd-lib requires the '
+                              'aiohttp library')
+        self._url = url
+        self._auth = None
+        if username or password:
+            self._auth = aiohttp.BasicAuth(username, password)
+        self._ssl = self._get_ssl_context(verify)
+        self._limit = limit
+        self._session = None
+
+    @staticmethod
+    def _get_ssl_context(verify):
+        if verify is True:
+            return None
+        elif verify is False:
+            return False
+        elif os.path.isdir(verify):
+            return ssl.create_default_context(capath=verify)
+        return ssl.create_default_context(cafile=verify)
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                auth=self._auth,
+                connector=aiohttp.TCPConnector(limit=self._limit))
+        return self._session
+
+    async def close(self):
+        """Close this connector and the associated HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _op(self, method, path='', data=None, headers=None):
+        """Generic RESTful request handler.
+
+        :param method: The HTTP method to be used, e.g: GET, POST,
+            PUT, PATCH, etc...
+        :param path: The sub-URI path to the resource.
+        :param data: Optional JSON data.
+        :param headers: Optional dictionary of headers.
+        :returns: A Response object.
+        :raises: ConnectionError
+        :raises: HTTPError
+        """
+        json_data = None
+        headers = dict(headers or {})
+        if data is not None:
+            json_data = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+
+        url = parse.urljoin(self._url, path)
+        LOG.debug('HTTP request: %(method)s %(url)s; '
+                  'headers: %(headers)s; body: %(data)s',
+                  {'method': method, 'url': url, 'headers': headers,
+                   'data': json_data})
+        try:
+            async with self._get_session().request(
+                    method, url, data=json_data, headers=headers,
+                    ssl=self._ssl) as resp:
+                response = Response(resp.status, resp.headers,
+                                    await resp.read())
+        except aiohttp.ClientError as e:
+            raise exceptions.ConnectionError(url=url, error=e)
+
+        exceptions.raise_for_response(method, url, response)
+        LOG.debug('HTTP response for %(method)s %(url)s: '
+                  'status code: %(code)s',
+                  {'method': method, 'url': url,
+                   'code': response.status_code})
+        return response
+
+    async def get(self, path='', data=None, headers=None):
+        return await self._op('GET', path, data, headers)
+
+    async def post(self, path='', data=None, headers=None):
+        return await self._op('POST', path, data, headers)
+
+    async def patch(self, path='', data=None, headers=None):
+        return await self._op('PATCH', path, data, headers)
+
+    async def put(self, path='', data=None, headers=None):
+        return await self._op('PUT', path, data, headers)
+
+    async def delete(self, path='', data=None, headers=None):
+        return await self._op('DELETE', path, data, headers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_args):
+        await self.close()
@@ -0,0 +1,87 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from sushy.resources import base
+
+from rsd_lib.aio import connector
+from rsd_lib.aio import resource
+from rsd_lib import main
+
+
+class _ServiceRoot(main.RSDLib):
+    """The RSDLib service root, loaded through an existing connector"""
+
+    def __init__(self, connector, path):
+        base.ResourceBase.__init__(self, connector, path)
+
+
+def _load_root(connector, root_prefix):
+    service_root = _ServiceRoot(connector, root_prefix)
+    root_class = main.get_root_class(service_root._rsd_api_version)
+    return root_class(connector, root_prefix,
+                      redfish_version=service_root._redfish_version)
+
+
+class RSDLib(object):
+
+    def __init__(self, base_url, username=None, password=None,
+                 root_prefix='/redfish/v1/', verify=True,
+                 limit=connector.DEFAULT_LIMIT):
+        """An asyncio client of a RSD Redfish service
+
+        :param base_url: The base URL to the Redfish controller. It
+            should include scheme and authority portion of the URL. For
+            example: https://mgmt.vendor.com
+        :param username: User account with admin/server-profile access
+            privilege
+        :param password: User account password
+        :param root_prefix: The default URL prefix. This part includes
+            the root service and version. Defaults to /redfish/v1
+        :param verify: Either a boolean value, a path to a CA_BUNDLE
+            file or directory with certificates of trusted CAs. If set to
+            True the driver will verify the host certificates; if False
+            the driver will ignore verifying the SSL certificate; if it's
+            a path the driver will use the specified certificate or one of
+            the certificates in the directory. Defaults to True.
+        :param limit: The maximum number of simultaneous connections to
+            the Redfish controller.
+        """
+        self._root_prefix = root_prefix
+        self._conn = connector.Connector(base_url, username, password,
+                                         verify, limit)
+        self._runner = resource.Runner(self._conn)
+
+    async def factory(self):
+        """Return the root resource according to RSD API Version
+
+        The service root is fetched once, both to find the RSD API version
+        and to load the matching RSDLibV2_x resource.
+
+        :raises: NotImplementedError, if the RSD API version is not
+            supported
+        :returns: an AsyncResource proxy of a RSDLibV2_x resource
+        """
+        return self._runner.wrap(await self._runner.run(
+            _load_root, self._runner.bridge, self._root_prefix))
+
+    async def close(self):
+        """Close the connections to the Redfish controller."""
+        await self._conn.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_args):
+        await self.close()
@@ -0,0 +1,249 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import collections
+import functools
+import json
+import logging
+
+from sushy import exceptions
+from sushy.resources import base
+
+LOG = logging.getLogger(__name__)
+
+
+class _PendingRequest(Exception):
+    """A request of a synchronous resource which has no response yet"""
+
+    def __init__(self, key, method, path, data, headers):
+        super(_PendingRequest, self).__init__(method, path)
+        self.key = key
+        self.method = method
+        self.path = path
+        self.data = data
+        self.headers = headers
+
+
+class Bridge(object):
+    """Synchronous connector answered by an asyncio connector
+
+    The synchronous resources wrapped by ``AsyncResource`` use it as their
+    connector. A request which has no response yet interrupts the running
+    synchronous call with ``_PendingRequest``; the ``Runner`` sends it
+    with the asyncio connector and replays the call, which then gets its
+    response from the collected ones.
+
+    A call is replayed from its start once per request, a call sending N
+    requests one after the other runs N + 1 times and parses
+    O(N ** 2) responses. This suits the calls of a single resource, e.g. a
+    refresh or an action, and collections whose members are fetched
+    concurrently ahead of the call, not long synchronous sequences.
+    """
+
+    def __init__(self):
+        self._responses = {}
+        self._counts = collections.Counter()
+
+    def _start(self, responses):
+        self._responses = responses
+        self._counts = collections.Counter()
+
+    def _stop(self):
+        self._start({})
+
+    def _op(self, method, path='', data=None, headers=None):
+        if method == 'GET':
+            key = (method, path)
+        else:
+            # Identical actions issued by the same call are told apart by
+            # their rank, GET responses are shared.
+            request = (method, path, json.dumps(data, sort_keys=True))
+            key = request + (self._counts[request],)
+            self._counts[request] += 1
+
+        try:
+            response = self._responses[key]
+        except KeyError:
+            raise _PendingRequest(key, method, path, data, headers)
+
+        if isinstance(response, exceptions.SushyError):
+            raise response
+        return response
+
+    def get(self, path='', data=None, headers=None):
+        return self._op('GET', path, data, headers)
+
+    def post(self, path='', data=None, headers=None):
+        return self._op('POST', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._op('PATCH', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._op('PUT', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._op('DELETE', path, data, headers)
+
+
+class Runner(object):
+
+    def __init__(self, connector):
+        """Run synchronous resource code on top of an asyncio connector
+
+        :param connector: An asyncio Connector instance
+        """
+        self._conn = connector
+        self.bridge = Bridge()
+
+    async def _send(self, method, path, data=None, headers=None):
+        try:
+            return await getattr(self._conn, method.lower())(
+                path, data=data, headers=headers)
+        except exceptions.SushyError as e:
+            # Raised again when the synchronous call reaches the request
+            return e
+
+    async def run(self, func, *args, prefetch=(), **kwargs):
+        """Run a synchronous callable, sending its requests asynchronously
+
+        :param func: The callable, it must only do requests through the
+            bridge of this runner. It is run again after every response,
+            see ``Bridge``.
+        :param prefetch: Paths fetched concurrently before the first run
+        :returns: The value returned by the callable
+        """
+        responses = {}
+        if prefetch:
+            paths = list(prefetch)
+            bodies = await asyncio.gather(
+                *[self._send('GET', path) for path in paths])
+            responses.update((('GET', path), body)
+                             for path, body in zip(paths, bodies))
+
+        while True:
+            self.bridge._start(responses)
+            try:
+                return func(*args, **kwargs)
+            except _PendingRequest as e:
+                pending = e
+            finally:
+                self.bridge._stop()
+
+            LOG.debug('Sending %(method)s %(path)s for %(func)s',
+                      {'method': pending.method, 'path': pending.path,
+                       'func': func})
+            responses[pending.key] = await self._send(
+                pending.method, pending.path, pending.data, pending.headers)
+
+    def wrap(self, value):
+        """Wrap synchronous resources into asynchronous proxies"""
+        if isinstance(value, base.ResourceCollectionBase):
+            return AsyncResourceCollection(value, self)
+        elif isinstance(value, base.ResourceBase):
+            return AsyncResource(value, self)
+        elif isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        return value
+
+
+class AsyncResource(object):
+    """Asynchronous proxy of a rsd-lib resource
+
+    Fields are read directly from the proxy. Methods, including
+    ``refresh()`` and the actions, are coroutine functions. Properties
+    returning a sub-resource are loaded with ``await resource.load(name)``.
+    """
+
+    def __init__(self, resource, runner):
+        self._resource = resource
+        self._runner = runner
+
+    @property
+    def resource(self):
+        """The synchronous resource behind this proxy"""
+        return self._resource
+
+    def __getattr__(self, name):
+        try:
+            value = getattr(self._resource, name)
+        except _PendingRequest:
+            raise AttributeError(
+                'The attribute %(name)s of %(path)s must be fetched, use '
+                '"await load(\'%(name)s\')"' %
+                {'name': name, 'path': self._resource.path})
+
+        if callable(value):
+            return self._coroutine_function(value)
+        return self._runner.wrap(value)
+
+    def _coroutine_function(self, func):
+        @functools.wraps(func)
+        async def call(*args, **kwargs):
+            return self._runner.wrap(
+                await self._runner.run(func, *args, **kwargs))
+
+        return call
+
+    async def load(self, name):
+        """Return an attribute which may need to be fetched
+
+        :param name: The attribute name, e.g. "system" for a Node
+        :returns: The attribute value, resources are returned as proxies
+        """
+        return self._runner.wrap(
+            await self._runner.run(getattr, self._resource, name))
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self._resource)
+
+
+class AsyncResourceCollection(AsyncResource):
+    """Asynchronous proxy of a rsd-lib resource collection
+
+    Iterating the collection with ``async for`` fetches all its members
+    concurrently.
+    """
+
+    async def get_members(self):
+        """Return the members of the collection, fetched concurrently
+
+        :returns: A list of AsyncResource objects
+        """
+        return self._runner.wrap(await self._runner.run(
+            self._resource.get_members,
+            prefetch=self._resource.members_identities))
+
+    def __aiter__(self):
+        return _MemberIterator(self)
+
+
+class _MemberIterator(object):
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._members = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._members is None:
+            self._members = iter(await self._collection.get_members())
+        try:
+            return next(self._members)
+        except StopIteration:
+            raise StopAsyncIteration
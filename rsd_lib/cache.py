@@ -0,0 +1,324 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from six.moves.urllib import parse
+
+from rsd_lib import inventory
+from rsd_lib.resources import base as rsd_base
+from rsd_lib import utils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10000
+"""Default number of resources kept in a cache"""
+
+DEFAULT_TTL = 0
+"""Default number of seconds a cached resource is used without revalidation"""
+
+NOT_MODIFIED = 304
+
+
+def get_key(path):
+    """Return the cache key of a resource path
+
+    The query is part of the key, "/redfish/v1/Nodes?$expand=." and
+    "/redfish/v1/Nodes" are different entries.
+
+    :param path: A resource path or URL
+    :returns: The key
+    """
+    query = parse.urlparse(path).query
+    key = inventory.get_key(path)
+    return key + '?' + query if query else key
+
+
+class _Entry(object):
+
+    __slots__ = ('body', 'etag', 'fetched_at', 'expires_at')
+
+    def __init__(self, body, etag, fetched_at, expires_at):
+        self.body = body
+        self.etag = etag
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+
+class ResourceCache(object):
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL,
+                 ttls=None):
+        """A cache of resource JSON bodies, keyed by their @odata.id
+
+        A resource is used without any request during its time to live.
+        Once expired, it is revalidated with a conditional request if the
+        service gave it an ETag, and fetched again otherwise. The least
+        recently used resources are evicted when the cache is full.
+
+        :param max_size: The maximum number of cached resources
+        :param ttl: The default time to live of a resource, in seconds
+        :param ttls: A dict mapping resource type names, the last part of
+            their ``@odata.type`` e.g. "ComposedNode", to the time to live
+            of the resources of this type, overriding ``ttl``
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        """The number of requests answered without reaching the service"""
+
+        self.revalidations = 0
+        """The number of requests answered by a 304 Not Modified"""
+
+        self.misses = 0
+        """The number of requests answered by a full response"""
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_ttl(self, body):
+        """Return the time to live of a resource
+
+        :param body: The resource JSON body
+        :returns: A number of seconds
+        """
+        return self.ttls.get(inventory.get_type_name(body), self.ttl)
+
+    def _get(self, path):
+        key = get_key(path)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # Move it to the most recently used end
+                self._entries[key] = entry
+            return entry
+
+    def _new_entry(self, body, etag, fetched_at):
+        return _Entry(body, etag, fetched_at,
+                      fetched_at + self.get_ttl(body))
+
+    def _add(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _set(self, path, body, etag):
+        entry = self._new_entry(body, etag, time.time())
+        self._add(get_key(path), entry)
+        return entry
+
+    def get(self, path):
+        """Return the cached JSON body of a resource, None if missing"""
+        entry = self._get(path)
+        return None if entry is None else entry.body
+
+    def invalidate(self, path):
+        """Remove a resource from the cache
+
+        :param path: The resource path
+        """
+        key = get_key(path)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all the resources from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, path):
+        return get_key(path) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PersistentResourceCache(ResourceCache):
+
+    def __init__(self, path, namespace='', max_size=DEFAULT_MAX_SIZE,
+                 ttl=DEFAULT_TTL, ttls=None, timeout=5):
+        """A ResourceCache backed by a SQLite file
+
+        Resources are written to the file as they are fetched, and read
+        from it when missing from memory. A new process using the same
+        file starts with the resources of the previous ones: those still
+        within their time to live are used without any request, the
+        others are revalidated on their first use. The file may be shared
+        by concurrent processes.
+
+        :param path: The path of the SQLite file, created if missing
+        :param namespace: The name of the service in the file, e.g. its
+            base URL, so that several services can share a file
+        :param max_size: The maximum number of resources kept in memory,
+            the file keeps all of them until ``clear()``
+        :param ttl: The default time to live of a resource, in seconds,
+            counted from the time it was fetched
+        :param ttls: A dict mapping resource type names to their time to
+            live, see ResourceCache
+        :param timeout: The number of seconds to wait for another process
+            writing to the file
+        """
+        super(PersistentResourceCache, self).__init__(
+            max_size=max_size, ttl=ttl, ttls=ttls)
+        self.path = path
+        self.namespace = namespace
+        self._db = sqlite3.connect(path, timeout=timeout,
+                                   check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            # A lost write only costs a fetch, don't wait for the disk
+            self._db.execute('PRAGMA synchronous = OFF')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS resources ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, body TEXT, '
+                'etag TEXT, fetched_at REAL, '
+                'PRIMARY KEY (namespace, key))')
+
+    def _execute(self, statement, parameters):
+        try:
+            with self._db_lock, self._db:
+                return self._db.execute(statement, parameters).fetchall()
+        except sqlite3.Error as e:
+            LOG.warning('Failed to access the resource cache %(path)s: '
+                        '%(error)s', {'path': self.path, 'error': e})
+            return []
+
+    def _get(self, path):
+        entry = super(PersistentResourceCache, self)._get(path)
+        if entry is not None:
+            return entry
+
+        key = get_key(path)
+        rows = self._execute(
+            'SELECT body, etag, fetched_at FROM resources '
+            'WHERE namespace = ? AND key = ?', (self.namespace, key))
+        if not rows:
+            return None
+        body, etag, fetched_at = rows[0]
+        entry = self._new_entry(json.loads(body), etag, fetched_at)
+        self._add(key, entry)
+        return entry
+
+    def _set(self, path, body, etag):
+        entry = super(PersistentResourceCache, self)._set(path, body, etag)
+        self._execute(
+            'INSERT OR REPLACE INTO resources '
+            '(namespace, key, body, etag, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self.namespace, get_key(path), json.dumps(body), etag,
+             entry.fetched_at))
+        return entry
+
+    def invalidate(self, path):
+        super(PersistentResourceCache, self).invalidate(path)
+        self._execute('DELETE FROM resources WHERE namespace = ? AND '
+                      'key = ?', (self.namespace, get_key(path)))
+
+    def clear(self):
+        super(PersistentResourceCache, self).clear()
+        self._execute('DELETE FROM resources WHERE namespace = ?',
+                      (self.namespace,))
+
+    def __contains__(self, path):
+        return self._get(path) is not None
+
+    def close(self):
+        """Close the file"""
+        with self._db_lock:
+            self._db.close()
+
+
+class CachingConnector(object):
+    """Connector reading resources through a ResourceCache
+
+    Requests modifying a resource remove it, and the collection or
+    resource owning it, from the cache.
+    """
+
+    def __init__(self, connector, cache):
+        """Wrap a connector
+
+        :param connector: A Connector instance
+        :param cache: A ResourceCache instance, it may be shared by several
+            connectors to the same service
+        """
+        self._conn = connector
+        self.cache = cache
+
+    def get(self, path='', data=None, headers=None):
+        entry = self.cache._get(path)
+        if entry is not None and entry.expires_at > time.time():
+            self.cache.hits += 1
+            return utils.JsonResponse(entry.body)
+
+        if entry is not None and entry.etag is not None:
+            headers = dict(headers or {})
+            headers['If-None-Match'] = entry.etag
+
+        response = self._conn.get(path=path, data=data, headers=headers)
+        if response.status_code == NOT_MODIFIED and entry is not None:
+            LOG.debug('Resource %s not modified', path)
+            self.cache.revalidations += 1
+            self.cache._set(path, entry.body, entry.etag)
+            return utils.JsonResponse(entry.body)
+
+        try:
+            body = response.json()
+        except ValueError:
+            # Not a JSON resource, e.g. $metadata
+            return response
+
+        self.cache.misses += 1
+        etag = response.headers.get('ETag') or body.get('@odata.etag')
+        self.cache._set(path, body, etag)
+        return utils.JsonResponse(body, response.status_code,
+                                  response.headers)
+
+    def _invalidate(self, path):
+        key = inventory.get_key(path)
+        owner = key.split('/Actions/', 1)[0]
+        for stale in set([key, owner, owner.rsplit('/', 1)[0]]):
+            self.cache.invalidate(stale)
+            self.cache.invalidate(stale + '?' + rsd_base.EXPAND_QUERY)
+
+    def _op(self, method, path, data, headers):
+        try:
+            return getattr(self._conn, method)(path=path, data=data,
+                                               headers=headers)
+        finally:
+            self._invalidate(path)
+
+    def post(self, path='', data=None, headers=None):
+        return self._op('post', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._op('patch', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._op('put', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._op('delete', path, data, headers)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
@@ -0,0 +1,294 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import threading
+
+from requests import adapters
+from six.moves import http_client
+from sushy import connector as sushy_connector
+from sushy import exceptions
+from urllib3.util import retry
+
+from rsd_lib.resources import base as rsd_base
+
+try:
+    from sushy import auth as sushy_auth
+except ImportError:
+    # Before sushy 1.3, connectors neither have authentication objects nor
+    # refresh sessions
+    sushy_auth = None
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = rsd_base.DEFAULT_MAX_WORKERS
+"""Default number of connections kept open, one per concurrent request"""
+
+RETRY_STATUSES = (502, 503, 504)
+"""The statuses of the idempotent requests retried"""
+
+AUTH_TOKEN_HEADER = 'X-Auth-Token'
+
+
+class HTTPAdapter(adapters.HTTPAdapter):
+    """A requests adapter applying a default timeout to every request"""
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super(HTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super(HTTPAdapter, self).send(request, **kwargs)
+
+
+def get_retry(max_retries, backoff_factor=0):
+    """Return the retry policy of the requests
+
+    Only idempotent requests are retried, on connection errors and on the
+    ``RETRY_STATUSES``. The final response is returned as is, for the
+    connector to raise its error.
+
+    Unlike the default policy of requests, a read timeout counts as a
+    retry, even with ``max_retries=0``: once the retries are exhausted
+    requests raises a ConnectionError instead of a ReadTimeout, which the
+    connector raises as a sushy ConnectionError.
+
+    :param max_retries: The maximum number of retries of a request
+    :param backoff_factor: The retries sleep ``backoff_factor * 2 ** n``
+        seconds after the n-th retry
+    :returns: A urllib3 Retry
+    """
+    return retry.Retry(total=max_retries, backoff_factor=backoff_factor,
+                       status_forcelist=RETRY_STATUSES,
+                       raise_on_status=False)
+
+
+def configure(connector, pool_size=DEFAULT_POOL_SIZE, pool_block=False,
+              keep_alive=True, timeout=None, max_retries=0,
+              backoff_factor=0):
+    """Tune the HTTP session of a sushy connector
+
+    sushy does not expose the requests Session of its connectors, the
+    adapters are mounted on its private ``_session`` attribute, which
+    every sushy release since 1.0 has.
+
+    :param connector: A sushy Connector instance
+    :param pool_size: The number of connections kept open to the service.
+        It should be at least the number of concurrent requests, e.g. the
+        ``max_workers`` used to fetch collections: the connections beyond
+        it are closed after their request and opened again by the next
+        one, with a new TLS handshake.
+    :param pool_block: If True, the requests beyond ``pool_size`` wait for
+        a connection to be released instead of opening one
+    :param keep_alive: If False, every connection is closed after its
+        request
+    :param timeout: The number of seconds to wait for the service to
+        connect or send data, a (connect, read) tuple, or None to wait
+        forever. A read timeout is raised as a sushy ConnectionError, see
+        ``get_retry()``.
+    :param max_retries: The maximum number of retries of the idempotent
+        requests, see ``get_retry()``
+    :param backoff_factor: The factor of the delay between two retries
+    :returns: The connector
+    """
+    adapter = HTTPAdapter(timeout=timeout, pool_connections=pool_size,
+                          pool_maxsize=pool_size, pool_block=pool_block,
+                          max_retries=get_retry(max_retries, backoff_factor))
+    session = connector._session
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return connector
+
+
+def get_connector(url, username=None, password=None, verify=True):
+    """Return a sushy connector authenticating with HTTP basic auth
+
+    From sushy 1.3, a connector expects an authentication object to handle
+    a 401 or 403 response and raises AttributeError without one. It is
+    given a sushy BasicAuth, which never refreshes: the AccessError is
+    raised as is.
+
+    :param url: The base URL to the Redfish controller
+    :param username: User account with admin/server-profile access
+        privilege
+    :param password: User account password
+    :param verify: Whether the certificate of the service is verified, or
+        the path of the CA_BUNDLE file or directory to verify it with
+    :returns: A sushy Connector instance
+    """
+    if sushy_auth is None:
+        return sushy_connector.Connector(url, username, password, verify)
+
+    conn = sushy_connector.Connector(url, verify=verify)
+    if username or password:
+        conn.set_http_basic_auth(username, password)
+    conn.set_auth(sushy_auth.BasicAuth(username, password))
+    return conn
+
+
+class _SessionRoot(object):
+    """The parts of a sushy root resource creating a session
+
+    sushy's SessionAuth reads the SessionService from the root resource to
+    create a session. As the SessionService itself requires
+    authentication, the session is created by a POST to the
+    SessionCollection without reading it.
+    """
+
+    def __init__(self, connector, sessions_path):
+        self._conn = connector
+        self._sessions_path = sessions_path
+
+    def get_session_service(self):
+        return self
+
+    def create_session(self, username, password):
+        """Create a session
+
+        :returns: A (token, session path) tuple
+        :raises: MissingAttributeError, if the service returned no token
+        """
+        response = self._conn.post(
+            path=self._sessions_path,
+            data={'UserName': username, 'Password': password},
+            # Not the token of an expired session
+            headers={AUTH_TOKEN_HEADER: None})
+        token = response.headers.get(AUTH_TOKEN_HEADER)
+        if token is None:
+            raise exceptions.MissingAttributeError(
+                attribute=AUTH_TOKEN_HEADER, resource=self._sessions_path)
+        session_path = response.headers.get('Location')
+        LOG.debug('Session %s created', session_path)
+        return token, session_path
+
+
+class SessionConnector(object):
+    """Connector authenticating with a Redfish session token
+
+    The session is created on the first request, then its token is sent
+    with every request instead of the credentials. A request answered by
+    401 Unauthorized, e.g. once the session expired, creates a new session
+    and is sent again.
+
+    From sushy 1.3, the session is handled by a sushy SessionAuth set on
+    the wrapped connector, which refreshes it. Before, or if the wrapped
+    connector has no ``set_auth()``, the token is added to the requests by
+    this connector.
+
+    sushy logs the body of the requests at the debug level, including the
+    password of the request creating the session: keep the debug logs of
+    ``sushy.connector`` disabled when they may be read by others.
+    """
+
+    def __init__(self, connector, username, password,
+                 sessions_path='/redfish/v1/SessionService/Sessions'):
+        """Wrap a connector
+
+        :param connector: A Connector instance, without credentials
+        :param username: User account with admin/server-profile access
+            privilege
+        :param password: User account password
+        :param sessions_path: The path of the SessionCollection
+        """
+        self._conn = connector
+        self._username = username
+        self._password = password
+        self._root = _SessionRoot(connector, sessions_path)
+        self._token = None
+        self._session_path = None
+        self._lock = threading.Lock()
+        self._auth = None
+        if sushy_auth is not None and hasattr(connector, 'set_auth'):
+            self._auth = sushy_auth.SessionAuth(username, password)
+            self._auth.set_context(self._root, connector)
+
+    def _login(self, expired_token):
+        with self._lock:
+            if self._token is not None and self._token != expired_token:
+                # Another thread already created a new session
+                return self._token
+            if self._auth is not None:
+                self._auth.authenticate()
+                self._token = self._auth.get_session_key()
+                self._session_path = self._auth.get_session_resource_id()
+            else:
+                self._token, self._session_path = self._root.create_session(
+                    self._username, self._password)
+            return self._token
+
+    def _op(self, method, path, data, headers):
+        token = self._token
+        if token is None:
+            token = self._login(None)
+        if self._auth is not None:
+            # The connector sends the token and refreshes the session
+            return getattr(self._conn, method)(path=path, data=data,
+                                               headers=headers)
+        for attempt in range(2):
+            session_headers = dict(headers or {})
+            session_headers[AUTH_TOKEN_HEADER] = token
+            try:
+                return getattr(self._conn, method)(
+                    path=path, data=data, headers=session_headers)
+            except exceptions.AccessError as e:
+                if e.status_code != http_client.UNAUTHORIZED or attempt:
+                    raise
+                LOG.debug('Session token rejected, creating a new session')
+                token = self._login(token)
+
+    def get(self, path='', data=None, headers=None):
+        return self._op('get', path, data, headers)
+
+    def post(self, path='', data=None, headers=None):
+        return self._op('post', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._op('patch', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._op('put', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._op('delete', path, data, headers)
+
+    def logout(self):
+        """Delete the session, the next request creates a new one"""
+        with self._lock:
+            token, self._token = self._token, None
+            if token is None or self._session_path is None:
+                return
+            try:
+                if self._auth is not None:
+                    # The session may have been refreshed since the login
+                    self._auth.close()
+                else:
+                    self._conn.delete(path=self._session_path,
+                                      headers={AUTH_TOKEN_HEADER: token})
+            except exceptions.SushyError as e:
+                LOG.warning('Failed to delete session %(session)s: '
+                            '%(error)s',
+                            {'session': self._session_path, 'error': e})
+
+    def close(self):
+        """Delete the session and close the wrapped connector"""
+        self.logout()
+        self._conn.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
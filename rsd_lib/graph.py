@@ -0,0 +1,281 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+
+import six
+
+from rsd_lib import inventory
+
+RELATION_PROPERTIES = ('Links', 'CapacitySources', 'ConnectedEntities')
+"""The properties of a resource holding its relations to other resources"""
+
+STRUCTURAL_RELATIONS = frozenset([
+    'Chassis', 'ComputerSystems', 'ContainedBy', 'Contains', 'CooledBy',
+    'Interface', 'InvolvedSwitches', 'ManagedBy', 'ManagerForChassis',
+    'ManagerForServers', 'ManagerForSwitches', 'ManagerInChassis',
+    'ManagersInChassis', 'Metrics', 'Ports', 'PoweredBy', 'Switches'])
+"""Relations describing where a resource is, rather than what it uses
+
+They are part of the graph but are not followed by the dependency
+queries: a node doesn't depend on the other resources of its chassis.
+"""
+
+INITIATOR = 'Initiator'
+
+REVERSED_RELATIONS = frozenset([
+    ('Drive', 'Endpoints'),
+    ('Drive', 'Volumes'),
+    ('Endpoint', INITIATOR),
+    ('LogicalDrive', 'Targets'),
+    ('LogicalDrive', 'UsedBy'),
+    ('PhysicalDrive', 'UsedBy'),
+    ('Volume', 'Endpoints'),
+])
+"""The (type name, relation) of the links to the dependents of a resource
+
+Any other link goes from a resource to one of its dependencies, e.g. a
+storage pool to the drives providing its capacity.
+"""
+
+
+def iter_relations(body):
+    """Iterate over the relations of a resource JSON body
+
+    The relation of a link is the name of the property holding it, e.g.
+    "Zones" for the ``Links/Oem/Intel_RackScale/Zones`` of an endpoint,
+    or "ProvidingDrives" for the ``CapacitySources`` of a storage pool.
+    The relation of a connected entity of an endpoint is its role, e.g.
+    "Target" or "Initiator".
+
+    :param body: A resource JSON body
+    :returns: A generator of (relation, path) tuples
+    """
+    stack = []
+    for name in RELATION_PROPERTIES:
+        if name in body:
+            stack.append((name, body[name]))
+    while stack:
+        relation, value = stack.pop()
+        if isinstance(value, list):
+            stack.extend((relation, item) for item in value)
+        elif isinstance(value, dict):
+            link = value.get('@odata.id')
+            if isinstance(link, six.string_types):
+                yield relation, link
+                continue
+            if 'EntityLink' in value:
+                # A connected entity of an endpoint
+                stack.append((value.get('EntityRole') or 'EntityLink',
+                              value['EntityLink']))
+                continue
+            for key, item in value.items():
+                if '@' in key:
+                    continue
+                if key in ('Oem', 'Intel_RackScale'):
+                    stack.append((relation, item))
+                else:
+                    stack.append((key, item))
+
+
+class LinkGraph(object):
+
+    def __init__(self):
+        """A graph of the links between the resources of a pod
+
+        Every link of the relation properties of a resource is an edge,
+        labelled with its relation, kept both forward, from the resource
+        holding the link, and reverse, from the linked resource. Resources
+        are keyed by their normalized ``@odata.id``.
+        """
+        self._types = {}
+        self._forward = collections.defaultdict(set)
+        self._reverse = collections.defaultdict(set)
+
+    @classmethod
+    def from_inventory(cls, resources):
+        """Build the graph of the resources of an Inventory
+
+        :param resources: An Inventory, e.g. returned by
+            ``inventory.crawl()``
+        :returns: A LinkGraph
+        """
+        graph = cls()
+        for path in resources:
+            graph.add(path, resources.get(path))
+        return graph
+
+    def add(self, path, body):
+        """Add a resource, or replace its links
+
+        :param path: The resource path
+        :param body: The resource JSON body
+        """
+        key = inventory.get_key(path)
+        self.remove(key)
+        self._types[key] = inventory.get_type_name(body)
+        for relation, link in iter_relations(body):
+            target = inventory.get_key(link)
+            if target == key:
+                continue
+            self._forward[key].add((relation, target))
+            self._reverse[target].add((relation, key))
+
+    def remove(self, path):
+        """Remove the links of a resource, the links to it are kept"""
+        key = inventory.get_key(path)
+        self._types.pop(key, None)
+        for relation, target in self._forward.pop(key, ()):
+            self._reverse[target].discard((relation, key))
+
+    def get_type_name(self, path):
+        """Return the type name of a resource, None if unknown"""
+        return self._types.get(inventory.get_key(path))
+
+    def links(self, path, relation=None):
+        """Return the resources a resource links to
+
+        :param path: The resource path
+        :param relation: Only return the links of this relation, e.g.
+            "Zones"
+        :returns: A sorted list of paths
+        """
+        return sorted(target for name, target
+                      in self._forward.get(inventory.get_key(path), ())
+                      if relation is None or name == relation)
+
+    def referrers(self, path, relation=None):
+        """Return the resources linking to a resource
+
+        :param path: The resource path
+        :param relation: Only return the links of this relation, e.g.
+            "ProvidingDrives"
+        :returns: A sorted list of paths
+        """
+        return sorted(source for name, source
+                      in self._reverse.get(inventory.get_key(path), ())
+                      if relation is None or name == relation)
+
+    def _is_initiator(self, key):
+        return any(name == INITIATOR
+                   for name, _target in self._forward.get(key, ()))
+
+    def _depends(self, source, relation, target):
+        """Tell which resource of a link depends on the other
+
+        :returns: True if the source depends on the target, False if the
+            target depends on the source, None for a structural relation
+        """
+        if relation in STRUCTURAL_RELATIONS:
+            return None
+        source_type = self._types.get(source)
+        if (source_type, relation) in REVERSED_RELATIONS:
+            return False
+        if source_type == 'Zone' and self._is_initiator(target):
+            # The initiator uses the zone to reach the targets
+            return False
+        if source_type == 'Endpoint' and relation == 'Zones':
+            return self._is_initiator(source)
+        return True
+
+    def _iter_dependencies(self, key):
+        for relation, target in self._forward.get(key, ()):
+            if self._depends(key, relation, target) is True:
+                yield target
+        for relation, source in self._reverse.get(key, ()):
+            if self._depends(source, relation, key) is False:
+                yield source
+
+    def _iter_dependents(self, key):
+        for relation, source in self._reverse.get(key, ()):
+            if self._depends(source, relation, key) is True:
+                yield source
+        for relation, target in self._forward.get(key, ()):
+            if self._depends(key, relation, target) is False:
+                yield target
+
+    def _walk(self, path, neighbours):
+        """Return the resources reachable from a resource, breadth first
+
+        :returns: An OrderedDict mapping every reached resource to the one
+            it was reached from
+        """
+        start = inventory.get_key(path)
+        parents = collections.OrderedDict([(start, None)])
+        queue = collections.deque([start])
+        while queue:
+            key = queue.popleft()
+            for neighbour in sorted(neighbours(key)):
+                if neighbour not in parents:
+                    parents[neighbour] = key
+                    queue.append(neighbour)
+        del parents[start]
+        return parents
+
+    def _filter(self, keys, resource_name):
+        if resource_name is None:
+            return list(keys)
+        return [key for key in keys if self._types.get(key) == resource_name]
+
+    def dependencies(self, path, resource_name=None):
+        """Return the resources a resource depends on, transitively
+
+        :param path: The resource path, e.g. of a composed node
+        :param resource_name: Only return the resources of this type, e.g.
+            "Drive"
+        :returns: A list of paths, the closest first
+        """
+        keys = self._walk(path, self._iter_dependencies)
+        return self._filter(keys, resource_name)
+
+    def impact(self, path, resource_name=None):
+        """Return the resources depending on a resource, transitively
+
+        E.g. the composed nodes affected by the failure of a drive are
+        ``impact(drive_path, 'ComposedNode')``.
+
+        :param path: The resource path, e.g. of a drive
+        :param resource_name: Only return the resources of this type, e.g.
+            "ComposedNode"
+        :returns: A list of paths, the closest first
+        """
+        keys = self._walk(path, self._iter_dependents)
+        return self._filter(keys, resource_name)
+
+    def find_path(self, source, target):
+        """Return how a resource depends on another one
+
+        :param source: The path of the dependent resource, e.g. a node
+        :param target: The path of the dependency, e.g. a drive
+        :returns: The list of paths from ``source`` to ``target``, both
+            included, through the fewest dependencies. None if ``source``
+            doesn't depend on ``target``.
+        """
+        start = inventory.get_key(source)
+        parents = self._walk(start, self._iter_dependencies)
+        key = inventory.get_key(target)
+        if key not in parents:
+            return None
+        path = [key]
+        while key != start:
+            key = parents[key]
+            path.append(key)
+        return path[::-1]
+
+    def __contains__(self, path):
+        return inventory.get_key(path) in self._types
+
+    def __len__(self):
+        return len(self._types)
@@ -0,0 +1,369 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import collections
+import logging
+import threading
+import time
+
+from sushy import exceptions
+
+from rsd_lib import utils
+
+LOG = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+"""Upper bounds of the request latency histograms, in seconds"""
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+"""Upper bounds of the response size histograms, in bytes"""
+
+PARSE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                 0.025, 0.05, 0.1)
+"""Upper bounds of the JSON decoding and parsing histograms, in seconds"""
+
+UNKNOWN = 'unknown'
+"""Resource type of the requests whose resource couldn't be identified"""
+
+Request = collections.namedtuple(
+    'Request', ['method', 'path', 'resource_type', 'status_code', 'latency',
+                'size', 'decode_time'])
+"""A HTTP request sent to the service
+
+The status code is None if the service couldn't be reached, the decode
+time is None if the response has no JSON body.
+"""
+
+Parse = collections.namedtuple(
+    'Parse', ['path', 'resource_type', 'parse_time'])
+"""The parsing of the fields of a resource from its JSON body"""
+
+
+def get_resource_type(path, body):
+    """Return the resource type of a request
+
+    :param path: The request path
+    :param body: The JSON body of the response, or None
+    :returns: The last part of the ``@odata.type`` of the body, e.g.
+        "Volume", else the resource type of an action, e.g. "ComposedNode"
+        for "ComposedNode.Assemble", else UNKNOWN
+    """
+    odata_type = body.get('@odata.type') if isinstance(body, dict) else None
+    if odata_type is not None:
+        return odata_type.rsplit('.', 1)[-1]
+    _owner, sep, action = path.partition('/Actions/')
+    if sep:
+        return action.split('.', 1)[0]
+    return UNKNOWN
+
+
+def _get_size(response):
+    content = getattr(response, 'content', None)
+    return 0 if content is None else len(content)
+
+
+class Histogram(object):
+
+    def __init__(self, buckets):
+        """A distribution of observed values
+
+        :param buckets: The sorted upper bounds of the buckets, a last
+            bucket counts the values above them
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Add a value to the bucket of the lowest upper bound above it"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return the cumulative counts of the buckets
+
+        :returns: A list of (upper bound, count) tuples, the count of a
+            bucket includes the lower ones. The last upper bound is
+            ``float('inf')``.
+        """
+        bounds = self.buckets + (float('inf'),)
+        total = 0
+        counts = []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            counts.append((bound, total))
+        return counts
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    return ','.join('%s="%s"' % (name, value.replace('\\', '\\\\').replace(
+        '"', '\\"').replace('\n', '\\n')) for name, value in labels)
+
+
+class MetricsRegistry(object):
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS,
+                 size_buckets=SIZE_BUCKETS, parse_buckets=PARSE_BUCKETS):
+        """Aggregated measurements of the requests sent to a service
+
+        Requests are counted by method, resource type and status code. The
+        latency and response size of the requests are aggregated in
+        histograms by method and resource type, the JSON decoding and field
+        parsing times by resource type.
+
+        :param latency_buckets: The upper bounds of the latency histograms
+        :param size_buckets: The upper bounds of the response size
+            histograms
+        :param parse_buckets: The upper bounds of the decoding and parsing
+            time histograms
+        """
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self.parse_buckets = parse_buckets
+        self.requests = collections.Counter()
+        """Number of requests by (method, resource type, status code)"""
+
+        self.latencies = {}
+        """Latency Histogram by (method, resource type)"""
+
+        self.sizes = {}
+        """Response size Histogram by (method, resource type)"""
+
+        self.decode_times = {}
+        """JSON decoding time Histogram by resource type"""
+
+        self.parse_times = {}
+        """Field parsing time Histogram by resource type"""
+
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener):
+        """Call a function on every measurement
+
+        :param listener: A function called with a Request tuple after every
+            request, and with a Parse tuple after every parsing of a
+            resource. It is called by the thread which sent the request or
+            parsed the resource.
+        """
+        with self._lock:
+            # Replaced rather than modified, notifications iterate on it
+            self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        """Stop calling a function added by ``add_listener()``"""
+        with self._lock:
+            self._listeners = [other for other in self._listeners
+                               if other != listener]
+
+    def _notify(self, measurement):
+        for listener in self._listeners:
+            try:
+                listener(measurement)
+            except Exception as e:
+                LOG.warning('Instrumentation listener %(listener)r failed: '
+                            '%(error)s', {'listener': listener, 'error': e})
+
+    @staticmethod
+    def _observe(histograms, key, buckets, value):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    def observe_request(self, method, path, body, status_code, latency,
+                        size=0, decode_time=None):
+        """Record a request
+
+        :param method: The HTTP method, e.g. "GET"
+        :param path: The request path
+        :param body: The JSON body of the response, or None
+        :param status_code: The status code of the response, None if the
+            service couldn't be reached
+        :param latency: The number of seconds until the response
+        :param size: The size of the response body, in bytes
+        :param decode_time: The number of seconds spent decoding the JSON
+            body, None if the response has none
+        :returns: The recorded Request tuple
+        """
+        request = Request(method, path, get_resource_type(path, body),
+                          status_code, latency, size, decode_time)
+        key = (method, request.resource_type)
+        with self._lock:
+            self.requests[key + (status_code,)] += 1
+            self._observe(self.latencies, key, self.latency_buckets, latency)
+            self._observe(self.sizes, key, self.size_buckets, size)
+            if decode_time is not None:
+                self._observe(self.decode_times, request.resource_type,
+                              self.parse_buckets, decode_time)
+        self._notify(request)
+        return request
+
+    def observe_parse(self, path, body, parse_time):
+        """Record the parsing of a resource
+
+        :param path: The resource path
+        :param body: The JSON body of the resource
+        :param parse_time: The number of seconds spent parsing its fields
+        :returns: The recorded Parse tuple
+        """
+        parse = Parse(path, get_resource_type(path, body), parse_time)
+        with self._lock:
+            self._observe(self.parse_times, parse.resource_type,
+                          self.parse_buckets, parse_time)
+        self._notify(parse)
+        return parse
+
+    def reset(self):
+        """Forget every measurement, the listeners are kept"""
+        with self._lock:
+            self.requests.clear()
+            self.latencies.clear()
+            self.sizes.clear()
+            self.decode_times.clear()
+            self.parse_times.clear()
+
+    @staticmethod
+    def _export_histograms(lines, name, help_text, label_names, histograms):
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s histogram' % name)
+        for key in sorted(histograms):
+            values = key if isinstance(key, tuple) else (key,)
+            labels = list(zip(label_names, values))
+            histogram = histograms[key]
+            for bound, count in histogram.cumulative():
+                lines.append('%s_bucket{%s} %d' % (name, _format_labels(
+                    labels + [('le', _format_value(bound))]), count))
+            lines.append('%s_sum{%s} %s' % (name, _format_labels(labels),
+                                            _format_value(histogram.sum)))
+            lines.append('%s_count{%s} %d' % (name, _format_labels(labels),
+                                              histogram.count))
+
+    def export(self, prefix='rsd_lib'):
+        """Return the measurements in the Prometheus text format
+
+        Requests which couldn't reach the service have the "error" status.
+
+        :param prefix: The prefix of the metric names
+        :returns: A string, e.g. served on the /metrics path of an exporter
+        """
+        with self._lock:
+            lines = ['# HELP %s_requests_total Requests sent to the service'
+                     % prefix,
+                     '# TYPE %s_requests_total counter' % prefix]
+            for key in sorted(self.requests, key=str):
+                method, resource_type, status_code = key
+                status = 'error' if status_code is None else str(status_code)
+                lines.append('%s_requests_total{%s} %d' % (
+                    prefix, _format_labels([('method', method),
+                                            ('resource_type', resource_type),
+                                            ('status', status)]),
+                    self.requests[key]))
+            self._export_histograms(
+                lines, prefix + '_request_duration_seconds',
+                'Latency of the requests', ('method', 'resource_type'),
+                self.latencies)
+            self._export_histograms(
+                lines, prefix + '_response_size_bytes',
+                'Size of the response bodies', ('method', 'resource_type'),
+                self.sizes)
+            self._export_histograms(
+                lines, prefix + '_decode_duration_seconds',
+                'Time spent decoding the JSON bodies', ('resource_type',),
+                self.decode_times)
+            self._export_histograms(
+                lines, prefix + '_parse_duration_seconds',
+                'Time spent parsing the fields of the resources',
+                ('resource_type',), self.parse_times)
+        return '\n'.join(lines) + '\n'
+
+
+class InstrumentedConnector(object):
+    """Connector recording its requests in a MetricsRegistry
+
+    The JSON body of a response is decoded once, timed, and handed over to
+    the caller. Resources fetched through the connector record the time
+    spent parsing their fields in the same registry.
+    """
+
+    def __init__(self, connector, metrics):
+        """Wrap a connector
+
+        :param connector: A Connector instance
+        :param metrics: A MetricsRegistry instance, it may be shared by
+            several connectors
+        """
+        self._conn = connector
+        self.metrics = metrics
+
+    def _op(self, method, path, data, headers):
+        name = method.upper()
+        started = time.time()
+        try:
+            response = getattr(self._conn, method)(path=path, data=data,
+                                                   headers=headers)
+        except exceptions.HTTPError as e:
+            self.metrics.observe_request(name, path, None, e.status_code,
+                                         time.time() - started)
+            raise
+        except exceptions.ConnectionError:
+            self.metrics.observe_request(name, path, None, None,
+                                         time.time() - started)
+            raise
+
+        latency = time.time() - started
+        started = time.time()
+        try:
+            body = response.json()
+        except ValueError:
+            # No JSON body, e.g. an action or $metadata
+            self.metrics.observe_request(name, path, None,
+                                         response.status_code, latency,
+                                         _get_size(response))
+            return response
+
+        self.metrics.observe_request(name, path, body, response.status_code,
+                                     latency, _get_size(response),
+                                     time.time() - started)
+        return utils.JsonResponse(body, response.status_code,
+                                  response.headers)
+
+    def get(self, path='', data=None, headers=None):
+        return self._op('get', path, data, headers)
+
+    def post(self, path='', data=None, headers=None):
+        return self._op('post', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._op('patch', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._op('put', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._op('delete', path, data, headers)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
@@ -0,0 +1,257 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import logging
+
+from concurrent import futures
+import six
+from six.moves.urllib import parse
+from sushy import exceptions
+
+from rsd_lib.resources import base as rsd_base
+from rsd_lib import utils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_EXCLUDES = ('/redfish/v1/$metadata',
+                    '/redfish/v1/odata',
+                    '/redfish/v1/JsonSchemas',
+                    '/redfish/v1/Registries',
+                    '/redfish/v1/EventService',
+                    '/redfish/v1/SessionService',
+                    '/redfish/v1/TaskService')
+"""Paths which are not part of the pod inventory"""
+
+
+class InvalidBodyError(exceptions.SushyError):
+    message = 'The body of %(path)s is not valid JSON: %(error)s'
+
+
+def get_key(path):
+    """Return the key identifying a resource path in an inventory
+
+    Scheme, authority, fragment and trailing slash are ignored, so
+    "https://podm:8443/redfish/v1/Nodes/1/" and "/redfish/v1/Nodes/1" are
+    the same resource.
+
+    :param path: A resource path or URL
+    :returns: The normalized path
+    """
+    return parse.urlparse(path).path.rstrip('/') or '/'
+
+
+def get_type_name(body):
+    """Return the type name of a resource JSON body
+
+    :param body: A resource JSON body
+    :returns: The last part of its ``@odata.type``, e.g. "Volume" for
+        "#Volume.v1_1_0.Volume", None if it has no type
+    """
+    odata_type = body.get('@odata.type')
+    if odata_type is None:
+        return None
+    return odata_type.rsplit('.', 1)[-1]
+
+
+def iter_links(body):
+    """Iterate over the links to other resources found in a JSON body
+
+    :param body: A resource JSON body
+    :returns: A generator of resource paths, the body's own path excluded
+    """
+    stack = [value for key, value in body.items() if key != '@odata.id']
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            link = value.get('@odata.id')
+            if isinstance(link, six.string_types):
+                yield link
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+class InventoryConnector(object):
+    """Connector serving resources from an inventory
+
+    GET requests of resources present in the inventory don't reach the
+    network. Other requests are sent through the fallback connector, if
+    any.
+    """
+
+    def __init__(self, inventory, connector=None):
+        self._inventory = inventory
+        self._conn = connector
+
+    def _fallback(self, method, path, data, headers):
+        if self._conn is None:
+            raise exceptions.ResourceNotFoundError(
+                method, path, utils.JsonResponse({}, 404))
+        return getattr(self._conn, method.lower())(path, data=data,
+                                                   headers=headers)
+
+    def get(self, path='', data=None, headers=None):
+        body = self._inventory.get(path)
+        if body is not None:
+            return utils.JsonResponse(body)
+        return self._fallback('GET', path, data, headers)
+
+    def post(self, path='', data=None, headers=None):
+        return self._fallback('POST', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._fallback('PATCH', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._fallback('PUT', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._fallback('DELETE', path, data, headers)
+
+
+class Inventory(object):
+
+    def __init__(self, connector=None, redfish_version=None):
+        """An in-memory snapshot of the resources of a pod
+
+        Resources are JSON bodies keyed by their normalized ``@odata.id``.
+
+        :param connector: The connector used to reach the resources missing
+            from the inventory and to send actions, if None the inventory
+            works offline
+        :param redfish_version: The Redfish version given to the
+            materialized resources
+        """
+        self._bodies = collections.OrderedDict()
+        self.failures = collections.OrderedDict()
+        """The paths which could not be fetched, with their SushyError"""
+
+        self.redfish_version = redfish_version
+        self.connector = InventoryConnector(self, connector)
+
+    def add(self, path, body):
+        """Add or replace a resource of the inventory
+
+        :param path: The resource path
+        :param body: The resource JSON body
+        """
+        self._bodies[get_key(path)] = body
+
+    def get(self, path):
+        """Return the JSON body of a resource, None if it is missing"""
+        return self._bodies.get(get_key(path))
+
+    def find(self, resource_name):
+        """Return the paths of the resources of a given type
+
+        :param resource_name: The type name of the resources, the last
+            part of their ``@odata.type``, e.g. "Volume" or "ComposedNode"
+        :returns: A list of paths, in the order the resources were added
+        """
+        return [key for key, body in self._bodies.items()
+                if get_type_name(body) == resource_name]
+
+    def materialize(self, resource_type, path):
+        """Build a resource from the inventory
+
+        The resource and the sub-resources it returns are served from the
+        inventory, only missing resources and actions reach the network.
+
+        :param resource_type: The resource class, e.g. Volume
+        :param path: The resource path
+        :returns: A ``resource_type`` object
+        """
+        return resource_type(self.connector, path,
+                             redfish_version=self.redfish_version)
+
+    def __contains__(self, path):
+        return get_key(path) in self._bodies
+
+    def __iter__(self):
+        return iter(self._bodies)
+
+    def __len__(self):
+        return len(self._bodies)
+
+
+def crawl(connector, root_path='/redfish/v1/', root_json=None,
+          max_workers=rsd_base.DEFAULT_MAX_WORKERS, excludes=DEFAULT_EXCLUDES):
+    """Fetch every resource reachable from the service root
+
+    All the links found in the fetched resources under the root path are
+    followed, each resource is fetched only once. Resources which fail to
+    load are recorded in the ``failures`` of the inventory.
+
+    :param connector: A Connector instance
+    :param root_path: The path of the service root
+    :param root_json: The JSON body of the service root if already loaded
+    :param max_workers: The maximum number of resources fetched at once
+    :param excludes: Paths which are not crawled, with their children
+    :returns: An Inventory object
+    """
+    root_key = get_key(root_path)
+    excludes = tuple(get_key(path) for path in excludes)
+    inventory = Inventory(connector)
+    seen = set()
+    jobs = {}
+
+    def _fetch(path):
+        response = connector.get(path=path)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise InvalidBodyError(path=path, error=e)
+
+    def _is_wanted(key):
+        if key != root_key and not key.startswith(root_key + '/'):
+            return False
+        return not any(key == exclude or key.startswith(exclude + '/')
+                       for exclude in excludes)
+
+    def _add(path, body):
+        inventory.add(path, body)
+        for link in iter_links(body):
+            key = get_key(link)
+            if key not in seen and _is_wanted(key):
+                seen.add(key)
+                jobs[executor.submit(_fetch, key)] = key
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        seen.add(root_key)
+        if root_json is None:
+            jobs[executor.submit(_fetch, root_path)] = root_key
+        else:
+            _add(root_path, root_json)
+
+        while jobs:
+            done, _ = futures.wait(jobs, return_when=futures.FIRST_COMPLETED)
+            for job in done:
+                path = jobs.pop(job)
+                try:
+                    body = job.result()
+                except exceptions.SushyError as e:
+                    LOG.warning('Failed to fetch %(path)s: %(error)s',
+                                {'path': path, 'error': e})
+                    inventory.failures[path] = e
+                else:
+                    _add(path, body)
+
+    root = inventory.get(root_key)
+    if root is not None:
+        inventory.redfish_version = root.get('RedfishVersion')
+    LOG.debug('Crawled %(count)d resource(s) from %(path)s',
+              {'count': len(inventory), 'path': root_path})
+    return inventory
@@ -14,13 +14,14 @@
 #    under the License.
 
 from distutils import version
+import importlib
 
-from sushy import connector
 from sushy.resources import base
 
-from rsd_lib.resources import v2_1
-from rsd_lib.resources import v2_2
-from rsd_lib.resources import v2_3
+from rsd_lib import cache as rsd_cache
+from rsd_lib import connector as rsd_connector
+from rsd_lib import instrumentation
+from rsd_lib.resources import base as rsd_base
 
 
 class RSDLib(base.ResourceBase):
@@ -32,8 +33,17 @@ class RSDLib(base.ResourceBase):
                                   required=True)
     """RSD API version"""
 
+    _expand_query = base.Field(
+        ['ProtocolFeaturesSupported', 'ExpandQuery', 'NoLinks'],
+        adapter=bool, default=False)
+    """Whether the service supports the $expand=. query"""
+
     def __init__(self, base_url, username=None, password=None,
-                 root_prefix='/redfish/v1/', verify=True):
+                 root_prefix='/redfish/v1/', verify=True, cache=None,
+                 lazy_fields=False, connector=None,
+                 pool_size=rsd_connector.DEFAULT_POOL_SIZE, pool_block=False,
+                 keep_alive=True, timeout=None, max_retries=0,
+                 backoff_factor=0, session_auth=False, metrics=None):
         """A class representing a RootService
 
         :param base_url: The base URL to the Redfish controller. It
@@ -50,34 +60,118 @@ class RSDLib(base.ResourceBase):
             the driver will ignore verifying the SSL certificate; if it's
             a path the driver will use the specified certificate or one of
             the certificates in the directory. Defaults to True.
+        :param cache: A ResourceCache instance, if given the resources of
+            this client are read through it
+        :param lazy_fields: If True, the fields of the resources are loaded
+            on their first access rather than on every refresh
+        :param connector: A preconfigured Connector instance, if given it
+            is used instead of building one and the HTTP options are
+            ignored. It is not modified and may be shared by several
+            clients.
+        :param pool_size: The number of connections kept open to the
+            service, at least the number of concurrent requests
+        :param pool_block: If True, the requests beyond ``pool_size`` wait
+            for a free connection instead of opening a new one
+        :param keep_alive: If False, every connection is closed after its
+            request
+        :param timeout: The number of seconds to wait for the service, or a
+            (connect, read) tuple. Defaults to waiting forever.
+        :param max_retries: The maximum number of retries of the idempotent
+            requests failing to connect or answered by a 502, 503 or 504
+        :param backoff_factor: The retries sleep ``backoff_factor * 2 ** n``
+            seconds after the n-th retry
+        :param session_auth: If True, the credentials create a session of
+            the SessionService, and its token authenticates the requests
+            instead of HTTP basic authentication. Call ``close()`` to
+            delete the session.
+        :param metrics: A MetricsRegistry instance, if given every HTTP
+            request of this client and the parsing of its resources are
+            recorded in it
         """
         self._root_prefix = root_prefix
+        conn = connector
+        if conn is None:
+            if session_auth:
+                # The credentials only create the session
+                conn = rsd_connector.get_connector(base_url, verify=verify)
+            else:
+                conn = rsd_connector.get_connector(base_url, username,
+                                                   password, verify)
+            rsd_connector.configure(
+                conn, pool_size=pool_size, pool_block=pool_block,
+                keep_alive=keep_alive, timeout=timeout,
+                max_retries=max_retries, backoff_factor=backoff_factor)
+        if metrics is not None:
+            # Only the requests reaching the service, not the cache hits
+            conn = instrumentation.InstrumentedConnector(conn, metrics)
+        if session_auth:
+            prefix = root_prefix.rstrip('/')
+            conn = rsd_connector.SessionConnector(
+                conn, username, password,
+                sessions_path=prefix + '/SessionService/Sessions')
+        if cache is not None:
+            conn = rsd_cache.CachingConnector(conn, cache)
+        if metrics is None:
+            # E.g. a connector given already instrumented
+            metrics = getattr(conn, 'metrics', None)
+            if not isinstance(metrics, instrumentation.MetricsRegistry):
+                metrics = None
+        self._options = rsd_base.ClientOptions(lazy_fields=lazy_fields,
+                                               metrics=metrics)
         super(RSDLib, self).__init__(
-            connector.Connector(base_url, username, password, verify),
+            rsd_base.ClientConnector(conn, self._options),
             path=self._root_prefix)
+        # Let the collections of this service inline their members
+        self._options.expand_query = self._expand_query
+
+    def close(self):
+        """Close the connector, deleting its session if any"""
+        self._conn.close()
 
     def factory(self):
         """Return different resource module according to RSD API Version
 
         :returns: a resource module
         """
-        rsd_version = version.StrictVersion(self._rsd_api_version)
-        if rsd_version < version.StrictVersion("2.2.0"):
-            # Use the interface of RSD API 2.1.0 to interact with RSD 2.1.0 and
-            # all previous version.
-            return v2_1.RSDLibV2_1(self._conn, self._root_prefix,
-                                   redfish_version=self._redfish_version)
-        elif version.StrictVersion("2.2.0") <= rsd_version \
-            and rsd_version < version.StrictVersion("2.3.0"):
-            # Specific interface for RSD 2.2 version
-            return v2_2.RSDLibV2_2(self._conn, self._root_prefix,
-                                   redfish_version=self._redfish_version)
-        elif version.StrictVersion("2.3.0") <= rsd_version \
-            and rsd_version < version.StrictVersion("2.4.0"):
-            # Specific interface for RSD 2.2 version
-            return v2_3.RSDLibV2_3(self._conn, self._root_prefix,
-                                   redfish_version=self._redfish_version)
-        else:
-            raise NotImplementedError(
-                "The rsd-lib library doesn't support RSD API "
-                "version {0}.".format(self._rsd_api_version))
+        root_class = get_root_class(self._rsd_api_version)
+        # The service root was just loaded, build the versioned root from
+        # its body rather than fetching it again
+        return rsd_base.load_from_body(root_class, self._conn,
+                                       self._root_prefix, self.json,
+                                       redfish_version=self._redfish_version)
+
+
+def _get_package(name):
+    """Import a versioned resources package on demand
+
+    Only the package of the version of the service is loaded, with its
+    resource modules.
+    """
+    return importlib.import_module('rsd_lib.resources.' + name)
+
+
+def get_root_class(rsd_api_version):
+    """Return the root resource class matching a RSD API Version
+
+    :param rsd_api_version: The RSD API version advertised by the service
+        root
+    :raises: NotImplementedError, if the version is not supported
+    :returns: a RSDLibV2_x class
+    """
+    rsd_version = version.StrictVersion(rsd_api_version)
+    if rsd_version < version.StrictVersion("2.2.0"):
+        # Use the interface of RSD API 2.1.0 to interact with RSD 2.1.0 and
+        # all previous version.
+        return _get_package('v2_1').RSDLibV2_1
+    elif version.StrictVersion("2.2.0") <= rsd_version \
+        and rsd_version < version.StrictVersion("2.3.0"):
+        # Specific interface for RSD 2.2 version
+        return _get_package('v2_2').RSDLibV2_2
+    elif version.StrictVersion("2.3.0") <= rsd_version \
+        and rsd_version < version.StrictVersion("2.4.0"):
+        # Specific interface for RSD 2.2 version
+        return _get_package('v2_3').RSDLibV2_3
+    else:
+        raise NotImplementedError(
+            "The rsd-lib library doesn't support RSD API "
+            "version {0}.".format(rsd_api_version))
@@ -0,0 +1,193 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import re
+import threading
+import time
+
+from rsd_lib import cache
+from rsd_lib import instrumentation
+
+DEFAULT_THRESHOLD = 5
+"""Default number of resources of a template fetched one by one flagged as
+an N+1 pattern"""
+
+IDENTITY = '{id}'
+"""Replaces the identities of the resources in a URI template"""
+
+_IDENTITY_SEGMENT = re.compile(r'\d')
+
+Pattern = collections.namedtuple(
+    'Pattern', ['template', 'count', 'collection'])
+"""Resources of a URI template fetched one by one
+
+The count is the number of distinct resources fetched, the collection is
+the template of their collection if it was fetched as well, else None.
+"""
+
+
+def get_uri_template(path):
+    """Return the URI template of a resource path
+
+    Segments containing a digit, after the first one below the root prefix
+    and up to the actions, are taken for resource identities, e.g.
+    "/redfish/v1/Systems/System1/Processors/CPU1" has the template
+    "/redfish/v1/Systems/{id}/Processors/{id}". The query is kept.
+
+    :param path: A resource path or URL
+    :returns: The template
+    """
+    key = cache.get_key(path)
+    key, sep, query = key.partition('?')
+    segments = key.split('/')
+    # '', 'redfish', 'v1', then a collection or service
+    for index in range(4, len(segments)):
+        if segments[index] == 'Actions':
+            break
+        if _IDENTITY_SEGMENT.search(segments[index]):
+            segments[index] = IDENTITY
+    return '/'.join(segments) + sep + query
+
+
+class RequestProfiler(object):
+
+    def __init__(self, metrics, threshold=DEFAULT_THRESHOLD):
+        """Collect the requests sent while a block of code runs
+
+        Used as a context manager, it records the requests of every client
+        instrumented by the registry, from any thread, until the block
+        exits. Cache hits are not requests.
+
+        :param metrics: The MetricsRegistry instance of the clients, e.g.
+            given to ``RSDLib``
+        :param threshold: The minimum number of resources of a template
+            fetched one by one flagged as an N+1 pattern
+        """
+        self.metrics = metrics
+        self.threshold = threshold
+        self.requests = []
+        """The Request tuples recorded, in the order of their responses"""
+
+        self.duration = None
+        """The number of seconds the block lasted"""
+
+        self._started = None
+        self._lock = threading.Lock()
+
+    def _record(self, measurement):
+        if isinstance(measurement, instrumentation.Request):
+            with self._lock:
+                self.requests.append(measurement)
+
+    def __enter__(self):
+        self._started = time.time()
+        self.metrics.add_listener(self._record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.remove_listener(self._record)
+        self.duration = time.time() - self._started
+
+    def get_templates(self):
+        """Group the requests by method and URI template
+
+        :returns: An OrderedDict mapping (method, template) tuples to a
+            (count, latency) tuple, the most frequent first. The latency is
+            the total number of seconds spent in the requests.
+        """
+        templates = collections.OrderedDict()
+        for request in self.requests:
+            key = (request.method, get_uri_template(request.path))
+            count, latency = templates.get(key, (0, 0))
+            templates[key] = (count + 1, latency + request.latency)
+        return collections.OrderedDict(
+            sorted(templates.items(), key=lambda item: -item[1][0]))
+
+    def get_repeated(self):
+        """Return the resources fetched more than once
+
+        :returns: An OrderedDict mapping the paths, with their query, to
+            their number of GET requests, the most frequent first
+        """
+        counts = collections.Counter(cache.get_key(request.path)
+                                     for request in self.requests
+                                     if request.method == 'GET')
+        return collections.OrderedDict(
+            (path, count) for path, count in counts.most_common()
+            if count > 1)
+
+    def get_patterns(self):
+        """Return the N+1 patterns of the GET requests
+
+        A pattern is a template whose distinct resources were fetched one
+        by one, at least ``threshold`` of them, e.g. the members of a
+        collection or the resources linked by each of them.
+
+        :returns: A list of Pattern tuples, the largest first
+        """
+        fetched = set()
+        members = collections.defaultdict(set)
+        for request in self.requests:
+            if request.method != 'GET':
+                continue
+            template = get_uri_template(request.path)
+            fetched.add(template)
+            if template.endswith('/' + IDENTITY):
+                members[template].add(cache.get_key(request.path))
+
+        patterns = []
+        for template, paths in members.items():
+            if len(paths) < self.threshold:
+                continue
+            collection = template.rsplit('/', 1)[0]
+            patterns.append(Pattern(
+                template, len(paths),
+                collection if collection in fetched else None))
+        return sorted(patterns, key=lambda pattern: -pattern.count)
+
+    def report(self):
+        """Return a text report of the requests
+
+        :returns: A string listing the requests by URI template, the
+            resources fetched more than once and the N+1 patterns
+        """
+        lines = ['%d requests' % len(self.requests)]
+        if self.duration is not None:
+            lines[0] += ' in %.3fs' % self.duration
+
+        lines.extend(['', 'Requests by URI template:'])
+        for (method, template), (count, latency) in \
+                self.get_templates().items():
+            lines.append('%6d %9.3fs  %s %s' % (count, latency, method,
+                                                template))
+
+        repeated = self.get_repeated()
+        if repeated:
+            lines.extend(['', 'Resources fetched more than once:'])
+            for path, count in repeated.items():
+                lines.append('%6d  GET %s' % (count, path))
+
+        patterns = self.get_patterns()
+        if patterns:
+            lines.extend(['', 'N+1 patterns:'])
+            for pattern in patterns:
+                lines.append('%6d  GET %s' % (pattern.count,
+                                              pattern.template))
+                if pattern.collection is not None:
+                    lines.append('        members of GET %s, read them from '
+                                 'the expanded collection'
+                                 % pattern.collection)
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,242 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import gzip
+import json
+import logging
+import threading
+import time
+
+from sushy import exceptions
+
+from rsd_lib import cache
+
+LOG = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Location')
+"""The response headers kept in a recording"""
+
+SECRET_HEADERS = ('Authorization', 'X-Auth-Token')
+
+MASK = '***'
+"""Replaces the passwords and tokens in a recording"""
+
+
+class MissingRecordError(exceptions.SushyError):
+    message = 'No recorded response to %(method)s %(path)s'
+
+
+class RecordedResponse(object):
+    """A response read from a recording
+
+    It mimics the parts of the requests library response used by the
+    resources and the connectors.
+    """
+
+    def __init__(self, status_code, headers, body=None, text=None):
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+        self.text = text if text is not None else json.dumps(body)
+        self.content = self.text.encode('utf-8')
+
+    def json(self):
+        if self._body is None:
+            raise ValueError('No JSON body')
+        return self._body
+
+
+def _mask(data):
+    """Hide the password of a request body, e.g. creating a session"""
+    if isinstance(data, dict) and 'Password' in data:
+        data = dict(data, Password=MASK)
+    return data
+
+
+def _get_data_key(data):
+    if data is None:
+        return None
+    return json.dumps(_mask(data), sort_keys=True)
+
+
+class RecordingConnector(object):
+    """Connector recording the requests it sends and their responses
+
+    Every request is written to a gzip compressed file of JSON lines with
+    its method, path, body and headers, and with the status code, some
+    headers, the JSON or text body and the latency of its response. Errors
+    are recorded as well, then raised as usual. Passwords and tokens are
+    masked.
+    """
+
+    def __init__(self, connector, path):
+        """Wrap a connector
+
+        :param connector: A Connector instance
+        :param path: The path of the recording, overwritten if it exists
+        """
+        self._conn = connector
+        self.path = path
+        self._file = gzip.open(path, 'wb')
+        self._lock = threading.Lock()
+        self._write({'version': FORMAT_VERSION,
+                     'base_url': getattr(connector, '_url', None)})
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line.encode('utf-8'))
+
+    def _op(self, method, path, data, headers):
+        record = {'method': method.upper(), 'path': path,
+                  'data': _mask(data),
+                  'headers': dict((name, MASK if name in SECRET_HEADERS
+                                   else value)
+                                  for name, value in (headers or {}).items())}
+        started = time.time()
+        try:
+            response = getattr(self._conn, method)(path=path, data=data,
+                                                   headers=headers)
+        except exceptions.HTTPError as e:
+            record.update(
+                latency=time.time() - started, status_code=e.status_code,
+                response_headers={},
+                body=None if e.body is None else {'error': e.body})
+            self._write(record)
+            raise
+        except exceptions.ConnectionError as e:
+            record.update(latency=time.time() - started, status_code=None,
+                          error=str(e))
+            self._write(record)
+            raise
+
+        response_headers = dict(
+            (name, response.headers[name]) for name in RECORDED_HEADERS
+            if name in response.headers)
+        if 'X-Auth-Token' in response.headers:
+            # A replayed session gets a fake token
+            response_headers['X-Auth-Token'] = MASK
+        record.update(latency=time.time() - started,
+                      status_code=response.status_code,
+                      response_headers=response_headers)
+        try:
+            record['body'] = response.json()
+        except ValueError:
+            record['text'] = response.text
+        self._write(record)
+        return response
+
+    def get(self, path='', data=None, headers=None):
+        return self._op('get', path, data, headers)
+
+    def post(self, path='', data=None, headers=None):
+        return self._op('post', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._op('patch', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._op('put', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._op('delete', path, data, headers)
+
+    def close(self):
+        """Close the recording and the wrapped connector"""
+        with self._lock:
+            self._file.close()
+        self._conn.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class ReplayConnector(object):
+    """Connector answering the requests from a recording
+
+    A request is answered by the responses recorded for the same method,
+    path and body, in the order they were recorded, the last one being
+    repeated once they are exhausted. No request reaches the network.
+    """
+
+    def __init__(self, path, emulate_latency=False):
+        """Load a recording
+
+        :param path: The path of a recording made by RecordingConnector
+        :param emulate_latency: If True, every response is delayed by the
+            latency it was recorded with
+        """
+        self.path = path
+        self.emulate_latency = emulate_latency
+        self._records = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+        with gzip.open(path, 'rb') as f:
+            header = json.loads(f.readline().decode('utf-8'))
+            for line in f:
+                record = json.loads(line.decode('utf-8'))
+                self._records[self._get_key(
+                    record['method'], record['path'],
+                    record['data'])].append(record)
+        self._url = header.get('base_url') or ''
+
+    @staticmethod
+    def _get_key(method, path, data):
+        return method, cache.get_key(path), _get_data_key(data)
+
+    def _next(self, key):
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                return None
+            if len(records) > 1:
+                return records.popleft()
+            return records[0]
+
+    def _op(self, method, path, data, headers):
+        record = self._next(self._get_key(method.upper(), path, data))
+        if record is None:
+            raise MissingRecordError(method=method.upper(), path=path)
+        if self.emulate_latency:
+            time.sleep(record['latency'])
+
+        url = self._url + path
+        if record['status_code'] is None:
+            raise exceptions.ConnectionError(url=url, error=record['error'])
+        response = RecordedResponse(record['status_code'],
+                                    record['response_headers'],
+                                    record.get('body'), record.get('text'))
+        exceptions.raise_for_response(method.upper(), url, response)
+        return response
+
+    def get(self, path='', data=None, headers=None):
+        return self._op('get', path, data, headers)
+
+    def post(self, path='', data=None, headers=None):
+        return self._op('post', path, data, headers)
+
+    def patch(self, path='', data=None, headers=None):
+        return self._op('patch', path, data, headers)
+
+    def put(self, path='', data=None, headers=None):
+        return self._op('put', path, data, headers)
+
+    def delete(self, path='', data=None, headers=None):
+        return self._op('delete', path, data, headers)
+
+    def close(self):
+        pass
@@ -13,36 +13,396 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import copy
+import collections
+import logging
+import time
 
+from concurrent import futures
+from sushy import exceptions
 from sushy.resources import base
 
+from rsd_lib import utils
+
+try:
+    from collections import abc as collections_abc
+except ImportError:
+    # Python 2, the abstract classes are only in collections
+    collections_abc = collections
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 10
+"""Default number of members fetched at once by a collection"""
+
+EXPAND_QUERY = '$expand=.'
+"""Query inlining the members of a collection in its representation"""
+
+
+class ClientOptions(object):
+
+    def __init__(self, expand_query=False, lazy_fields=False, metrics=None):
+        """The options of a client shared by all its resources
+
+        :param expand_query: Whether the collections inline their members
+            with ``$expand=.``
+        :param lazy_fields: Whether the fields of the resources are loaded
+            on their first access
+        :param metrics: A MetricsRegistry recording the parsing of the
+            resources, None if they are not instrumented
+        """
+        self.expand_query = expand_query
+        self.lazy_fields = lazy_fields
+        self.metrics = metrics
+
+
+_DEFAULT_OPTIONS = ClientOptions()
+
+
+class ClientConnector(object):
+    """Connector carrying the options of a client
+
+    ``RSDLib`` wraps its connector in one, so that the connector given by
+    the caller, possibly shared with other clients, is never modified.
+    Every request goes through the wrapped connector.
+    """
+
+    def __init__(self, connector, options):
+        self._conn = connector
+        self.client_options = options
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def get_client_options(connector):
+    """Return the options of the client owning a connector
+
+    :param connector: A Connector instance, the options are found through
+        the ClientConnector wrapping it
+    :returns: A ClientOptions instance, the default options if the
+        connector isn't the one of a client
+    """
+    options = getattr(connector, 'client_options', None)
+    if isinstance(options, ClientOptions):
+        return options
+    return _DEFAULT_OPTIONS
+
+
+class _ExpandedMemberConnector(object):
+    """Connector answering the first GET of a member with its inlined body
+
+    Every other request, including the following refreshes of the member,
+    goes through the wrapped connector.
+    """
+
+    def __init__(self, connector, path, body):
+        self._conn = connector
+        self._path = path
+        self._body = body
+
+    def get(self, path='', data=None, headers=None):
+        if self._body is not None and path == self._path:
+            body, self._body = self._body, None
+            return utils.JsonResponse(body)
+        return self._conn.get(path=path, data=data, headers=headers)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class FieldListRecord(collections_abc.Mapping):
+    """Base class of the values of a FieldList element
+
+    Every FieldList builds a subclass having one slot per sub-field.
+    Like the CompositeField values, records are mappings of their
+    sub-fields.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        else:
+            raise KeyError(key)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(
+            '%s=%r' % (attr, getattr(self, attr)) for attr in self.__slots__))
+
 
 class FieldList(base.CompositeField):
     """Base class for fields consisting of a list of several sub-fields."""
 
+    def __init__(self, *args, **kwargs):
+        super(FieldList, self).__init__(*args, **kwargs)
+        slots = tuple(sorted(self._subfields))
+        self._record_class = type(self.__class__.__name__ + 'Record',
+                                  (FieldListRecord,), {'__slots__': slots})
+
     def _load(self, body, resource, nested_in=None):
         """Load the field list.
 
         :param body: parent JSON body.
         :param resource: parent resource.
         :param nested_in: parent resource name (for error reporting only).
-        :returns: a new list object containing subfields.
+        :returns: a new list of FieldListRecord objects containing subfields.
         """
         nested_in = (nested_in or []) + self._path
         values = base.Field._load(self, body, resource)
         if values is None:
             return None
 
-        # Initialize the list that will contain each field instance
+        record_class = self._record_class
+        subfields = list(self._subfields.items())
         instances = []
         for value in values:
-            instance = copy.copy(self)
-            for attr, field in self._subfields.items():
-                # Hide the Field object behind the real value
-                setattr(instance, attr, field._load(value,
-                                                    resource,
+            instance = record_class()
+            for attr, field in subfields:
+                setattr(instance, attr, field._load(value, resource,
                                                     nested_in))
             instances.append(instance)
 
         return instances
+
+
+class _LazyField(object):
+    """Descriptor loading a field on its first access
+
+    It is a non-data descriptor: once loaded, the value stored in the
+    resource hides it until the next refresh.
+    """
+
+    def __init__(self, name, field):
+        self._name = name
+        self._field = field
+
+    def __get__(self, resource, owner):
+        if resource is None:
+            return self._field
+        value = self._field._load(resource.json, resource)
+        resource.__dict__[self._name] = value
+        return value
+
+
+_lazy_classes = {}
+
+
+def _get_lazy_class(resource_class):
+    """Return the subclass of a resource class loading its fields lazily"""
+    if '_lazy_fields' in vars(resource_class):
+        return resource_class
+
+    lazy_class = _lazy_classes.get(resource_class)
+    if lazy_class is None:
+        fields = dict((attr, getattr(resource_class, attr))
+                      for attr in dir(resource_class)
+                      if isinstance(getattr(resource_class, attr),
+                                    base.Field))
+        attrs = dict((attr, _LazyField(attr, field))
+                     for attr, field in fields.items())
+        attrs['_lazy_fields'] = tuple(fields)
+        attrs['__module__'] = resource_class.__module__
+        lazy_class = type(resource_class.__name__, (resource_class,), attrs)
+        _lazy_classes[resource_class] = lazy_class
+    return lazy_class
+
+
+def loads_lazily(connector):
+    """Whether the resources of a connector load their fields lazily
+
+    :param connector: A Connector instance, see ``get_client_options()``
+    :returns: True if fields are loaded on their first access
+    """
+    return get_client_options(connector).lazy_fields
+
+
+def get_metrics(connector):
+    """Return the registry recording the parsing of the resources
+
+    :param connector: A Connector instance, see ``get_client_options()``
+    :returns: A MetricsRegistry instance, None if the resources of the
+        connector are not instrumented
+    """
+    return get_client_options(connector).metrics
+
+
+def _parse_timed(resource, parse):
+    """Parse a resource, recording the time spent if instrumented"""
+    metrics = get_metrics(resource._conn)
+    if metrics is None:
+        return parse()
+
+    started = time.time()
+    parse()
+    metrics.observe_parse(resource._path, resource.json,
+                          time.time() - started)
+
+
+class ResourceBase(base.ResourceBase):
+    """Base class for the resources of rsd-lib.
+
+    When lazy loading is enabled on the client, the fields are loaded
+    from the resource JSON body on their first access instead of on every
+    refresh, and kept until the next refresh. Missing required fields are
+    then reported on access.
+    """
+
+    def _parse_attributes(self):
+        """Parse the attributes of a resource."""
+        _parse_timed(self, self._parse_fields)
+
+    def _parse_fields(self):
+        """Parse the fields, or drop the lazily loaded ones."""
+        if not loads_lazily(self._conn):
+            return super(ResourceBase, self)._parse_attributes()
+
+        self.__class__ = _get_lazy_class(self.__class__)
+        for attr in self._lazy_fields:
+            # Drop the values loaded from the previous body
+            self.__dict__.pop(attr, None)
+
+
+def supports_expand(connector):
+    """Whether the service behind a connector supports ``$expand=.``
+
+    :param connector: A Connector instance, see ``get_client_options()``.
+        ``RSDLib`` sets the ``expand_query`` option from the service root.
+    :returns: True if collections can inline their members
+    """
+    return get_client_options(connector).expand_query
+
+
+def get_expanded_bodies(connector, path):
+    """Return the member bodies of a collection expanded with ``$expand=.``
+
+    :param connector: A Connector instance
+    :param path: The collection path
+    :returns: A dict mapping the identity of every member to its JSON
+        body, or to None if the service did not inline it. None if the
+        service does not support ``$expand=.`` or failed to expand the
+        collection.
+    """
+    if not supports_expand(connector):
+        return None
+
+    separator = '&' if '?' in path else '?'
+    try:
+        body = connector.get(path=path + separator + EXPAND_QUERY).json()
+    except exceptions.HTTPError as e:
+        LOG.warning('Failed to expand the members of %(path)s, fetching '
+                    'them one by one: %(error)s',
+                    {'path': path, 'error': e})
+        return None
+
+    bodies = collections.OrderedDict()
+    for member in body.get('Members', []):
+        # A member reduced to its link was not inlined by the service
+        bodies[member['@odata.id']] = member if len(member) > 1 else None
+    return bodies
+
+
+def load_from_body(resource_class, connector, path, body,
+                   redfish_version=None):
+    """Build a resource from a body which was already read
+
+    :param resource_class: The class of the resource
+    :param connector: A Connector instance
+    :param path: The sub-URI path to the resource
+    :param body: The JSON body of the resource, it is not read again
+    :param redfish_version: The version of RedFish
+    :returns: A ``resource_class`` object, its following refreshes go
+        through ``connector``
+    """
+    resource = resource_class(
+        _ExpandedMemberConnector(connector, path, body), path,
+        redfish_version=redfish_version)
+    resource._conn = connector
+    return resource
+
+
+class ResourceCollectionBase(base.ResourceCollectionBase):
+    """Base class for the resource collections of rsd-lib.
+
+    When the service supports ``$expand=.``, the members are read from the
+    expanded collection in a single request instead of one request per
+    member.
+    """
+
+    def _parse_attributes(self):
+        """Parse the attributes of a collection."""
+        _parse_timed(
+            self, super(ResourceCollectionBase, self)._parse_attributes)
+
+    def _get_expanded_bodies(self):
+        """Return the member bodies inlined by the expanded collection
+
+        :returns: A dict mapping the identity of every member to its JSON
+            body, or to None if the service did not inline it. None if the
+            collection could not be expanded.
+        """
+        return get_expanded_bodies(self._conn, self._path)
+
+    def _get_member_from_body(self, identity, body):
+        if body is None:
+            return self.get_member(identity)
+        return load_from_body(self._resource_type, self._conn, identity,
+                              body, redfish_version=self.redfish_version)
+
+    def get_members(self):
+        """Return a list of ``_resource_type`` objects present in collection
+
+        :returns: A list of ``_resource_type`` objects
+        """
+        bodies = self._get_expanded_bodies()
+        if bodies is None:
+            return super(ResourceCollectionBase, self).get_members()
+        return [self._get_member_from_body(id_, body)
+                for id_, body in bodies.items()]
+
+    def get_members_concurrently(self, max_workers=DEFAULT_MAX_WORKERS):
+        """Return ``_resource_type`` objects fetched in parallel
+
+        Members are fetched by a pool of at most ``max_workers`` threads
+        sharing the connector of this collection. A member which fails to
+        load doesn't abort the listing, its error is reported instead.
+
+        :param max_workers: The maximum number of members fetched at once
+        :returns: A tuple ``(members, failures)``. ``members`` is a list of
+            ``_resource_type`` objects in the order of
+            ``members_identities`` and ``failures`` is a dict mapping the
+            identity of every member which could not be fetched to the
+            SushyError raised while fetching it, or the ValueError raised
+            if its body is not valid JSON
+        """
+        members = []
+        failures = collections.OrderedDict()
+        bodies = self._get_expanded_bodies()
+        if bodies is None:
+            bodies = collections.OrderedDict(
+                (id_, None) for id_ in self.members_identities)
+        if not bodies:
+            return members, failures
+
+        workers = min(max_workers, len(bodies))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            jobs = [(id_, executor.submit(self._get_member_from_body,
+                                          id_, body))
+                    for id_, body in bodies.items()]
+            for id_, job in jobs:
+                try:
+                    members.append(job.result())
+                except (exceptions.SushyError, ValueError) as e:
+                    LOG.warning('Failed to fetch member %(identity)s of '
+                                '%(path)s: %(error)s',
+                                {'identity': id_, 'path': self._path,
+                                 'error': e})
+                    failures[id_] = e
+
+        return members, failures
@@ -15,15 +15,18 @@
 
 from sushy.resources import base
 
+from rsd_lib import inventory
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_1.chassis import chassis
 from rsd_lib.resources.v2_1.fabric import fabric
 from rsd_lib.resources.v2_1.manager import manager
 from rsd_lib.resources.v2_1.node import node
 from rsd_lib.resources.v2_1.storage_service import storage_service
+from rsd_lib.resources.v2_1.system import memory_table
 from rsd_lib.resources.v2_1.system import system
 
 
-class RSDLibV2_1(base.ResourceBase):
+class RSDLibV2_1(rsd_base.ResourceBase):
 
     _systems_path = base.Field(['Systems', '@odata.id'], required=True)
     """SystemCollection path"""
@@ -183,3 +186,23 @@ class RSDLibV2_1(base.ResourceBase):
         return manager.Manager(self._conn,
                                identity,
                                redfish_version=self.redfish_version)
+
+    def snapshot(self, max_workers=rsd_base.DEFAULT_MAX_WORKERS):
+        """Fetch every resource reachable from the service root
+
+        :param max_workers: The maximum number of resources fetched at once
+        :returns: an Inventory object the resources can be materialized
+            from without further requests
+        """
+        return inventory.crawl(self._conn, self._path, root_json=self.json,
+                               max_workers=max_workers)
+
+    def export_memory(self, max_workers=rsd_base.DEFAULT_MAX_WORKERS):
+        """Export the memory modules of all the systems into a table
+
+        :param max_workers: The maximum number of resources fetched at once
+        :returns: A tuple ``(table, failures)``, see
+            ``memory_table.export_memory``
+        """
+        return memory_table.export_memory(self.get_system_collection(),
+                                          max_workers=max_workers)
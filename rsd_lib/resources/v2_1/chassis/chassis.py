@@ -15,6 +15,8 @@
 
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
+
 
 class StatusField(base.CompositeField):
     state = base.Field('State')
@@ -22,7 +24,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class Chassis(base.ResourceBase):
+class Chassis(rsd_base.ResourceBase):
     identity = base.Field('Id', required=True)
     """The chassis identity string"""
 
@@ -67,7 +69,7 @@ class Chassis(base.ResourceBase):
         super(Chassis, self).__init__(connector, identity, redfish_version)
 
 
-class ChassisCollection(base.ResourceCollectionBase):
+class ChassisCollection(rsd_base.ResourceCollectionBase):
     @property
     def _resource_type(self):
         return Chassis
@@ -47,7 +47,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class Endpoint(base.ResourceBase):
+class Endpoint(rsd_base.ResourceBase):
 
     connected_entities = ConnectedEntitiesField('ConnectedEntities')
     """Entities connected to endpoint"""
@@ -88,7 +88,7 @@ class Endpoint(base.ResourceBase):
                                        redfish_version)
 
 
-class EndpointCollection(base.ResourceCollectionBase):
+class EndpointCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
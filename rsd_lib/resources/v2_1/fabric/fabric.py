@@ -18,6 +18,7 @@ import logging
 from sushy import exceptions
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_1.fabric import endpoint
 from rsd_lib.resources.v2_1.fabric import zone
 from rsd_lib import utils as rsd_lib_utils
@@ -30,7 +31,7 @@ class StatusField(base.CompositeField):
     health = base.Field('Health')
 
 
-class Fabric(base.ResourceBase):
+class Fabric(rsd_base.ResourceBase):
 
     description = base.Field('Description')
     """The fabric description"""
@@ -114,7 +115,7 @@ class Fabric(base.ResourceBase):
         self._zones = None
 
 
-class FabricCollection(base.ResourceCollectionBase):
+class FabricCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
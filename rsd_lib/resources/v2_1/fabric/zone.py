@@ -18,6 +18,7 @@ import logging
 from sushy.resources import base
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_1.fabric import endpoint
 
 LOG = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ class StatusField(base.CompositeField):
     health = base.Field('Health')
 
 
-class Zone(base.ResourceBase):
+class Zone(rsd_base.ResourceBase):
 
     description = base.Field('Description')
     """The zone description"""
@@ -72,7 +73,7 @@ class Zone(base.ResourceBase):
                 id_ in self.links.endpoint_identities]
 
 
-class ZoneCollection(base.ResourceCollectionBase):
+class ZoneCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
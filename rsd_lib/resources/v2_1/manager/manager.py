@@ -16,6 +16,7 @@
 from sushy.resources import base
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib import utils as rsd_lib_utils
 
 
@@ -56,7 +57,7 @@ class LinksField(base.CompositeField):
     """The oem options values of links (dict)"""
 
 
-class Manager(base.ResourceBase):
+class Manager(rsd_base.ResourceBase):
     identity = base.Field('Id', required=True)
     """The manager identity string"""
 
@@ -122,7 +123,7 @@ class Manager(base.ResourceBase):
         super(Manager, self).__init__(connector, identity, redfish_version)
 
 
-class ManagerCollection(base.ResourceCollectionBase):
+class ManagerCollection(rsd_base.ResourceCollectionBase):
     @property
     def _resource_type(self):
         return Manager
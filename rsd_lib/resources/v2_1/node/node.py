@@ -13,23 +13,50 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from jsonschema import validate
+import collections
 import logging
+import time
 
+from concurrent import futures
 from sushy import exceptions
 from sushy.resources import base
 from sushy.resources import common
 from sushy.resources.system import system
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_1.node import constants as node_cons
 from rsd_lib.resources.v2_1.node import mappings as node_maps
 from rsd_lib.resources.v2_1.node import schemas as node_schemas
+from rsd_lib import task_monitor
 from rsd_lib import utils as rsd_lib_utils
 
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_POLL_INTERVAL = 1
+"""Default number of seconds before the first read of a composing node"""
+
+DEFAULT_COMPOSE_TIMEOUT = 600
+"""Default number of seconds a node may take to be assembled"""
+
+ComposeResult = collections.namedtuple(
+    'ComposeResult',
+    ['path', 'node', 'error', 'allocate_time', 'assemble_time'])
+"""The outcome of the composition of a node
+
+``path`` and ``node`` are None if the node could not be allocated,
+``error`` is the SushyError which stopped the composition, e.g. a
+ComposeNodeError if the node state is Failed or if it timed out, None if
+the node was assembled. ``allocate_time`` and ``assemble_time`` are the
+seconds spent allocating the node, until it was Allocated, and assembling
+it, until it was Assembled.
+"""
+
+
+class ComposeNodeError(task_monitor.TaskError):
+    message = 'The composition of node %(node)s failed: %(error)s'
+
 
 class AssembleActionField(base.CompositeField):
     target_uri = base.Field('target', required=True)
@@ -136,7 +163,7 @@ class LinksField(base.CompositeField):
     """Link to remote drives of this node"""
 
 
-class Node(base.ResourceBase):
+class Node(rsd_base.ResourceBase):
 
     boot = BootField('Boot', required=True)
     """A dictionary containg the current boot device, frequency and mode"""
@@ -236,10 +263,14 @@ class Node(base.ResourceBase):
         self._conn.post(target_uri, data={'ResetType': value})
 
     def assemble_node(self):
-        """Assemble the composed node."""
+        """Assemble the composed node.
+
+        :returns: The response, see ``task_monitor.watch_assembly()`` to
+            wait for the node to be assembled
+        """
         target_uri = self._get_assemble_action_element().target_uri
 
-        self._conn.post(target_uri)
+        return self._conn.post(target_uri)
 
     def get_allowed_node_boot_source_values(self):
         """Get the allowed values for changing the boot source.
@@ -408,15 +439,18 @@ class Node(base.ResourceBase):
         shutdown is sent to the computer system, all VLANs except reserved ones
         are removed from associated ethernet switch ports, the computer system
         is deallocated and the remote target is deallocated.
+
+        :returns: The response, see ``task_monitor.watch_deletion()`` to
+            wait for the node to be deleted
         """
-        self._conn.delete(self.path)
+        return self._conn.delete(self.path)
 
     def refresh(self):
         super(Node, self).refresh()
         self._system = None
 
 
-class NodeCollection(base.ResourceCollectionBase):
+class NodeCollection(rsd_base.ResourceCollectionBase):
 
     _actions = NodeCollectionActionsField('Actions', required=True)
 
@@ -458,38 +492,37 @@ class NodeCollection(base.ResourceCollectionBase):
             request['Description'] = description
 
         if processor_req is not None:
-            validate(processor_req,
-                     node_schemas.processor_req_schema)
+            rsd_lib_utils.validate(processor_req,
+                                   node_schemas.processor_req_schema)
             request['Processors'] = processor_req
 
         if memory_req is not None:
-            validate(memory_req,
-                     node_schemas.memory_req_schema)
+            rsd_lib_utils.validate(memory_req, node_schemas.memory_req_schema)
             request['Memory'] = memory_req
 
         if remote_drive_req is not None:
-            validate(remote_drive_req,
-                     node_schemas.remote_drive_req_schema)
+            rsd_lib_utils.validate(remote_drive_req,
+                                   node_schemas.remote_drive_req_schema)
             request['RemoteDrives'] = remote_drive_req
 
         if local_drive_req is not None:
-            validate(local_drive_req,
-                     node_schemas.local_drive_req_schema)
+            rsd_lib_utils.validate(local_drive_req,
+                                   node_schemas.local_drive_req_schema)
             request['LocalDrives'] = local_drive_req
 
         if ethernet_interface_req is not None:
-            validate(ethernet_interface_req,
-                     node_schemas.ethernet_interface_req_schema)
+            rsd_lib_utils.validate(ethernet_interface_req,
+                                   node_schemas.ethernet_interface_req_schema)
             request['EthernetInterfaces'] = ethernet_interface_req
 
         if total_system_core_req is not None:
-            validate(total_system_core_req,
-                     node_schemas.total_system_core_req_schema)
+            rsd_lib_utils.validate(total_system_core_req,
+                                   node_schemas.total_system_core_req_schema)
             request['TotalSystemCoreCount'] = total_system_core_req
 
         if total_system_memory_req is not None:
-            validate(total_system_memory_req,
-                     node_schemas.total_system_memory_req_schema)
+            rsd_lib_utils.validate(total_system_memory_req,
+                                   node_schemas.total_system_memory_req_schema)
             request['TotalSystemMemoryMiB'] = total_system_memory_req
 
         return request
@@ -535,7 +568,117 @@ class NodeCollection(base.ResourceCollectionBase):
             ethernet_interface_req=ethernet_interface_req,
             total_system_core_req=total_system_core_req,
             total_system_memory_req=total_system_memory_req)
+        return self._allocate(target_uri, properties)
+
+    def _allocate(self, target_uri, properties):
         resp = self._conn.post(target_uri, data=properties)
         LOG.info("Node created at %s", resp.headers['Location'])
         node_url = resp.headers['Location']
         return node_url[node_url.find(self._path):]
+
+    def _get_composition_poll(self, path, deadline):
+        """Return a poll assembling a node once Allocated
+
+        The poll is done once the node is Assembled, its result is a tuple
+        ``(node, allocated, assembled)``, the times at which the node was
+        seen Allocated and Assembled. It raises a ComposeNodeError if the
+        node state is Failed, or if it is not Assembled at ``deadline``.
+        """
+        state = {}
+
+        def _poll():
+            node = state.get('node')
+            if node is None:
+                node = state['node'] = self.get_member(path)
+            else:
+                node.refresh()
+
+            node_state = node.composed_node_state
+            if node_state == node_cons.COMPOSED_NODE_STATE_FAILED:
+                raise ComposeNodeError(node=path,
+                                       error='the node state is Failed')
+            if node_state == node_cons.COMPOSED_NODE_STATE_ASSEMBLED:
+                assembled = time.time()
+                return True, (node, state.get('allocated', assembled),
+                              assembled)
+            if node_state == node_cons.COMPOSED_NODE_STATE_ALLOCATED:
+                if 'allocated' not in state:
+                    state['allocated'] = time.time()
+                    node.assemble_node()
+            if time.time() >= deadline:
+                waited = (node_cons.COMPOSED_NODE_STATE_ASSEMBLED
+                          if 'allocated' in state
+                          else node_cons.COMPOSED_NODE_STATE_ALLOCATED)
+                raise ComposeNodeError(
+                    node=path, error='timed out waiting for state %s' % waited)
+            return False, None
+
+        return _poll
+
+    def compose_nodes(self, specs, max_workers=rsd_base.DEFAULT_MAX_WORKERS,
+                      interval=DEFAULT_POLL_INTERVAL,
+                      timeout=DEFAULT_COMPOSE_TIMEOUT, scheduler=None):
+        """Compose and assemble a batch of nodes
+
+        Every spec is validated before any request is sent. Then at most
+        ``max_workers`` Allocate requests are in flight at once, and every
+        allocated node is tracked by a task monitor Scheduler, which
+        assembles it as soon as its state is Allocated, while the next
+        ones are still being allocated.
+
+        :param specs: A list of dicts of ``compose_node()`` arguments, e.g.
+            ``{'name': 'node1', 'processor_req': [...]}``
+        :param max_workers: The maximum number of nodes allocated at once
+        :param interval: The number of seconds before the first read of a
+            node, the delay between two reads doubles while it is pending
+        :param timeout: The number of seconds after its Allocate request
+            a node which is not assembled yet is given up
+        :param scheduler: The task_monitor.Scheduler polling the nodes,
+            defaults to the shared one
+        :returns: A list of ComposeResult, in the order of the specs
+        :raises: ValidationError, if a spec is invalid. No node is composed.
+        """
+        target_uri = self._get_compose_action_element().target_uri
+        requests = [self._create_compose_request(**spec) for spec in specs]
+        results = [None] * len(requests)
+        if scheduler is None:
+            scheduler = task_monitor.get_scheduler()
+
+        def _allocate(properties):
+            started = time.time()
+            return self._allocate(target_uri, properties), started
+
+        compositions = []
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            allocate_jobs = dict(
+                (executor.submit(_allocate, properties), index)
+                for index, properties in enumerate(requests))
+
+            for job in futures.as_completed(allocate_jobs):
+                index = allocate_jobs[job]
+                try:
+                    path, started = job.result()
+                except exceptions.SushyError as e:
+                    LOG.warning('Failed to allocate node %(name)s: %(error)s',
+                                {'name': requests[index].get('Name'),
+                                 'error': e})
+                    results[index] = ComposeResult(None, None, e, None, None)
+                    continue
+                deadline = started + timeout
+                compositions.append((index, path, started, scheduler.watch(
+                    self._get_composition_poll(path, deadline), name=path,
+                    timeout=deadline - time.time(), interval=interval)))
+
+        for index, path, started, composition in compositions:
+            try:
+                node, allocated, assembled = composition.result()
+            except exceptions.SushyError as e:
+                LOG.warning('Failed to compose node %(node)s: %(error)s',
+                            {'node': path, 'error': e})
+                results[index] = ComposeResult(path, None, e, None, None)
+                continue
+            results[index] = ComposeResult(path, node, None,
+                                           allocated - started,
+                                           assembled - allocated)
+
+        return results
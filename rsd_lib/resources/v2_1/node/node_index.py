@@ -0,0 +1,208 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import logging
+import threading
+
+from concurrent import futures
+from sushy import exceptions
+
+from rsd_lib import inventory
+from rsd_lib.resources import base as rsd_base
+
+LOG = logging.getLogger(__name__)
+
+
+def _get_uuid(node):
+    return None if node.uuid is None else node.uuid.lower()
+
+
+def _get_system(node):
+    system = node.links.system if node.links is not None else None
+    return None if system is None else inventory.get_key(system)
+
+
+class NodeIndex(object):
+
+    def __init__(self, nodes, max_workers=rsd_base.DEFAULT_MAX_WORKERS):
+        """An index of the composed nodes of a NodeCollection
+
+        The nodes are fetched once by ``refresh()``, then looked up by
+        UUID, system, composed node state or power state without any
+        request.
+
+        :param nodes: A NodeCollection object
+        :param max_workers: The maximum number of nodes fetched at once
+        """
+        self._collection = nodes
+        self._max_workers = max_workers
+        self._nodes = collections.OrderedDict()
+        self._keys = {}
+        self._by_uuid = {}
+        self._by_system = {}
+        self._by_state = collections.defaultdict(set)
+        self._by_power_state = collections.defaultdict(set)
+        self._lock = threading.RLock()
+
+    def _unindex(self, path):
+        node = self._nodes.pop(path, None)
+        if node is None:
+            return
+        uuid, system, state, power_state = self._keys.pop(path)
+        if self._by_uuid.get(uuid) is node:
+            del self._by_uuid[uuid]
+        if self._by_system.get(system) is node:
+            del self._by_system[system]
+        self._by_state[state].discard(path)
+        self._by_power_state[power_state].discard(path)
+
+    def update(self, node):
+        """Index a node, or index it again after it was refreshed
+
+        :param node: A Node object
+        """
+        path = inventory.get_key(node.path)
+        keys = (_get_uuid(node), _get_system(node),
+                node.composed_node_state, node.power_state)
+        with self._lock:
+            self._unindex(path)
+            self._nodes[path] = node
+            self._keys[path] = keys
+            uuid, system, state, power_state = keys
+            if uuid is not None:
+                self._by_uuid[uuid] = node
+            if system is not None:
+                self._by_system[system] = node
+            self._by_state[state].add(path)
+            self._by_power_state[power_state].add(path)
+
+    def remove(self, path):
+        """Remove a node from the index, e.g. once deleted
+
+        :param path: The path of the node
+        """
+        with self._lock:
+            self._unindex(inventory.get_key(path))
+
+    def _fetch(self, paths, refreshed):
+        """Fetch new nodes and refresh indexed ones, return the failures"""
+        def _load(path):
+            node = self._nodes.get(path)
+            if node is None:
+                return self._collection.get_member(path)
+            node.refresh()
+            return node
+
+        failures = collections.OrderedDict()
+        with futures.ThreadPoolExecutor(
+                max_workers=self._max_workers) as executor:
+            jobs = [(path, executor.submit(_load, path))
+                    for path in list(paths) + list(refreshed)]
+            for path, job in jobs:
+                try:
+                    self.update(job.result())
+                except exceptions.ResourceNotFoundError:
+                    # Deleted since the collection was read
+                    self.remove(path)
+                except exceptions.SushyError as e:
+                    LOG.warning('Failed to fetch node %(path)s: %(error)s',
+                                {'path': path, 'error': e})
+                    failures[path] = e
+        return failures
+
+    def refresh(self, nodes=True):
+        """Synchronize the index with the collection
+
+        The nodes added to the collection are fetched and indexed, the
+        removed ones are dropped. If the service inlines the members of
+        the collection, all the nodes are read by a single request.
+
+        :param nodes: Whether the nodes already indexed are refreshed too,
+            e.g. to track their states
+        :returns: A dict mapping the path of every node which could not be
+            fetched to the SushyError raised while fetching it
+        """
+        collection = self._collection
+        bodies = rsd_base.get_expanded_bodies(collection._conn,
+                                              collection.path)
+        if bodies is None:
+            collection.refresh()
+            paths = collection.members_identities
+        else:
+            paths = list(bodies)
+
+        with self._lock:
+            current = set(inventory.get_key(path) for path in paths)
+            for path in list(self._nodes):
+                if path not in current:
+                    self._unindex(path)
+
+        new = []
+        refreshed = []
+        for path in paths:
+            body = None if bodies is None else bodies[path]
+            key = inventory.get_key(path)
+            if body is not None:
+                self.update(collection._get_member_from_body(path, body))
+            elif key not in self._nodes:
+                new.append(key)
+            elif nodes:
+                refreshed.append(key)
+        return self._fetch(new, refreshed)
+
+    def get_by_uuid(self, uuid):
+        """Return the node having a UUID, None if not indexed or None"""
+        if uuid is None:
+            return None
+        return self._by_uuid.get(uuid.lower())
+
+    def get_by_system(self, system):
+        """Return the node composed of a system
+
+        :param system: The path of the system
+        :returns: A Node object, None if not indexed
+        """
+        return self._by_system.get(inventory.get_key(system))
+
+    def find(self, composed_node_state=None, power_state=None):
+        """Return the nodes in a given state
+
+        :param composed_node_state: The composed node state, e.g.
+            ``COMPOSED_NODE_STATE_ASSEMBLED``, any if None
+        :param power_state: The power state, e.g. ``NODE_POWER_STATE_ON``,
+            any if None
+        :returns: A list of Node objects, in the order they were indexed
+        """
+        with self._lock:
+            if composed_node_state is None and power_state is None:
+                return list(self._nodes.values())
+            paths = None
+            if composed_node_state is not None:
+                paths = self._by_state.get(composed_node_state, set())
+            if power_state is not None:
+                power_paths = self._by_power_state.get(power_state, set())
+                paths = power_paths if paths is None else paths & power_paths
+            return [node for path, node in self._nodes.items()
+                    if path in paths]
+
+    def __contains__(self, path):
+        return inventory.get_key(path) in self._nodes
+
+    def __iter__(self):
+        return iter(list(self._nodes.values()))
+
+    def __len__(self):
+        return len(self._nodes)
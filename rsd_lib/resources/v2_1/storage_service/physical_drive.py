@@ -17,6 +17,8 @@ import logging
 
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
+
 LOG = logging.getLogger(__name__)
 
 
@@ -26,7 +28,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class PhysicalDrive(base.ResourceBase):
+class PhysicalDrive(rsd_base.ResourceBase):
 
     identity = base.Field('Id', required=True)
     """The physical drive identity string"""
@@ -67,7 +69,7 @@ class PhysicalDrive(base.ResourceBase):
                                             redfish_version)
 
 
-class PhysicalDriveCollection(base.ResourceCollectionBase):
+class PhysicalDriveCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -51,7 +51,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class RemoteTarget(base.ResourceBase):
+class RemoteTarget(rsd_base.ResourceBase):
 
     identity = base.Field('Id', required=True)
     """The target identity string"""
@@ -78,7 +78,7 @@ class RemoteTarget(base.ResourceBase):
                                            redfish_version)
 
 
-class RemoteTargetCollection(base.ResourceCollectionBase):
+class RemoteTargetCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -18,6 +18,7 @@ import logging
 from sushy import exceptions
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_1.storage_service import logical_drive
 from rsd_lib.resources.v2_1.storage_service import physical_drive
 from rsd_lib.resources.v2_1.storage_service import remote_target
@@ -31,7 +32,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class StorageService(base.ResourceBase):
+class StorageService(rsd_base.ResourceBase):
 
     description = base.Field('Description')
     """The storage service description"""
@@ -135,7 +136,7 @@ class StorageService(base.ResourceBase):
         self._remote_targets = None
 
 
-class StorageServiceCollection(base.ResourceCollectionBase):
+class StorageServiceCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
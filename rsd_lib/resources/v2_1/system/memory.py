@@ -15,6 +15,8 @@
 
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
+
 
 class MemoryLocationField(base.CompositeField):
     socket = base.Field('Socket', required=int)
@@ -29,7 +31,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class Memory(base.ResourceBase):
+class Memory(rsd_base.ResourceBase):
 
     name = base.Field('Name')
     """The memory name"""
@@ -117,7 +119,7 @@ class Memory(base.ResourceBase):
         super(Memory, self).__init__(connector, identity, redfish_version)
 
 
-class MemoryCollection(base.ResourceCollectionBase):
+class MemoryCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -0,0 +1,274 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import array
+import collections
+import logging
+
+from concurrent import futures
+from sushy import exceptions
+
+from rsd_lib import inventory
+from rsd_lib.resources import base as rsd_base
+
+LOG = logging.getLogger(__name__)
+
+NULL = -1
+"""Placeholder stored in an integer column for a missing integer"""
+
+
+class IntegerColumn(object):
+    """A column of integers, stored in a typed array
+
+    ``valid`` tells the missing values apart, it holds 1 for every integer
+    of ``data`` and 0 for every missing one.
+    """
+
+    def __init__(self):
+        self.data = array.array('l')
+        self.valid = array.array('b')
+
+    def append(self, value):
+        if value is None:
+            self.data.append(NULL)
+            self.valid.append(0)
+        else:
+            self.data.append(int(value))
+            self.valid.append(1)
+
+    def __getitem__(self, index):
+        if not self.valid[index]:
+            return None
+        return self.data[index]
+
+    def __len__(self):
+        return len(self.data)
+
+
+class StringColumn(object):
+    """A column of strings, stored as codes of interned values
+
+    Every distinct string is stored once in ``values``, the column itself
+    is a typed array of indexes in ``values``.
+    """
+
+    def __init__(self):
+        self.values = [None]
+        self.codes = array.array('l')
+        self._index = {None: 0}
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def _get(body, *path):
+    for key in path:
+        if not isinstance(body, dict):
+            return None
+        body = body.get(key)
+    return body
+
+
+COLUMNS = collections.OrderedDict([
+    ('system', (StringColumn, None)),
+    ('path', (StringColumn, ('@odata.id',))),
+    ('capacity_mib', (IntegerColumn, ('CapacityMiB',))),
+    ('operating_speed_mhz', (IntegerColumn, ('OperatingSpeedMhz',))),
+    ('memory_type', (StringColumn, ('MemoryType',))),
+    ('memory_device_type', (StringColumn, ('MemoryDeviceType',))),
+    ('socket', (IntegerColumn, ('MemoryLocation', 'Socket'))),
+    ('memory_controller', (IntegerColumn,
+                           ('MemoryLocation', 'MemoryController'))),
+    ('channel', (IntegerColumn, ('MemoryLocation', 'Channel'))),
+    ('slot', (IntegerColumn, ('MemoryLocation', 'Slot'))),
+    ('state', (StringColumn, ('Status', 'State'))),
+    ('health', (StringColumn, ('Status', 'Health'))),
+])
+"""The columns of a MemoryTable, with their type and JSON path"""
+
+
+class MemoryTable(object):
+
+    def __init__(self):
+        """A columnar table of memory modules
+
+        The table holds one row per memory module and one typed column per
+        field, see ``COLUMNS``. Missing values are None, and so are the
+        values of an integer column which are not integers. The columns
+        save memory, the aggregations are plain Python loops over them.
+        """
+        self.columns = collections.OrderedDict(
+            (name, column_class())
+            for name, (column_class, _path) in COLUMNS.items())
+
+    def append(self, system, body):
+        """Add a memory module to the table
+
+        :param system: The path of the system of the memory module
+        :param body: The JSON body of the Memory resource
+        """
+        for name, (_column_class, path) in COLUMNS.items():
+            value = system if path is None else _get(body, *path)
+            try:
+                self.columns[name].append(value)
+            except (TypeError, ValueError, OverflowError):
+                LOG.warning('Ignoring the invalid %(name)s %(value)r of '
+                            '%(path)s', {'name': name, 'value': value,
+                                         'path': body.get('@odata.id')})
+                self.columns[name].append(None)
+
+    def column(self, name):
+        """Return the values of a column
+
+        :param name: The column name
+        :returns: A list of values
+        """
+        column = self.columns[name]
+        return [column[i] for i in range(len(column))]
+
+    def rows(self):
+        """Iterate over the rows of the table
+
+        :returns: A generator of dicts mapping column names to values
+        """
+        for i in range(len(self)):
+            yield dict((name, column[i])
+                       for name, column in self.columns.items())
+
+    def sum(self, name, by=None):
+        """Return the sum of an integer column, missing values ignored
+
+        :param name: The name of an integer column, e.g. "capacity_mib"
+        :param by: The name of a string column to group the rows by, e.g.
+            "memory_type"
+        :returns: The sum, or a dict mapping every value of the ``by``
+            column to the sum of its rows
+        """
+        column = self.columns[name]
+        if by is None:
+            return sum(value for value, valid in zip(column.data,
+                                                     column.valid)
+                       if valid)
+
+        group = self.columns[by]
+        sums = collections.defaultdict(int)
+        for code, value, valid in zip(group.codes, column.data,
+                                      column.valid):
+            if valid:
+                sums[code] += value
+        return dict((group.values[code], total)
+                    for code, total in sums.items())
+
+    def count(self, by):
+        """Return the number of rows for every value of a string column
+
+        :param by: The name of a string column, e.g. "health"
+        :returns: A dict mapping the values of the column to their count
+        """
+        group = self.columns[by]
+        counts = collections.Counter(group.codes)
+        return dict((group.values[code], count)
+                    for code, count in counts.items())
+
+    def __len__(self):
+        return len(self.columns['path'])
+
+
+def _get_json(connector, path):
+    """Return the JSON body of a resource
+
+    :raises: InvalidBodyError, if the body is not valid JSON
+    """
+    response = connector.get(path=path)
+    try:
+        return response.json()
+    except ValueError as e:
+        raise inventory.InvalidBodyError(path=path, error=e)
+
+
+def _get_memory_bodies(connector, system_path):
+    """Return the memory module bodies of a system, in collection order"""
+    system = _get_json(connector, system_path)
+    memory_path = _get(system, 'Memory', '@odata.id')
+    if memory_path is None:
+        return []
+
+    bodies = rsd_base.get_expanded_bodies(connector, memory_path)
+    if bodies is None:
+        collection = _get_json(connector, memory_path)
+        bodies = collections.OrderedDict(
+            (member['@odata.id'], None)
+            for member in collection.get('Members', []))
+    return list(bodies.items())
+
+
+def export_memory(systems, max_workers=rsd_base.DEFAULT_MAX_WORKERS):
+    """Export the memory modules of all the systems into a MemoryTable
+
+    The JSON bodies are read directly, without building a Memory resource
+    per module. Systems and memory modules are fetched by a pool of at
+    most ``max_workers`` threads, a resource which fails to load is
+    skipped and its error reported.
+
+    :param systems: A SystemCollection object
+    :param max_workers: The maximum number of resources fetched at once
+    :returns: A tuple ``(table, failures)``. ``table`` is a MemoryTable
+        with the modules in the order of the collections and ``failures``
+        is a dict mapping the path of every resource which could not be
+        fetched to the SushyError raised while fetching it
+    """
+    connector = systems._conn
+    table = MemoryTable()
+    failures = collections.OrderedDict()
+
+    def _result(path, job):
+        try:
+            return job.result()
+        except exceptions.SushyError as e:
+            LOG.warning('Failed to fetch %(path)s: %(error)s',
+                        {'path': path, 'error': e})
+            failures[path] = e
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        systems_jobs = [
+            (path, executor.submit(_get_memory_bodies, connector, path))
+            for path in systems.members_identities]
+
+        modules_jobs = []
+        for system, job in systems_jobs:
+            for path, body in _result(system, job) or []:
+                if body is None:
+                    job = executor.submit(_get_json, connector, path)
+                else:
+                    job = futures.Future()
+                    job.set_result(body)
+                modules_jobs.append((system, path, job))
+
+        for system, path, job in modules_jobs:
+            body = _result(path, job)
+            if body is not None:
+                table.append(system, body)
+
+    return table, failures
@@ -16,11 +16,12 @@
 from sushy import exceptions
 from sushy.resources.system import system
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_1.system import memory
 from rsd_lib import utils
 
 
-class System(system.System):
+class System(system.System, rsd_base.ResourceBase):
 
     _memory = None  # ref to System memory collection instance
 
@@ -51,7 +52,8 @@ class System(system.System):
         self._memory = None
 
 
-class SystemCollection(system.SystemCollection):
+class SystemCollection(system.SystemCollection,
+                       rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
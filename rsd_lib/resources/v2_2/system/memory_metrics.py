@@ -15,8 +15,10 @@
 
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 
-class MemoryMetrics(base.ResourceBase):
+
+class MemoryMetrics(rsd_base.ResourceBase):
 
     name = base.Field('Name')
     """The metrics name"""
@@ -17,6 +17,7 @@ from sushy import exceptions
 from sushy.resources import base
 from sushy.resources.system import processor
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_2.system import processor_metrics
 from rsd_lib import utils
 
@@ -27,7 +28,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class Processor(processor.Processor):
+class Processor(processor.Processor, rsd_base.ResourceBase):
 
     status = StatusField('Status')
     """The processor status"""
@@ -61,7 +62,8 @@ class Processor(processor.Processor):
         self._metrics = None
 
 
-class ProcessorCollection(processor.ProcessorCollection):
+class ProcessorCollection(processor.ProcessorCollection,
+                          rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -15,8 +15,10 @@
 
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 
-class MetricDefinition(base.ResourceBase):
+
+class MetricDefinition(rsd_base.ResourceBase):
 
     name = base.Field('Name')
     """The CPUHealth metric definition name"""
@@ -36,6 +38,9 @@ class MetricDefinition(base.ResourceBase):
     sensing_interval = base.Field('SensingInterval')
     """The sensing interval"""
 
+    metric_properties = base.Field('MetricProperties', adapter=list)
+    """The URIs of the properties this metric definition applies to"""
+
     physical_context = base.Field('PhysicalContext')
     """The physical context of this metric definition"""
 
@@ -85,7 +90,7 @@ class MetricDefinition(base.ResourceBase):
     """The wildcards of the sensor"""
 
 
-class MetricDefinitionsCollection(base.ResourceCollectionBase):
+class MetricDefinitionsCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
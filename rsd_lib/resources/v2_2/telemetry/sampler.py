@@ -0,0 +1,196 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import logging
+import time
+
+from concurrent import futures
+from sushy import exceptions
+
+from rsd_lib.resources import base as rsd_base
+from rsd_lib.resources.v2_2.system import memory_metrics
+from rsd_lib.resources.v2_2.system import metrics
+from rsd_lib.resources.v2_2.system import processor_metrics
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 10
+"""Default number of seconds between two samplings of a resource"""
+
+METRICS = {
+    metrics.Metrics: ('processor_bandwidth_percent',
+                      'memory_bandwidth_percent',
+                      'memory_throttled_cycles_percent',
+                      'processor_power_watt',
+                      'memory_power_watt',
+                      'io_bandwidth_gbps'),
+    processor_metrics.ProcessorMetrics: ('average_frequency_mhz',
+                                         'throttling_celsius',
+                                         'temperature_celsius',
+                                         'consumed_power_watt'),
+    memory_metrics.MemoryMetrics: ('temperature_celsius',),
+}
+"""The sampled fields of every metrics resource type"""
+
+Sample = collections.namedtuple(
+    'Sample', ['timestamp', 'system', 'resource', 'metric', 'value'])
+"""A metric reading
+
+The system is the identity of the system, the resource is the path of the
+metrics resource, e.g. the one of a processor of the system.
+"""
+
+
+def _get_metrics(resource):
+    # The resource class may be a subclass, e.g. with lazy fields
+    for resource_class in type(resource).__mro__:
+        if resource_class in METRICS:
+            return METRICS[resource_class]
+    return ()
+
+
+class Sampler(object):
+
+    def __init__(self, systems, interval=DEFAULT_INTERVAL,
+                 max_workers=rsd_base.DEFAULT_MAX_WORKERS, processors=True,
+                 memory=True):
+        """Poll the metrics of a set of systems
+
+        :param systems: A list of v2_2 System objects
+        :param interval: The number of seconds between the starts of two
+            sampling rounds. A round which lasts longer, including the time
+            the consumer takes, is followed by the next one immediately.
+        :param max_workers: The maximum number of resources fetched at once
+        :param processors: Whether the metrics of the processors of the
+            systems are sampled
+        :param memory: Whether the metrics of the memory modules of the
+            systems are sampled
+        """
+        self._systems = list(systems)
+        self._interval = interval
+        self._max_workers = max_workers
+        self._processors = processors
+        self._memory = memory
+        self._targets = None
+
+    def _discover_system(self, system):
+        """Return the metrics resources of a system"""
+        resources = []
+        try:
+            resources.append(system.metrics)
+        except exceptions.SushyError as e:
+            LOG.warning('No metrics for system %(system)s: %(error)s',
+                        {'system': system.identity, 'error': e})
+
+        member_collections = []
+        if self._processors:
+            member_collections.append(system.processors)
+        if self._memory:
+            member_collections.append(system.memory)
+        for collection in member_collections:
+            members, _failures = collection.get_members_concurrently(
+                max_workers=self._max_workers)
+            for member in members:
+                try:
+                    resources.append(member.metrics)
+                except exceptions.SushyError as e:
+                    LOG.warning('No metrics for %(path)s: %(error)s',
+                                {'path': member.path, 'error': e})
+
+        return [(system.identity, resource) for resource in resources]
+
+    def _discover(self, executor):
+        jobs = [executor.submit(self._discover_system, system)
+                for system in self._systems]
+        targets = []
+        for system, job in zip(self._systems, jobs):
+            try:
+                targets.extend(job.result())
+            except exceptions.SushyError as e:
+                LOG.warning('Failed to discover the metrics of system '
+                            '%(system)s: %(error)s',
+                            {'system': system.path, 'error': e})
+        return targets
+
+    @staticmethod
+    def _read(system, resource, refresh):
+        """Return the samples of a metrics resource"""
+        if refresh:
+            try:
+                resource.refresh()
+            except exceptions.SushyError as e:
+                LOG.warning('Failed to sample %(path)s: %(error)s',
+                            {'path': resource.path, 'error': e})
+                return []
+
+        timestamp = time.time()
+        samples = []
+        for metric in _get_metrics(resource):
+            value = getattr(resource, metric)
+            if value is not None:
+                samples.append(Sample(timestamp, system, resource.path,
+                                      metric, value))
+        return samples
+
+    def _round(self, executor, refresh):
+        """Sample every resource once
+
+        At most ``max_workers`` resources are read ahead of the consumer,
+        the next ones are fetched as the samples are consumed.
+        """
+        pending = collections.deque()
+        for system, resource in self._targets:
+            pending.append(executor.submit(self._read, system, resource,
+                                           refresh))
+            if len(pending) >= self._max_workers:
+                for sample in pending.popleft().result():
+                    yield sample
+
+        while pending:
+            for sample in pending.popleft().result():
+                yield sample
+
+    def samples(self, rounds=None):
+        """Sample the metrics of the systems
+
+        The metrics resources of the systems are discovered once, then
+        fetched on every round. Resources which fail to load are skipped.
+
+        :param rounds: The number of sampling rounds, forever if None
+        :returns: A generator of Sample objects
+        """
+        with futures.ThreadPoolExecutor(
+                max_workers=self._max_workers) as executor:
+            refresh = True
+            if self._targets is None:
+                # The discovered resources were just fetched
+                self._targets = self._discover(executor)
+                refresh = False
+
+            count = 0
+            while rounds is None or count < rounds:
+                started = time.time()
+                for sample in self._round(executor, refresh):
+                    yield sample
+                refresh = True
+                count += 1
+
+                delay = started + self._interval - time.time()
+                if delay > 0 and (rounds is None or count < rounds):
+                    time.sleep(delay)
+
+    def __iter__(self):
+        return self.samples()
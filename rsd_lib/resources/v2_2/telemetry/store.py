@@ -0,0 +1,274 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import array
+import collections
+import logging
+import re
+import threading
+
+from rsd_lib.resources.v2_2.telemetry import sampler
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 8640
+"""Default number of readings kept per metric, a day every 10 seconds"""
+
+DEFAULT_WINDOW = 60
+"""Default number of seconds aggregated by a downsampling window"""
+
+_DURATION = re.compile(r'^P(?:(?P<days>\d+(?:\.\d+)?)D)?'
+                       r'(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?'
+                       r'(?:(?P<minutes>\d+(?:\.\d+)?)M)?'
+                       r'(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$')
+
+_SECONDS = re.compile(r'^(?P<seconds>\d+(?:\.\d+)?)\s*s$')
+
+_UNITS = {'days': 86400, 'hours': 3600, 'minutes': 60, 'seconds': 1}
+
+Window = collections.namedtuple(
+    'Window', ['start', 'minimum', 'maximum', 'average', 'count'])
+"""The aggregated readings of a downsampling window"""
+
+
+def parse_interval(interval):
+    """Return the number of seconds of a metric definition interval
+
+    :param interval: An ISO 8601 duration, e.g. "PT1S", or a number of
+        seconds suffixed with "s", e.g. "10.0s"
+    :returns: A number of seconds, None if the interval is missing or
+        can't be parsed
+    """
+    if interval is None:
+        return None
+    match = _DURATION.match(interval) or _SECONDS.match(interval)
+    if match is None or not any(match.groups()):
+        LOG.warning('Unsupported metric interval %s', interval)
+        return None
+    return sum(float(value) * _UNITS[unit]
+               for unit, value in match.groupdict().items()
+               if value is not None)
+
+
+def _aggregate(start, readings):
+    return Window(start, min(readings), max(readings),
+                  sum(readings) / len(readings), len(readings))
+
+
+class RingBuffer(object):
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """A fixed size buffer of timestamped readings
+
+        The arrays grow up to ``capacity`` readings, then every new
+        reading replaces the oldest one.
+
+        :param capacity: The maximum number of readings kept
+        :raises: ValueError, if capacity is lower than 1
+        """
+        if capacity < 1:
+            raise ValueError('The capacity of a RingBuffer must be at least '
+                             '1, not %s' % capacity)
+        self.capacity = capacity
+        self._timestamps = array.array('d')
+        self._values = array.array('d')
+        self._start = 0
+
+    def append(self, timestamp, value):
+        """Add a reading, dropping the oldest one if the buffer is full"""
+        if len(self._values) < self.capacity:
+            self._timestamps.append(timestamp)
+            self._values.append(value)
+        else:
+            self._timestamps[self._start] = timestamp
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+
+    def last(self):
+        """Return the last reading as a (timestamp, value) tuple or None"""
+        if not self._values:
+            return None
+        index = (self._start - 1) % len(self._values)
+        return self._timestamps[index], self._values[index]
+
+    def items(self):
+        """Return the readings from the oldest to the newest
+
+        :returns: A list of (timestamp, value) tuples
+        """
+        timestamps = self._timestamps[self._start:] + \
+            self._timestamps[:self._start]
+        values = self._values[self._start:] + self._values[:self._start]
+        return list(zip(timestamps, values))
+
+    def downsample(self, window, since=None):
+        """Aggregate the readings by window
+
+        Windows are aligned on multiples of their length.
+
+        :param window: The length of a window in seconds
+        :param since: Only aggregate the readings from this timestamp
+        :returns: A list of Window tuples, from the oldest
+        """
+        windows = []
+        readings = []
+        start = None
+        for timestamp, value in self.items():
+            if since is not None and timestamp < since:
+                continue
+            current = timestamp - timestamp % window
+            if current != start and readings:
+                windows.append(_aggregate(start, readings))
+                readings = []
+            start = current
+            readings.append(value)
+        if readings:
+            windows.append(_aggregate(start, readings))
+        return windows
+
+    def __len__(self):
+        return len(self._values)
+
+
+def _get_property_metrics():
+    """Map the JSON properties of the metrics resources to sampled fields"""
+    metrics = {}
+    for resource_class, names in sampler.METRICS.items():
+        for name in names:
+            metrics[getattr(resource_class, name)._path[-1]] = name
+    return metrics
+
+
+class TelemetryStore(object):
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, window=DEFAULT_WINDOW):
+        """A store of the metric readings of a pod
+
+        Readings are kept in a RingBuffer per metric of every metrics
+        resource.
+
+        :param capacity: The maximum number of readings kept per metric
+        :param window: The default number of seconds aggregated by a
+            downsampling window
+        :raises: ValueError, if capacity is lower than 1
+        """
+        if capacity < 1:
+            raise ValueError('The capacity of a TelemetryStore must be at '
+                             'least 1, not %s' % capacity)
+        self.capacity = capacity
+        self.window = window
+        self._buffers = {}
+        self._systems = {}
+        self._intervals = {}
+        self._lock = threading.Lock()
+
+    def add_definitions(self, definitions):
+        """Use the intervals of metric definitions
+
+        The sensing interval of a metric is the minimum delay between two
+        stored readings: a sensor doesn't change in between, the extra
+        readings are dropped. Its downsampling window is the calculation
+        time interval, or the sensing interval, if longer than the default
+        window.
+
+        :param definitions: A list of MetricDefinition objects, their
+            metric properties are matched against the sampled resources.
+            Wildcards are not supported.
+        """
+        property_metrics = _get_property_metrics()
+        for definition in definitions:
+            sensing = parse_interval(definition.sensing_interval)
+            calculation = parse_interval(
+                definition.calculation_time_interval)
+            for uri in definition.metric_properties or []:
+                resource, _sep, pointer = uri.partition('#')
+                metric = None
+                if pointer:
+                    metric = property_metrics.get(pointer.rsplit('/', 1)[-1])
+                    if metric is None:
+                        # Not a sampled property
+                        continue
+                # A definition without pointer covers the whole resource
+                self._intervals[(resource, metric)] = (sensing, calculation)
+
+    def _get_intervals(self, resource, metric):
+        intervals = self._intervals.get((resource, metric))
+        if intervals is None:
+            intervals = self._intervals.get((resource, None), (None, None))
+        return intervals
+
+    def get_window(self, resource, metric):
+        """Return the downsampling window of a metric, in seconds"""
+        sensing, calculation = self._get_intervals(resource, metric)
+        return max(self.window, calculation or 0, sensing or 0)
+
+    def append(self, sample):
+        """Store a Sample
+
+        :param sample: A Sample, e.g. read by a Sampler
+        :returns: True if stored, False if dropped because it is closer
+            than the sensing interval to the previous reading
+        """
+        key = (sample.resource, sample.metric)
+        sensing, _calculation = self._get_intervals(*key)
+        with self._lock:
+            buf = self._buffers.get(key)
+            if buf is None:
+                buf = self._buffers[key] = RingBuffer(self.capacity)
+                self._systems[key] = sample.system
+
+            last = buf.last()
+            if sensing is not None and last is not None:
+                if sample.timestamp - last[0] < sensing:
+                    return False
+            buf.append(sample.timestamp, sample.value)
+        return True
+
+    def extend(self, samples):
+        """Store Samples
+
+        :param samples: An iterable of Sample, e.g. ``Sampler.samples()``
+        """
+        for sample in samples:
+            self.append(sample)
+
+    def get_buffer(self, resource, metric):
+        """Return the RingBuffer of a metric, None if it has no reading"""
+        return self._buffers.get((resource, metric))
+
+    def keys(self, system=None):
+        """Return the (resource, metric) tuples having readings
+
+        :param system: Only return the metrics of this system
+        """
+        return [key for key in self._buffers
+                if system is None or self._systems[key] == system]
+
+    def downsample(self, resource, metric, window=None, since=None):
+        """Aggregate the readings of a metric by window
+
+        :param resource: The path of the metrics resource
+        :param metric: The metric name, e.g. "temperature_celsius"
+        :param window: The length of a window in seconds, defaults to
+            ``get_window()``
+        :param since: Only aggregate the readings from this timestamp
+        :returns: A list of Window tuples, from the oldest
+        """
+        buf = self.get_buffer(resource, metric)
+        if buf is None:
+            return []
+        if window is None:
+            window = self.get_window(resource, metric)
+        return buf.downsample(window, since=since)
@@ -16,6 +16,7 @@
 from sushy import exceptions
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_2.telemetry.metric_definitions \
     import metric_definitions
 from rsd_lib import utils
@@ -26,7 +27,7 @@ class StatusField(base.CompositeField):
     health = base.Field('Health')
 
 
-class Telemetry(base.ResourceBase):
+class Telemetry(rsd_base.ResourceBase):
 
     status = StatusField('Status')
     """The telemetry service status"""
@@ -13,12 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import jsonschema
 import logging
 
 from sushy.resources import base
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_3.fabric import endpoint_schemas
 from rsd_lib import utils as rsd_lib_utils
 
@@ -69,7 +69,7 @@ class OemField(base.CompositeField):
     authentication = AuthenticationField(['Intel_RackScale', 'Authentication'])
 
 
-class Endpoint(base.ResourceBase):
+class Endpoint(rsd_base.ResourceBase):
 
     connected_entities = ConnectedEntitiesField('ConnectedEntities')
     """Entities connected to endpoint"""
@@ -142,7 +142,7 @@ class Endpoint(base.ResourceBase):
         self._conn.patch(self.path, data=data)
 
 
-class EndpointCollection(base.ResourceCollectionBase):
+class EndpointCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -165,27 +165,28 @@ class EndpointCollection(base.ResourceCollectionBase):
 
         request = {}
 
-        jsonschema.validate(identifiers,
-                            endpoint_schemas.identifiers_req_schema)
+        rsd_lib_utils.validate(identifiers,
+                               endpoint_schemas.identifiers_req_schema)
         request['Identifiers'] = identifiers
 
-        jsonschema.validate(connected_entities,
-                            endpoint_schemas.connected_entities_req_schema)
+        rsd_lib_utils.validate(connected_entities,
+                               endpoint_schemas.connected_entities_req_schema)
         request['ConnectedEntities'] = connected_entities
 
         if protocol is not None:
-            jsonschema.validate(protocol, endpoint_schemas.protocol_req_schema)
+            rsd_lib_utils.validate(protocol,
+                                   endpoint_schemas.protocol_req_schema)
             request['EndpointProtocol'] = protocol
 
         if ip_transport_details is not None:
-            jsonschema.validate(
+            rsd_lib_utils.validate(
                 ip_transport_details,
                 endpoint_schemas.ip_transport_details_req_schema)
             request['IPTransportDetails'] = ip_transport_details
 
         if interface is not None:
-            jsonschema.validate(interface,
-                                endpoint_schemas.interface_req_schema)
+            rsd_lib_utils.validate(interface,
+                                   endpoint_schemas.interface_req_schema)
             request['Links'] = {
                 "Oem": {
                     "Intel_RackScale": {
@@ -199,8 +200,8 @@ class EndpointCollection(base.ResourceCollectionBase):
             }
 
         if authentication is not None:
-            jsonschema.validate(authentication,
-                                endpoint_schemas.authentication_req_schema)
+            rsd_lib_utils.validate(authentication,
+                                   endpoint_schemas.authentication_req_schema)
             request['Oem'] = {"Intel_RackScale":
                               {"Authentication": authentication}}
 
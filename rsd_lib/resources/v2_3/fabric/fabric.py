@@ -18,6 +18,7 @@ import logging
 from sushy import exceptions
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_3.fabric import endpoint
 from rsd_lib import utils as rsd_lib_utils
 
@@ -30,7 +31,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class Fabric(base.ResourceBase):
+class Fabric(rsd_base.ResourceBase):
 
     description = base.Field('Description')
     """The fabric description"""
@@ -89,7 +90,7 @@ class Fabric(base.ResourceBase):
         self._endpoints = None
 
 
-class FabricCollection(base.ResourceCollectionBase):
+class FabricCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
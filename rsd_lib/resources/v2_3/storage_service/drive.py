@@ -18,6 +18,7 @@ import logging
 from sushy.resources import base
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib import utils as rsd_lib_utils
 
 LOG = logging.getLogger(__name__)
@@ -63,7 +64,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class Drive(base.ResourceBase):
+class Drive(rsd_base.ResourceBase):
 
     identity = base.Field('Id', required=True)
     """The drive identity string"""
@@ -151,7 +152,7 @@ class Drive(base.ResourceBase):
         super(Drive, self).__init__(connector, identity, redfish_version)
 
 
-class DriveCollection(base.ResourceCollectionBase):
+class DriveCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
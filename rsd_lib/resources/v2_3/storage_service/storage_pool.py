@@ -19,6 +19,7 @@ from sushy import exceptions
 from sushy.resources import base
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_3.storage_service import volume
 from rsd_lib import utils as rsd_lib_utils
 
@@ -50,7 +51,7 @@ class IdentifiersField(base.ListField):
     durable_name_format = base.Field('DurableNameFormat')
 
 
-class StoragePool(base.ResourceBase):
+class StoragePool(rsd_base.ResourceBase):
 
     identity = base.Field('Id', required=True)
     """The storage pool  identity string"""
@@ -137,7 +138,7 @@ class StoragePool(base.ResourceBase):
         self._allocated_pools = None
 
 
-class StoragePoolCollection(base.ResourceCollectionBase):
+class StoragePoolCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
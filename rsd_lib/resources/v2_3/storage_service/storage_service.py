@@ -18,6 +18,7 @@ import logging
 from sushy import exceptions
 from sushy.resources import base
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_3.storage_service import drive
 from rsd_lib.resources.v2_3.storage_service import storage_pool
 from rsd_lib.resources.v2_3.storage_service import volume
@@ -32,7 +33,7 @@ class StatusField(base.CompositeField):
     health_rollup = base.Field('HealthRollup')
 
 
-class StorageService(base.ResourceBase):
+class StorageService(rsd_base.ResourceBase):
 
     description = base.Field('Description')
     """The storage service description"""
@@ -136,7 +137,7 @@ class StorageService(base.ResourceBase):
         self._drives = None
 
 
-class StorageServiceCollection(base.ResourceCollectionBase):
+class StorageServiceCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -13,13 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import jsonschema
 import logging
 
 from sushy import exceptions
 from sushy.resources import base
 from sushy import utils
 
+from rsd_lib.resources import base as rsd_base
 from rsd_lib.resources.v2_3.storage_service import volume_schemas
 from rsd_lib import utils as rsd_lib_utils
 
@@ -70,7 +70,7 @@ class VolumeActionsField(base.CompositeField):
     initialize = InitializeActionField('#Volume.Initialize')
 
 
-class Volume(base.ResourceBase):
+class Volume(rsd_base.ResourceBase):
 
     identity = base.Field('Id', required=True)
     """The volume identity string"""
@@ -175,6 +175,8 @@ class Volume(base.ResourceBase):
         """Change initialize type of this volume
 
         :param type: volume initialize type
+        :returns: The response, see ``task_monitor.watch_volume()`` to wait
+            for the volume to be initialized
         :raises: InvalidParameterValueError if invalid "type" parameter
         """
         allowed_init_type_values = ['Fast', 'Slow']
@@ -186,14 +188,18 @@ class Volume(base.ResourceBase):
         data = {"InitializeType": init_type}
 
         target_uri = self._get_initialize_action_element().target_uri
-        self._conn.post(target_uri, data=data)
+        return self._conn.post(target_uri, data=data)
 
     def delete(self):
-        """Delete this volume"""
-        self._conn.delete(self.path)
+        """Delete this volume
+
+        :returns: The response, see ``task_monitor.watch_deletion()`` to
+            wait for the volume to be deleted
+        """
+        return self._conn.delete(self.path)
 
 
-class VolumeCollection(base.ResourceCollectionBase):
+class VolumeCollection(rsd_base.ResourceCollectionBase):
 
     @property
     def _resource_type(self):
@@ -216,29 +222,28 @@ class VolumeCollection(base.ResourceCollectionBase):
 
         request = {}
 
-        jsonschema.validate(capacity,
-                            volume_schemas.capacity_req_schema)
+        rsd_lib_utils.validate(capacity, volume_schemas.capacity_req_schema)
         request['CapacityBytes'] = capacity
 
         if access_capabilities is not None:
-            jsonschema.validate(
+            rsd_lib_utils.validate(
                 access_capabilities,
                 volume_schemas.access_capabilities_req_schema)
             request['AccessCapabilities'] = access_capabilities
 
         if capacity_sources is not None:
-            jsonschema.validate(capacity_sources,
-                                volume_schemas.capacity_sources_req_schema)
+            rsd_lib_utils.validate(capacity_sources,
+                                   volume_schemas.capacity_sources_req_schema)
             request['CapacitySources'] = capacity_sources
 
         if replica_infos is not None:
-            jsonschema.validate(replica_infos,
-                                volume_schemas.replica_infos_req_schema)
+            rsd_lib_utils.validate(replica_infos,
+                                   volume_schemas.replica_infos_req_schema)
             request['ReplicaInfos'] = replica_infos
 
         if bootable is not None:
-            jsonschema.validate(bootable,
-                                volume_schemas.bootable_req_schema)
+            rsd_lib_utils.validate(bootable,
+                                   volume_schemas.bootable_req_schema)
             request['Oem'] = {"Intel_RackScale": {"Bootable": bootable}}
 
         return request
@@ -0,0 +1,313 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from concurrent import futures
+from sushy import exceptions
+
+from rsd_lib.resources import base as rsd_base
+from rsd_lib.resources.v2_1.node import constants as node_cons
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1
+"""Default number of seconds before the first poll of an operation"""
+
+DEFAULT_MAX_INTERVAL = 30
+"""Default maximum number of seconds between two polls of an operation"""
+
+ACCEPTED = 202
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class TaskError(exceptions.SushyError):
+    message = 'The operation on %(resource)s failed: %(error)s'
+
+
+class _Operation(object):
+
+    __slots__ = ('poll', 'name', 'future', 'interval', 'deadline')
+
+    def __init__(self, poll, name, future, interval, deadline):
+        self.poll = poll
+        self.name = name
+        self.future = future
+        self.interval = interval
+        self.deadline = deadline
+
+
+class Scheduler(object):
+
+    def __init__(self, interval=DEFAULT_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL,
+                 max_workers=rsd_base.DEFAULT_MAX_WORKERS):
+        """A poller of pending operations
+
+        A single thread keeps the operations ordered by their next poll
+        time, and polls the due ones with a pool of threads. The delay
+        between two polls of an operation doubles every time it is still
+        pending, up to ``max_interval``.
+
+        :param interval: The number of seconds before the first poll of an
+            operation
+        :param max_interval: The maximum number of seconds between two
+            polls of an operation
+        :param max_workers: The maximum number of polls running at once
+        """
+        self.interval = interval
+        self.max_interval = max_interval
+        self._max_workers = max_workers
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._thread = None
+        self._closed = False
+
+    @staticmethod
+    def _fail(operation, error):
+        if not operation.future.done():
+            operation.future.set_exception(TaskError(
+                resource=operation.name, error=error))
+
+    def _schedule(self, operation, delay):
+        with self._condition:
+            if self._closed:
+                self._fail(operation, 'the scheduler is closed')
+                return
+            if self._thread is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers)
+                self._thread = threading.Thread(target=self._run,
+                                                name='rsd-lib-scheduler')
+                self._thread.daemon = True
+                self._thread.start()
+            heapq.heappush(self._heap, (time.time() + delay,
+                                        next(self._counter), operation))
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                _when, _count, operation = heapq.heappop(self._heap)
+                self._executor.submit(self._poll, operation)
+
+    def _poll(self, operation):
+        if operation.future.cancelled():
+            return
+        try:
+            done, result = operation.poll()
+        except Exception as e:
+            operation.future.set_exception(e)
+            return
+        if done:
+            operation.future.set_result(result)
+            return
+
+        operation.interval = min(operation.interval * 2, self.max_interval)
+        delay = operation.interval
+        if operation.deadline is not None:
+            remaining = operation.deadline - time.time()
+            if remaining <= 0:
+                self._fail(operation, 'timed out')
+                return
+            # The last poll is at the deadline
+            delay = min(delay, remaining)
+        self._schedule(operation, delay)
+
+    def watch(self, poll, name=None, timeout=None, interval=None):
+        """Track a pending operation
+
+        :param poll: A callable returning a tuple ``(done, result)``, it is
+            called until done is True. An exception it raises fails the
+            operation.
+        :param name: The name of the operation, e.g. the resource path,
+            used in error messages
+        :param timeout: The number of seconds after which a pending
+            operation fails with a TaskError, never if None. The last poll
+            is at the deadline.
+        :param interval: The number of seconds before the first poll of
+            the operation, defaults to the one of the scheduler
+        :returns: A Future, its result is the one of the last poll.
+            Cancelling it stops the polling, closing the scheduler fails
+            it with a TaskError.
+        :raises: RuntimeError, if the scheduler is closed
+        """
+        if self._closed:
+            raise RuntimeError('The scheduler is closed')
+        future = futures.Future()
+        deadline = None if timeout is None else time.time() + timeout
+        if interval is None:
+            interval = self.interval
+        self._schedule(_Operation(poll, name, future, interval, deadline),
+                       interval)
+        return future
+
+    def watch_task(self, connector, response, timeout=None):
+        """Track a Redfish task monitor
+
+        The task monitor, given by the Location header of a 202 Accepted
+        response, answers 202 Accepted as long as the task is running.
+
+        :param connector: A Connector instance
+        :param response: The response of the request starting the task
+        :param timeout: The number of seconds after which a running task
+            fails with a TaskError
+        :returns: A Future, its result is the final response of the task
+            monitor, or ``response`` itself if it isn't a 202 Accepted
+        """
+        if response.status_code != ACCEPTED:
+            future = futures.Future()
+            future.set_result(response)
+            return future
+
+        location = response.headers['Location']
+
+        def _poll():
+            task_response = connector.get(path=location)
+            return task_response.status_code != ACCEPTED, task_response
+
+        return self.watch(_poll, name=location, timeout=timeout)
+
+    def watch_state(self, resource, get_state, states, failed_states=(),
+                    timeout=None):
+        """Track the state of a resource
+
+        :param resource: The resource, it is refreshed on every poll
+        :param get_state: A callable returning the state of the resource,
+            e.g. ``lambda node: node.composed_node_state``
+        :param states: The states ending the operation
+        :param failed_states: The states failing the operation with a
+            TaskError
+        :param timeout: The number of seconds after which the operation
+            fails with a TaskError
+        :returns: A Future, its result is the resource
+        """
+        def _poll():
+            resource.refresh()
+            state = get_state(resource)
+            if state in failed_states:
+                raise TaskError(resource=resource.path,
+                                error='the state is %s' % state)
+            return state in states, resource
+
+        return self.watch(_poll, name=resource.path, timeout=timeout)
+
+    def watch_deletion(self, resource, timeout=None):
+        """Track the deletion of a resource
+
+        :param resource: The resource, it is deleted once not found
+        :param timeout: The number of seconds after which the operation
+            fails with a TaskError
+        :returns: A Future, its result is None
+        """
+        def _poll():
+            try:
+                resource.refresh()
+            except exceptions.ResourceNotFoundError:
+                return True, None
+            return False, None
+
+        return self.watch(_poll, name=resource.path, timeout=timeout)
+
+    def close(self):
+        """Stop polling
+
+        The futures of the pending operations fail with a TaskError, the
+        operations themselves go on in the service.
+        """
+        with self._condition:
+            self._closed = True
+            heap, self._heap = self._heap, []
+            for _when, _count, operation in heap:
+                self._fail(operation, 'the scheduler is closed')
+            self._condition.notify()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def get_scheduler():
+    """Return the Scheduler shared by the whole process"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
+
+
+def watch_assembly(node, timeout=None, scheduler=None):
+    """Track the assembly of a composed node
+
+    :param node: A Node object, its assembly requested
+    :param timeout: The number of seconds after which the operation fails
+    :param scheduler: A Scheduler, defaults to the shared one
+    :returns: A Future, its result is the node once Assembled
+    """
+    if scheduler is None:
+        scheduler = get_scheduler()
+    return scheduler.watch_state(
+        node, lambda node: node.composed_node_state,
+        [node_cons.COMPOSED_NODE_STATE_ASSEMBLED],
+        [node_cons.COMPOSED_NODE_STATE_FAILED], timeout=timeout)
+
+
+def watch_volume(volume, timeout=None, scheduler=None):
+    """Track the creation or initialization of a volume
+
+    :param volume: A Volume object
+    :param timeout: The number of seconds after which the operation fails
+    :param scheduler: A Scheduler, defaults to the shared one
+    :returns: A Future, its result is the volume once Enabled
+    """
+    if scheduler is None:
+        scheduler = get_scheduler()
+    return scheduler.watch_state(
+        volume, lambda volume: volume.status.state, ['Enabled'],
+        timeout=timeout)
+
+
+def watch_deletion(resource, timeout=None, scheduler=None):
+    """Track the deletion of a node or of a volume
+
+    :param resource: A Node or Volume object, its deletion requested
+    :param timeout: The number of seconds after which the operation fails
+    :param scheduler: A Scheduler, defaults to the shared one
+    :returns: A Future, its result is None once the resource is gone
+    """
+    if scheduler is None:
+        scheduler = get_scheduler()
+    return scheduler.watch_deletion(resource, timeout=timeout)
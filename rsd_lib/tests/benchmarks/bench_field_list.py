@@ -0,0 +1,68 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Parsing cost of FieldList values
+
+Compares rsd_lib FieldList, which builds one slots record per element,
+with the sushy ListField copying the field descriptor per element.
+
+Run with: python -m rsd_lib.tests.benchmarks.bench_field_list
+"""
+
+import timeit
+
+from sushy.resources import base
+
+from rsd_lib.resources import base as rsd_base
+
+SIZES = (10, 1000, 100000)
+
+
+class _IdentifiersRecords(rsd_base.FieldList):
+    name_format = base.Field('DurableNameFormat')
+    name = base.Field('DurableName')
+
+
+class _IdentifiersCopies(base.ListField):
+    name_format = base.Field('DurableNameFormat')
+    name = base.Field('DurableName')
+
+
+def get_body(size):
+    return {'Identifiers': [{'DurableNameFormat': 'NQN',
+                             'DurableName': 'nqn.2014-08.org:uuid:%d' % i}
+                            for i in range(size)]}
+
+
+def measure(field, body, number):
+    """Return the best time to load a field, in seconds"""
+    timer = timeit.Timer(lambda: field._load(body, None))
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    fields = (('FieldList', _IdentifiersRecords('Identifiers')),
+              ('copy.copy', _IdentifiersCopies('Identifiers')))
+    print('%10s %15s %15s' % ('elements', fields[0][0], fields[1][0]))
+    for size in SIZES:
+        body = get_body(size)
+        number = max(1, 100000 // size)
+        times = [measure(field, body, number) for _name, field in fields]
+        print('%10d %13.3fms %13.3fms' % ((size,) + tuple(
+            t * 1000 for t in times)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Import time of rsd_lib
+
+Every statement is timed in a new interpreter. ``import rsd_lib`` only
+loads the versioned package of the service on ``factory()``, the other
+statements load the packages which used to be imported with it.
+
+Run with: python -m rsd_lib.tests.benchmarks.bench_import
+"""
+
+import subprocess
+import sys
+
+REPEAT = 5
+
+STATEMENTS = (
+    ('sushy', 'import sushy'),
+    ('rsd_lib', 'import rsd_lib'),
+    ('rsd_lib, v2_3', 'import rsd_lib.resources.v2_3'),
+    ('rsd_lib, all versions', 'import rsd_lib.resources.v2_1, '
+                              'rsd_lib.resources.v2_2, '
+                              'rsd_lib.resources.v2_3'),
+)
+
+_SCRIPT = '''
+import sys
+import time
+started = time.time()
+%s
+print(time.time() - started)
+print(len([name for name in sys.modules if name.startswith('rsd_lib')]))
+print('jsonschema' in sys.modules)
+'''
+
+
+def measure(statement):
+    """Return the best import time in seconds and the loaded modules"""
+    times = []
+    for _i in range(REPEAT):
+        output = subprocess.check_output(
+            [sys.executable, '-c', _SCRIPT % statement])
+        seconds, modules, jsonschema = output.decode().split()
+        times.append(float(seconds))
+    return min(times), int(modules), jsonschema == 'True'
+
+
+def main():
+    print('%25s %10s %10s %12s' % ('import', 'time', 'modules',
+                                   'jsonschema'))
+    for name, statement in STATEMENTS:
+        seconds, modules, jsonschema = measure(statement)
+        print('%25s %8.1fms %10d %12s' % (name, seconds * 1000, modules,
+                                          jsonschema))
+
+
+if __name__ == '__main__':
+    main()
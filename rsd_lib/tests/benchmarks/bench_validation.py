@@ -0,0 +1,76 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Validation cost of compose requests
+
+Compares validating the specs of a bulk composition with the cached
+validators of rsd_lib.utils, and with jsonschema.validate checking every
+schema and building a validator on every call.
+
+Run with: python -m rsd_lib.tests.benchmarks.bench_validation
+"""
+
+import timeit
+
+import jsonschema
+
+from rsd_lib.resources.v2_1.node import schemas as node_schemas
+from rsd_lib import utils
+
+SIZES = (1, 100, 1000)
+
+SPEC = (
+    ([{'Model': 'Multi-Core Intel(R) Xeon(R) processor 7xxx Series',
+       'TotalCores': 8, 'AchievableSpeedMHz': 3700,
+       'InstructionSet': 'x86-64'}],
+     node_schemas.processor_req_schema),
+    ([{'CapacityMiB': 16000, 'MemoryDeviceType': 'DDR4',
+       'SpeedMHz': 2400}],
+     node_schemas.memory_req_schema),
+    ([{'CapacityGiB': 80, 'iSCSIAddress': 'iqn.2018-01.com.intel:node1'}],
+     node_schemas.remote_drive_req_schema),
+    ([{'CapacityGiB': 100, 'Type': 'SSD', 'Interface': 'SATA'}],
+     node_schemas.local_drive_req_schema),
+    (16, node_schemas.total_system_core_req_schema),
+    (32000, node_schemas.total_system_memory_req_schema),
+)
+"""The parameters of a compose request, with their schema"""
+
+
+def measure(validate, size):
+    """Return the best time to validate ``size`` specs, in seconds"""
+    def _validate_specs():
+        for _i in range(size):
+            for instance, schema in SPEC:
+                validate(instance, schema)
+
+    timer = timeit.Timer(_validate_specs)
+    number = max(1, 1000 // size)
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    validations = (('cached', utils.validate),
+                   ('jsonschema', jsonschema.validate))
+    print('%10s %15s %15s' % ('specs', validations[0][0],
+                              validations[1][0]))
+    for size in SIZES:
+        times = [measure(validate, size) for _name, validate in validations]
+        print('%10d %13.3fms %13.3fms' % ((size,) + tuple(
+            t * 1000 for t in times)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cost of the main workloads against a synthetic pod
+
+Every workload runs against an in-process PODM emulator serving a
+synthetic RSD 2.3 pod, REPEAT times to measure its best wall time, the
+number of requests it sends and the number of bytes it receives, and once
+more to measure its peak memory. A workload regresses when it sends more
+requests or receives more bytes than its baseline. The wall time and the
+peak memory depend on the machine and the Python version, they are only
+reported.
+
+Run with: python -m rsd_lib.tests.benchmarks.bench_workloads [--save]
+"""
+
+import argparse
+import collections
+import json
+import logging
+import os
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2, the peak memory isn't measured
+    tracemalloc = None
+
+import rsd_lib
+from rsd_lib.tests.benchmarks import bench_field_list
+from rsd_lib.tests.benchmarks import bench_validation
+from rsd_lib.tests.emulator import pod
+from rsd_lib.tests.emulator import server
+from rsd_lib import utils
+
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+POD = {'systems': 50, 'nodes': 25, 'volumes': 100, 'drives': 32,
+       'fabrics': 2}
+"""The size of the synthetic pod"""
+
+COUNT = 20
+"""Number of nodes composed, volumes created and endpoints attached"""
+
+REPEAT = 3
+"""Number of runs of a workload, the best wall time is kept"""
+
+Result = collections.namedtuple(
+    'Result', ['wall_time', 'requests', 'bytes', 'peak_memory'])
+
+GATED_METRICS = ('requests', 'bytes')
+"""The metrics compared with the baselines, the same on every machine"""
+
+
+def crawl(rsd):
+    rsd.snapshot()
+
+
+def compose(rsd):
+    nodes = rsd.get_node_collection()
+    for i in range(COUNT):
+        path = nodes.compose_node(name='bench%d' % i)
+        nodes.get_member(path).assemble_node()
+
+
+def attach(rsd):
+    node = rsd.get_node_collection().get_member('/redfish/v1/Nodes/1')
+    for endpoint in sorted(node.get_allowed_attach_endpoints())[:COUNT]:
+        node.attach_endpoint(endpoint)
+    node.refresh()
+    for endpoint in sorted(node.get_allowed_detach_endpoints()):
+        node.detach_endpoint(endpoint)
+
+
+def create_volume(rsd):
+    service = rsd.get_storage_service_collection().get_members()[0]
+    for _i in range(COUNT):
+        service.volumes.create_volume(
+            2 ** 30, access_capabilities=['Read', 'Write'])
+
+
+def field_list(rsd):
+    field = bench_field_list._IdentifiersRecords('Identifiers')
+    field._load(bench_field_list.get_body(100000), None)
+
+
+def validation(rsd):
+    for _i in range(1000):
+        for instance, schema in bench_validation.SPEC:
+            utils.validate(instance, schema)
+
+
+WORKLOADS = collections.OrderedDict([
+    ('crawl', crawl),
+    ('compose', compose),
+    ('attach', attach),
+    ('create_volume', create_volume),
+    ('field_list', field_list),
+    ('validation', validation),
+])
+
+
+def _run(workload, trace):
+    """Run a workload against a new emulator
+
+    :returns: A tuple ``(wall_time, requests, bytes, peak_memory)``, the
+        peak memory is None unless traced
+    """
+    with server.PodmEmulator(pod.generate(**POD)) as emulator:
+        rsd = rsd_lib.RSDLib(emulator.url, username='bench',
+                             password='bench').factory()
+        requests = sum(emulator.requests.values())
+        received = emulator.bytes_sent
+        if trace:
+            tracemalloc.start()
+        started = time.time()
+        workload(rsd)
+        wall_time = time.time() - started
+        peak_memory = None
+        if trace:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return (wall_time, sum(emulator.requests.values()) - requests,
+                emulator.bytes_sent - received, peak_memory)
+
+
+def measure(workload):
+    """Return the Result of a workload"""
+    runs = [_run(workload, False) for _i in range(REPEAT)]
+    wall_time = min(run[0] for run in runs)
+    _wall_time, requests, received, _peak_memory = runs[0]
+    peak_memory = None
+    if tracemalloc is not None:
+        # Tracing slows the workload down, it runs once more for it
+        peak_memory = _run(workload, True)[3]
+    return Result(wall_time, requests, received, peak_memory)
+
+
+def get_regressions(result, baseline):
+    """Compare a Result with its baseline
+
+    :param result: A Result
+    :param baseline: A dict mapping the gated metrics to their baseline
+        value
+    :returns: The list of the regressed metrics
+    """
+    regressions = []
+    for metric in GATED_METRICS:
+        value = getattr(result, metric)
+        limit = baseline.get(metric)
+        if limit is None:
+            continue
+        if value > limit:
+            regressions.append(metric)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baselines')
+    parser.add_argument('--baselines', default=BASELINES)
+    parser.add_argument('workloads', nargs='*', metavar='workload',
+                        help='one of %s, all by default' % ', '.join(
+                            WORKLOADS))
+    args = parser.parse_args()
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error('unknown workloads: %s' % ', '.join(sorted(unknown)))
+    logging.basicConfig(level=logging.ERROR)
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines, 'r') as f:
+            baselines = json.loads(f.read())
+
+    results = collections.OrderedDict()
+    regressed = False
+    print('%15s %10s %10s %12s %12s  %s' % (
+        'workload', 'time', 'requests', 'bytes', 'memory', 'regressions'))
+    for name in args.workloads or WORKLOADS:
+        result = results[name] = measure(WORKLOADS[name])
+        regressions = get_regressions(result, baselines.get(name, {}))
+        regressed = regressed or bool(regressions)
+        print('%15s %8.3fs %10d %12d %12s  %s' % (
+            name, result.wall_time, result.requests, result.bytes,
+            result.peak_memory, ', '.join(regressions)))
+
+    if args.save:
+        baselines.update(
+            (name, dict((metric, getattr(result, metric))
+                        for metric in GATED_METRICS))
+            for name, result in results.items())
+        with open(args.baselines, 'w') as f:
+            f.write(json.dumps(baselines, indent=4, sort_keys=True))
+            f.write('\n')
+        return 0
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
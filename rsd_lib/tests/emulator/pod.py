@@ -0,0 +1,471 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Synthetic pods built from the JSON samples of the unit tests"""
+
+import collections
+import json
+import os
+import random
+import uuid
+
+import six
+
+from rsd_lib import inventory
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           'unit', 'json_samples')
+
+VERSIONS = ('2.1.0', '2.2.0', '2.3.0')
+
+DRIVES_PER_POOL = 4
+"""Number of drives providing the capacity of a storage pool"""
+
+EXPAND_QUERY = {'ExpandAll': False, 'Levels': True, 'Links': False,
+                'MaxLevels': 1, 'NoLinks': True}
+
+_DANGLING = object()
+
+_METRICS_SAMPLES = {
+    'ComputerSystem': 'v2_2/system_metrics.json',
+    'Processor': 'v2_2/processor_metrics.json',
+    'Memory': 'v2_2/memory_metrics.json',
+}
+
+
+def load_sample(name):
+    """Return the JSON body of a sample, e.g. "v2_3/volume.json" """
+    with open(os.path.join(SAMPLES_DIR, name), 'r') as f:
+        return json.loads(f.read())
+
+
+def _link(path):
+    return {'@odata.id': path}
+
+
+def _links(paths):
+    return [_link(path) for path in paths]
+
+
+def relocate(body, path):
+    """Return a copy of a resource moved to another path
+
+    The links and action targets under the resource path are moved too.
+
+    :param body: The resource JSON body
+    :param path: The new resource path
+    :returns: The new JSON body
+    """
+    old_path = inventory.get_key(body.get('@odata.id') or '')
+    new_path = inventory.get_key(path)
+    data = json.dumps(body)
+    if old_path:
+        data = data.replace('"%s/' % old_path, '"%s/' % new_path)
+    body = json.loads(data)
+    body['@odata.id'] = path
+    return body
+
+
+def _iter_links(value, in_links=False):
+    """Iterate over the links of a body, outside of its actions
+
+    :returns: A generator of (container, key, path, in_links) tuples, the
+        link is ``container[key]``
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return
+    for key, item in list(items):
+        if isinstance(item, dict) and '@odata.id' in item:
+            if isinstance(item['@odata.id'], six.string_types):
+                yield value, key, item['@odata.id'], in_links
+                continue
+        if key in ('Actions', '@Redfish.ActionInfo'):
+            continue
+        for link in _iter_links(item, in_links or key == 'Links'):
+            yield link
+
+
+class _Generator(object):
+
+    def __init__(self, version, seed):
+        self.version = version
+        self.resources = collections.OrderedDict()
+        self._random = random.Random(seed)
+        self._samples = {}
+
+    @property
+    def sample_dir(self):
+        return 'v' + self.version[:3].replace('.', '_')
+
+    def add(self, path, sample, identity, **properties):
+        """Add a resource built from a sample
+
+        The links of the sample to its own sub-resources and its action
+        targets are moved under the new path.
+        """
+        if sample not in self._samples:
+            self._samples[sample] = load_sample(sample)
+        body = relocate(self._samples[sample], path)
+        body['Id'] = identity
+        if 'UUID' in body:
+            body['UUID'] = str(uuid.UUID(int=self._random.getrandbits(128)))
+        body.update(properties)
+        self.resources[inventory.get_key(path)] = body
+        return body
+
+    def add_collection(self, path, type_name, members):
+        self.resources[inventory.get_key(path)] = {
+            '@odata.context': '/redfish/v1/$metadata#%s' % type_name,
+            '@odata.id': path,
+            '@odata.type': '#%s.%s' % (type_name, type_name),
+            'Name': '%s Collection' % type_name.replace('Collection', ''),
+            'Members@odata.count': len(members),
+            'Members': _links(members),
+        }
+
+    def add_metrics(self, body, type_name):
+        """Add the metrics resource of a RSD 2.2+ resource"""
+        if self.version < '2.2':
+            return
+        path = body['@odata.id'] + '/Metrics'
+        self.add(path, _METRICS_SAMPLES[type_name], 'Metrics')
+        if type_name == 'Memory':
+            body['Metrics'] = _link(path)
+        else:
+            body.setdefault('Oem', {}).setdefault(
+                'Intel_RackScale', {})['Metrics'] = _link(path)
+
+    def prune(self):
+        """Remove the links to the resources which weren't generated
+
+        Dangling links of the ``Links`` properties and of link arrays are
+        removed, the other ones, e.g. to the ethernet interfaces of a
+        system, are served as empty collections.
+        """
+        for path, body in list(self.resources.items()):
+            for container, key, link, in_links in _iter_links(body):
+                key_path = inventory.get_key(link)
+                if key_path in self.resources:
+                    continue
+                if isinstance(container, list):
+                    container[key] = _DANGLING
+                elif in_links:
+                    del container[key]
+                else:
+                    self.add_collection(key_path, key + 'Collection', [])
+            # Drop the holes left in the link arrays
+            self._compact(body)
+
+    def _compact(self, value):
+        if isinstance(value, dict):
+            for item in value.values():
+                self._compact(item)
+        elif isinstance(value, list):
+            value[:] = [item for item in value if item is not _DANGLING]
+            for item in value:
+                self._compact(item)
+
+
+def _set_oem_links(body, name, paths):
+    links = body.setdefault('Links', {}).setdefault('Oem', {})
+    links.setdefault('Intel_RackScale', {})[name] = _links(paths)
+
+
+def _add_root(gen, expand):
+    root = gen.add('/redfish/v1/', gen.sample_dir + '/root.json',
+                   'RootService')
+    root['Oem']['Intel_RackScale']['ApiVersion'] = gen.version
+    if expand:
+        root['ProtocolFeaturesSupported'] = {'ExpandQuery': EXPAND_QUERY}
+    if 'TelemetryService' in root:
+        gen.add('/redfish/v1/TelemetryService',
+                'v2_2/telemetry_service.json', 'TelemetryService')
+
+    gen.add('/redfish/v1/Chassis/1', 'v2_1/chassis.json', '1')
+    gen.add_collection('/redfish/v1/Chassis', 'ChassisCollection',
+                       ['/redfish/v1/Chassis/1'])
+    gen.add('/redfish/v1/Managers/1', 'v2_1/manager.json', '1')
+    gen.add_collection('/redfish/v1/Managers', 'ManagerCollection',
+                       ['/redfish/v1/Managers/1'])
+
+
+def _add_systems(gen, count, processors, memory):
+    directory = 'v2_1' if gen.version < '2.2' else 'v2_2'
+    paths = []
+    for i in range(1, count + 1):
+        path = '/redfish/v1/Systems/%d' % i
+        system = gen.add(path, directory + '/system.json', str(i))
+        system['Links'].update(Chassis=[_link('/redfish/v1/Chassis/1')],
+                               ManagedBy=[_link('/redfish/v1/Managers/1')])
+        gen.add_metrics(system, 'ComputerSystem')
+
+        for name, sample, type_name, members in (
+                ('Processors', 'processor.json', 'Processor', processors),
+                ('Memory', 'memory.json', 'Memory', memory)):
+            member_paths = ['%s/%s/%d' % (path, name, j)
+                            for j in range(1, members + 1)]
+            for j, member_path in enumerate(member_paths, 1):
+                member = gen.add(member_path, directory + '/' + sample,
+                                 str(j))
+                gen.add_metrics(member, type_name)
+            gen.add_collection(path + '/' + name, type_name + 'Collection',
+                               member_paths)
+            system[name] = _link(path + '/' + name)
+        paths.append(path)
+
+    gen.add_collection('/redfish/v1/Systems', 'ComputerSystemCollection',
+                       paths)
+    gen.resources['/redfish/v1/Chassis/1']['Links']['ComputerSystems'] = (
+        _links(paths))
+    return paths
+
+
+def _add_storage_2_1(gen, volumes, drives):
+    """Add a RSD 2.1 storage service, its volumes are remote targets"""
+    service = '/redfish/v1/Services/1'
+    gen.add(service, 'v2_1/storage_service.json', '1')
+    gen.add_collection('/redfish/v1/Services', 'StorageServiceCollection',
+                       [service])
+
+    drive_paths = ['%s/Drives/%d' % (service, i)
+                   for i in range(1, drives + 1)]
+    for i, path in enumerate(drive_paths, 1):
+        # There is no valid 2.1 physical drive sample
+        gen.add(path, 'v2_3/drive.json', str(i),
+                **{'@odata.type': '#PhysicalDrive.v1_0_0.PhysicalDrive'})
+    gen.add_collection(service + '/Drives', 'PhysicalDriveCollection',
+                       drive_paths)
+
+    target_paths = ['%s/Targets/%d' % (service, i)
+                    for i in range(1, volumes + 1)]
+    drive_paths = drive_paths or [None]
+    for i, path in enumerate(target_paths, 1):
+        gen.add(path, 'v2_1/remote_target.json', str(i))
+        logical_drive = gen.add('%s/LogicalDrives/%d' % (service, i),
+                                'v2_1/logical_drive.json', str(i))
+        logical_drive['Links'] = {
+            'PhysicalDrives': _links(
+                drive for drive in [drive_paths[i % len(drive_paths)]]
+                if drive is not None),
+            'Targets': [_link(path)],
+            'UsedBy': []}
+    gen.add_collection(service + '/Targets', 'RemoteTargetCollection',
+                       target_paths)
+    gen.add_collection(service + '/LogicalDrives', 'LogicalDriveCollection',
+                       ['%s/LogicalDrives/%d' % (service, i)
+                        for i in range(1, volumes + 1)])
+    return target_paths
+
+
+def _add_storage_2_3(gen, volumes, drives):
+    """Add a RSD 2.3 storage service, drives are grouped in pools"""
+    service = '/redfish/v1/StorageServices/1'
+    gen.add(service, 'v2_3/storage_service.json', '1')
+    gen.add_collection('/redfish/v1/StorageServices',
+                       'StorageServiceCollection', [service])
+
+    drive_paths = ['/redfish/v1/Chassis/1/Drives/%d' % i
+                   for i in range(1, drives + 1)]
+    pool_paths = ['%s/StoragePools/%d' % (service, i) for i in range(
+        1, (drives + DRIVES_PER_POOL - 1) // DRIVES_PER_POOL + 1)]
+    volume_paths = ['%s/Volumes/%d' % (service, i)
+                    for i in range(1, volumes + 1)]
+
+    pool_volumes = collections.defaultdict(list)
+    for i, path in enumerate(volume_paths):
+        volume = gen.add(path, 'v2_3/volume.json', str(i + 1))
+        pools = []
+        if pool_paths:
+            pools = [pool_paths[i % len(pool_paths)]]
+            pool_volumes[pools[0]].append(path)
+        volume['CapacitySources'][0]['ProvidingPools'] = _links(pools)
+        volume['ReplicaInfos'] = []
+        _set_oem_links(volume, 'Endpoints', [])
+
+    for i, path in enumerate(pool_paths):
+        pool = gen.add(path, 'v2_3/storage_pool.json', str(i + 1))
+        pool_drives = drive_paths[
+            i * DRIVES_PER_POOL:(i + 1) * DRIVES_PER_POOL]
+        pool['CapacitySources'][0]['ProvidingDrives'] = _links(pool_drives)
+        gen.add_collection(path + '/AllocatedVolumes', 'VolumeCollection',
+                           pool_volumes[path])
+        for j, drive_path in enumerate(pool_drives):
+            drive = gen.add(drive_path, 'v2_3/drive.json',
+                            str(i * DRIVES_PER_POOL + j + 1))
+            drive['Links'].update(Chassis=_link('/redfish/v1/Chassis/1'),
+                                  Volumes=_links(pool_volumes[path]))
+            drive['Oem']['Intel_RackScale']['UsedBy'] = [_link(path)]
+
+    gen.add_collection(service + '/Volumes', 'VolumeCollection',
+                       volume_paths)
+    gen.add_collection(service + '/StoragePools', 'StoragePoolCollection',
+                       pool_paths)
+    gen.add_collection(service + '/Drives', 'DriveCollection', drive_paths)
+    return volume_paths
+
+
+def _add_endpoint(gen, path, sample, role, entity):
+    endpoint = gen.add(path, sample, path.rsplit('/', 1)[-1])
+    connected = dict(endpoint.get('ConnectedEntities', [{}])[0])
+    connected.update(EntityRole=role, EntityLink=_link(entity))
+    endpoint['ConnectedEntities'] = [connected]
+    if gen.version >= '2.3':
+        _set_oem_links(endpoint, 'Zones', [])
+    return endpoint
+
+
+def _add_fabrics(gen, count, systems, volumes, targets):
+    """Add the fabrics, connecting every system to a volume in a zone"""
+    directory = 'v2_1' if gen.version < '2.3' else 'v2_3'
+    target_sample = initiator_sample = 'v2_1/endpoint.json'
+    if gen.version >= '2.3':
+        target_sample = 'v2_3/endpoint_1.json'
+        initiator_sample = 'v2_3/endpoint_2.json'
+    fabric_paths = ['/redfish/v1/Fabrics/%d' % i for i in range(1, count + 1)]
+    endpoints = collections.defaultdict(list)
+    zones = collections.defaultdict(list)
+
+    fabric_targets = collections.defaultdict(list)
+    for i in range(targets if volumes and count else 0):
+        fabric = fabric_paths[i % count]
+        path = '%s/Endpoints/Target%d' % (fabric, i + 1)
+        volume = volumes[i % len(volumes)]
+        _add_endpoint(gen, path, target_sample, 'Target', volume)
+        if gen.version >= '2.3':
+            oem = gen.resources[volume]['Links']['Oem']['Intel_RackScale']
+            oem['Endpoints'].append(_link(path))
+        endpoints[fabric].append(path)
+        fabric_targets[fabric].append(path)
+
+    for i, system in enumerate(systems if count else []):
+        fabric = fabric_paths[i % count]
+        path = '%s/Endpoints/Initiator%d' % (fabric, i + 1)
+        _add_endpoint(gen, path, initiator_sample, 'Initiator', system)
+        endpoints[fabric].append(path)
+
+        zone_path = '%s/Zones/%d' % (fabric, i + 1)
+        zone_endpoints = [path]
+        if fabric_targets[fabric]:
+            zone_endpoints.append(fabric_targets[fabric][
+                i // count % len(fabric_targets[fabric])])
+        zone = gen.add(zone_path, 'v2_1/zone.json', str(i + 1))
+        zone['Links'].update(Endpoints=_links(zone_endpoints),
+                             InvolvedSwitches=[])
+        if gen.version >= '2.3':
+            for endpoint in zone_endpoints:
+                oem = gen.resources[endpoint]['Links']['Oem']
+                oem['Intel_RackScale']['Zones'].append(_link(zone_path))
+        zones[fabric].append(zone_path)
+
+    for fabric in fabric_paths:
+        gen.add(fabric, directory + '/fabric.json',
+                fabric.rsplit('/', 1)[-1])
+        gen.add_collection(fabric + '/Endpoints', 'EndpointCollection',
+                           endpoints[fabric])
+        gen.add_collection(fabric + '/Zones', 'ZoneCollection',
+                           zones[fabric])
+    gen.add_collection('/redfish/v1/Fabrics', 'FabricCollection',
+                       fabric_paths)
+
+
+def _add_nodes(gen, systems, volumes):
+    sample = 'v2_1/node.json' if gen.version < '2.3' else 'v2_3/node.json'
+    paths = []
+    for i, system in enumerate(systems):
+        path = '/redfish/v1/Nodes/%d' % (i + 1)
+        node = gen.add(path, sample, str(i + 1))
+        remote_drives = []
+        if volumes and gen.version < '2.3':
+            # RSD 2.3 nodes reach their volumes through the fabrics
+            remote_drives = [volumes[i % len(volumes)]]
+        system_body = gen.resources[system]
+        node['Links'].update(
+            ComputerSystem=_link(system),
+            Processors=gen.resources[system_body['Processors']['@odata.id']][
+                'Members'],
+            Memory=gen.resources[system_body['Memory']['@odata.id']][
+                'Members'],
+            EthernetInterfaces=[], LocalDrives=[],
+            RemoteDrives=_links(remote_drives),
+            ManagedBy=[_link('/redfish/v1/Managers/1')])
+        for name, action in node['Actions'].items():
+            if 'Resource@Redfish.AllowableValues' in action:
+                allowed = volumes if name.endswith('.AttachEndpoint') else []
+                action['Resource@Redfish.AllowableValues'] = _links(allowed)
+        paths.append(path)
+    gen.add_collection('/redfish/v1/Nodes', 'ComposedNodeCollection', paths)
+    gen.resources['/redfish/v1/Nodes']['Actions'] = {
+        '#ComposedNodeCollection.Allocate': {
+            'target': '/redfish/v1/Nodes/Actions/Allocate'}}
+
+
+def generate(version='2.3.0', systems=4, nodes=None, fabrics=1,
+             endpoints=None, volumes=4, drives=8, processors=2, memory=4,
+             expand=False, seed=0):
+    """Generate a synthetic pod
+
+    Every resource is built from a JSON sample of the unit tests, with its
+    links rewritten to the other generated resources: the nodes are
+    composed of the first systems, each system of a node is connected to
+    a volume through an initiator endpoint, a target endpoint and a zone.
+
+    :param version: The RSD API version of the service, one of VERSIONS
+    :param systems: The number of computer systems
+    :param nodes: The number of composed nodes, defaults to half of the
+        systems
+    :param fabrics: The number of fabrics, the endpoints are spread over
+        them
+    :param endpoints: The number of target endpoints exposing the
+        volumes, defaults to one per volume. The systems of the nodes get
+        an initiator endpoint each.
+    :param volumes: The number of volumes, remote targets for RSD 2.1 and
+        2.2
+    :param drives: The number of drives, the storage pools are made of
+        DRIVES_PER_POOL drives
+    :param processors: The number of processors of every system
+    :param memory: The number of memory modules of every system
+    :param expand: Whether the service root advertises ``$expand=.``
+    :param seed: The seed of the generated UUIDs
+    :raises: ValueError, if the version is not supported or there are
+        more nodes than systems
+    :returns: An OrderedDict mapping the normalized path of every resource
+        to its JSON body
+    """
+    if version not in VERSIONS:
+        raise ValueError('Unsupported RSD API version %s' % version)
+    if nodes is None:
+        nodes = systems // 2
+    if nodes > systems:
+        raise ValueError('A node needs a system, got %(nodes)d nodes for '
+                         '%(systems)d systems' % {'nodes': nodes,
+                                                  'systems': systems})
+    if endpoints is None:
+        endpoints = volumes
+
+    gen = _Generator(version, seed)
+    _add_root(gen, expand)
+    system_paths = _add_systems(gen, systems, processors, memory)
+    if version < '2.3':
+        volume_paths = _add_storage_2_1(gen, volumes, drives)
+    else:
+        volume_paths = _add_storage_2_3(gen, volumes, drives)
+    _add_fabrics(gen, fabrics, system_paths[:nodes], volume_paths, endpoints)
+    _add_nodes(gen, system_paths[:nodes], volume_paths)
+    gen.prune()
+    return gen.resources
@@ -0,0 +1,344 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A PODM emulator serving a synthetic pod over HTTP
+
+Run with: python -m rsd_lib.tests.emulator.server --systems 1000
+"""
+
+import argparse
+import collections
+import copy
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse
+
+from rsd_lib import inventory
+from rsd_lib.tests.emulator import pod
+
+LOG = logging.getLogger(__name__)
+
+SERVICE_UNAVAILABLE = 503
+
+
+def _get_error(status_code, message):
+    return {'error': {'code': 'Base.1.0.GeneralError',
+                      'message': message,
+                      '@Message.ExtendedInfo': [{'Message': message}]},
+            'status': status_code}
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are written separately
+    disable_nagle_algorithm = True
+
+    def _send(self, status_code, body=None, headers=None):
+        data = b'' if body is None else json.dumps(body).encode('utf-8')
+        # Counted before the client gets the response
+        with self.server.emulator._lock:
+            self.server.emulator.bytes_sent += len(data)
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def _handle(self, method):
+        emulator = self.server.emulator
+        url = parse.urlparse(self.path)
+        key = inventory.get_key(url.path)
+        status_code, body, headers = emulator.handle(
+            method, key, url.query, self._read_body(), self.headers)
+        self._send(status_code, body, headers)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):
+        LOG.debug(format, *args)
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class PodmEmulator(object):
+
+    def __init__(self, resources, latency=0, error_rate=0, seed=0,
+                 host='127.0.0.1', port=0):
+        """An in-process HTTP server emulating a PODM
+
+        Resources are served from memory: GET supports ``$expand=.`` on
+        collections and ``If-None-Match`` against the ETag of every
+        resource, PATCH merges the request body into the resource, DELETE
+        removes it from the pod and its collection. POST to a collection,
+        or to its Allocate action, adds a copy of its first member with
+        the request properties. Nodes are assembled at once, attached and
+        detached endpoints move between the allowed values of the actions,
+        any other action succeeds. Every request is answered by a thread
+        of its own.
+
+        :param resources: A dict mapping the resource paths to their JSON
+            bodies, e.g. returned by ``pod.generate()``
+        :param latency: The number of seconds every request is delayed
+        :param error_rate: The probability for a request to fail with a
+            503 Service Unavailable
+        :param seed: The seed of the emulated failures
+        :param host: The address to listen on
+        :param port: The port to listen on, a free one if 0
+        """
+        self.resources = collections.OrderedDict(
+            (inventory.get_key(path), body)
+            for path, body in resources.items())
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = collections.Counter()
+        """The number of requests per (method, path with its query)"""
+
+        self.bytes_sent = 0
+        """The number of bytes of the response bodies"""
+
+        self._random = random.Random(seed)
+        self._etags = {}
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.emulator = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """The base URL of the emulator, e.g. http://127.0.0.1:8443"""
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def _get_etag(self, key):
+        etag = self._etags.get(key)
+        if etag is None:
+            data = json.dumps(self.resources[key], sort_keys=True)
+            etag = 'W/"%s"' % hashlib.md5(data.encode('utf-8')).hexdigest()
+            self._etags[key] = etag
+        return etag
+
+    def _expand(self, body):
+        body = dict(body)
+        body['Members'] = [self.resources.get(inventory.get_key(
+            member['@odata.id']), member) for member in body['Members']]
+        return body
+
+    def _delete(self, key):
+        del self.resources[key]
+        self._etags.pop(key, None)
+        parent = key.rsplit('/', 1)[0]
+        collection = self.resources.get(parent)
+        if collection is not None and 'Members' in collection:
+            collection['Members'] = [
+                member for member in collection['Members']
+                if inventory.get_key(member['@odata.id']) != key]
+            collection['Members@odata.count'] = len(collection['Members'])
+            self._etags.pop(parent, None)
+
+    def _get_template(self, collection):
+        """Return the first member of a collection, None if empty"""
+        for member in collection['Members']:
+            return self.resources.get(inventory.get_key(member['@odata.id']))
+
+    def _create(self, key, properties):
+        """Add a member to a collection, a copy of its first member"""
+        collection = self.resources[key]
+        template = self._get_template(collection) or {}
+        index = len(collection['Members']) + 1
+        while '%s/%d' % (key, index) in self.resources:
+            index += 1
+        path = '%s/%d' % (key, index)
+
+        body = pod.relocate(template, path)
+        body['Id'] = str(index)
+        body.update(properties or {})
+        self.resources[path] = body
+        collection['Members'].append({'@odata.id': path})
+        collection['Members@odata.count'] = len(collection['Members'])
+        self._etags.pop(key, None)
+        return body
+
+    @staticmethod
+    def _move_endpoint(node, action, data):
+        """Move an endpoint between the allowed values of attach/detach"""
+        resource = (data or {}).get('Resource')
+        if isinstance(resource, dict):
+            resource = resource.get('@odata.id')
+        actions = [node['Actions'].setdefault(name, {}) for name in (
+            '#ComposedNode.AttachEndpoint', '#ComposedNode.DetachEndpoint')]
+        if action.endswith('DetachEndpoint'):
+            actions.reverse()
+        source, target = [element.setdefault(
+            'Resource@Redfish.AllowableValues', []) for element in actions]
+        link = {'@odata.id': resource}
+        if link in source:
+            source.remove(link)
+            target.append(link)
+
+    def _post(self, key, data):
+        owner, _sep, action = key.partition('/Actions/')
+        body = self.resources.get(owner)
+        if body is None:
+            return 404, _get_error(404, 'Unknown resource'), None
+
+        if not action or action == 'Allocate':
+            if 'Members' not in body:
+                return 405, _get_error(405, 'Method not allowed'), None
+            data = data or {}
+            if action:
+                # Only the identification of the node is kept
+                data = dict(((name, value) for name, value in data.items()
+                             if name in ('Name', 'Description')),
+                            ComposedNodeState='Allocated')
+            created = self._create(owner, data)
+            return 201, None, {'Location': self.url + created['@odata.id']}
+
+        if action == 'ComposedNode.Assemble':
+            body['ComposedNodeState'] = 'Assembled'
+        elif action.endswith('Endpoint'):
+            self._move_endpoint(body, action, data)
+        self._etags.pop(owner, None)
+        return 204, None, None
+
+    def handle(self, method, key, query, data, headers):
+        """Answer a request
+
+        :param method: The HTTP method, e.g. "GET"
+        :param key: The normalized resource path
+        :param query: The query string of the request
+        :param data: The JSON body of the request
+        :param headers: The request headers
+        :returns: A (status code, JSON body, headers) tuple
+        """
+        with self._lock:
+            self.requests[(method, key + '?' + query if query else key)] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                return (SERVICE_UNAVAILABLE,
+                        _get_error(SERVICE_UNAVAILABLE, 'Emulated failure'),
+                        None)
+            if method == 'POST':
+                return self._post(key, data)
+            if key not in self.resources:
+                return 404, _get_error(404, 'Unknown resource'), None
+
+            if method == 'GET':
+                etag = self._get_etag(key)
+                if headers.get('If-None-Match') == etag:
+                    return 304, None, {'ETag': etag}
+                body = self.resources[key]
+                if '$expand' in parse.parse_qs(query) and 'Members' in body:
+                    body = self._expand(body)
+                return 200, copy.deepcopy(body), {'ETag': etag}
+            if method == 'PATCH':
+                self.resources[key].update(data or {})
+                self._etags.pop(key, None)
+                return 200, copy.deepcopy(self.resources[key]), None
+            if method == 'DELETE':
+                self._delete(key)
+                return 204, None, None
+            return 405, _get_error(405, 'Method not allowed'), None
+
+    def start(self):
+        """Serve the requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='podm-emulator')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving the requests and close the socket"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8443)
+    parser.add_argument('--version', default='2.3.0', choices=pod.VERSIONS)
+    for name, default in (('systems', 4), ('nodes', None), ('fabrics', 1),
+                          ('endpoints', None), ('volumes', 4), ('drives', 8)):
+        parser.add_argument('--' + name, type=int, default=default)
+    parser.add_argument('--expand', action='store_true',
+                        help='advertise the $expand=. query')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0,
+                        help='probability of a 503 answer')
+    args = parser.parse_args()
+
+    resources = pod.generate(
+        args.version, systems=args.systems, nodes=args.nodes,
+        fabrics=args.fabrics, endpoints=args.endpoints,
+        volumes=args.volumes, drives=args.drives, expand=args.expand)
+    emulator = PodmEmulator(resources, latency=args.latency,
+                            error_rate=args.error_rate, host=args.host,
+                            port=args.port)
+    print('Serving %d resources on %s' % (len(resources), emulator.url))
+    try:
+        emulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import copy
+import json
+
+import mock
+from sushy import exceptions
+import testtools
+
+from rsd_lib.aio import connector
+from rsd_lib.aio import main
+from rsd_lib.aio import resource
+from rsd_lib.resources.v2_1.node import node
+from rsd_lib.resources.v2_3 import RSDLibV2_3
+
+
+def _load(name):
+    with open('rsd_lib/tests/unit/json_samples/%s' % name, 'r') as f:
+        return json.loads(f.read())
+
+
+class FakeConnector(object):
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+
+    async def _op(self, method, path, data=None, headers=None):
+        self.requests.append((method, path, data))
+        await asyncio.sleep(0)
+        if method != 'GET':
+            return connector.Response(
+                202, {'Location': 'https://localhost:8443/redfish/v1/Nodes/'
+                                  'Node2'},
+                b'')
+        if path not in self.bodies:
+            raise exceptions.ResourceNotFoundError(
+                method, path, connector.Response(404, {}, b''))
+        return connector.Response(
+            200, {}, json.dumps(self.bodies[path]).encode('utf-8'))
+
+    async def get(self, path='', data=None, headers=None):
+        return await self._op('GET', path, data, headers)
+
+    async def post(self, path='', data=None, headers=None):
+        return await self._op('POST', path, data, headers)
+
+    async def close(self):
+        pass
+
+
+class RSDLibTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(RSDLibTestCase, self).setUp()
+        node_col = _load('v2_1/node_collection.json')
+        node_col['Members'] = [{'@odata.id': '/redfish/v1/Nodes/Node%s' % i}
+                               for i in range(1, 4)]
+        self.bodies = {
+            '/redfish/v1/': _load('v2_3/root.json'),
+            '/redfish/v1/Nodes': node_col,
+            '/redfish/v1/Systems/System1': _load('v2_1/system.json'),
+        }
+        for i in range(1, 4):
+            body = _load('v2_3/node.json')
+            body['Id'] = 'Node%s' % i
+            self.bodies['/redfish/v1/Nodes/Node%s' % i] = body
+        self.conn = FakeConnector(self.bodies)
+
+        with mock.patch.object(connector, 'Connector', autospec=True) as m:
+            m.return_value = self.conn
+            self.rsd = main.RSDLib('http://foo.bar:8442', username='foo',
+                                   password='bar', verify=True)
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_factory(self):
+        root = self._run(self.rsd.factory())
+        self.assertIsInstance(root, resource.AsyncResource)
+        self.assertIsInstance(root.resource, RSDLibV2_3)
+        self.assertEqual('1.1.0', root.redfish_version)
+        self.assertEqual([('GET', '/redfish/v1/', None)], self.conn.requests)
+
+    def test_factory_unsupported_version(self):
+        root = copy.deepcopy(self.bodies['/redfish/v1/'])
+        root['Oem']['Intel_RackScale']['ApiVersion'] = '10.0.0'
+        self.bodies['/redfish/v1/'] = root
+        self.assertRaises(NotImplementedError, self._run, self.rsd.factory())
+
+    def test_get_members(self):
+        root = self._run(self.rsd.factory())
+        node_col = self._run(root.get_node_collection())
+        self.assertIsInstance(node_col, resource.AsyncResourceCollection)
+
+        nodes = self._run(node_col.get_members())
+        self.assertEqual(['Node1', 'Node2', 'Node3'],
+                         [n.identity for n in nodes])
+        self.assertIsInstance(nodes[0].resource, node.Node)
+        # The root, the collection and each member are fetched once
+        self.assertEqual(5, len(self.conn.requests))
+
+    def test_async_iteration(self):
+        async def list_nodes():
+            root = await self.rsd.factory()
+            node_col = await root.get_node_collection()
+            identities = []
+            async for node_inst in node_col:
+                identities.append(node_inst.identity)
+            return identities
+
+        self.assertEqual(['Node1', 'Node2', 'Node3'],
+                         self._run(list_nodes()))
+
+    def test_get_members_not_found(self):
+        root = self._run(self.rsd.factory())
+        node_col = self._run(root.get_node_collection())
+        self.bodies.pop('/redfish/v1/Nodes/Node2')
+        self.assertRaises(exceptions.ResourceNotFoundError,
+                          self._run, node_col.get_members())
+
+    def test_actions(self):
+        root = self._run(self.rsd.factory())
+        node_col = self._run(root.get_node_collection())
+        self.assertEqual('/redfish/v1/Nodes/Node2',
+                         self._run(node_col.compose_node(name='test')))
+
+        node_inst = self._run(root.get_node('/redfish/v1/Nodes/Node1'))
+        self._run(node_inst.assemble_node())
+        self.assertEqual(
+            [('POST', '/redfish/v1/Nodes/Actions/Allocate', {'Name': 'test'}),
+             ('POST', '/redfish/v1/Nodes/Node1/Actions/ComposedNode.Assemble',
+              None)],
+            [r for r in self.conn.requests if r[0] == 'POST'])
+
+    def test_refresh(self):
+        root = self._run(self.rsd.factory())
+        node_inst = self._run(root.get_node('/redfish/v1/Nodes/Node1'))
+        self.bodies['/redfish/v1/Nodes/Node1']['Name'] = 'renamed'
+        self._run(node_inst.refresh())
+        self.assertEqual('renamed', node_inst.name)
+
+    def test_load(self):
+        root = self._run(self.rsd.factory())
+        node_inst = self._run(root.get_node('/redfish/v1/Nodes/Node1'))
+        self.assertRaisesRegex(AttributeError, 'load',
+                               getattr, node_inst, 'system')
+
+        system = self._run(node_inst.load('system'))
+        self.assertEqual('437XR1138R2', system.identity)
+        # Once loaded, the sub-resource is available as an attribute
+        self.assertEqual('437XR1138R2', node_inst.system.identity)
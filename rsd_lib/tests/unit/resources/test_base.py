@@ -16,6 +16,7 @@
 import copy
 import mock
 
+from sushy import exceptions
 from sushy.resources import base as resource_base
 from sushy.tests.unit import base
 
@@ -96,3 +97,237 @@ class FieldTestCase(base.TestCase):
         self.assertEqual(2, self.test_resource.field_list[1].integer)
         self.assertIsNone(self.test_resource.non_existing_nested)
         self.assertIsNone(self.test_resource.non_existing_mapped)
+
+    def test_field_list_records(self):
+        field_list = self.test_resource.field_list
+        self.assertIsInstance(field_list[0],
+                              rsd_resource_base.FieldListRecord)
+        self.assertEqual({'string': 'a third string', 'integer': 1},
+                         dict(field_list[0]))
+        self.assertEqual(2, field_list[1]['integer'])
+        self.assertRaises(KeyError, field_list[1].__getitem__, 'missing')
+        self.assertRaises(AttributeError, setattr, field_list[1],
+                          'missing', 1)
+        self.assertEqual("TestFieldListRecord(integer=2, "
+                         "string='a fourth string')", repr(field_list[1]))
+
+
+class LazyResource(rsd_resource_base.ResourceBase):
+    string = resource_base.Field('String', required=True)
+    integer = resource_base.Field('Integer', adapter=int)
+    nested = NestedTestField('Nested')
+    field_list = TestFieldList('FieldList')
+
+
+class ResourceBaseTestCase(base.TestCase):
+
+    def setUp(self):
+        super(ResourceBaseTestCase, self).setUp()
+        self.conn = mock.Mock(client_options=rsd_resource_base.ClientOptions(
+            lazy_fields=True))
+        self.json = copy.deepcopy(TEST_JSON)
+        self.conn.get.return_value.json.return_value = self.json
+        self.test_resource = LazyResource(self.conn, redfish_version='1.0.x')
+
+    def test_lazy_fields(self):
+        self.assertIsInstance(self.test_resource, LazyResource)
+        self.assertEqual('LazyResource',
+                         self.test_resource.__class__.__name__)
+        self.assertNotIn('integer', vars(self.test_resource))
+
+        self.assertEqual(42, self.test_resource.integer)
+        self.assertEqual('another string', self.test_resource.nested.string)
+        self.assertEqual(2, self.test_resource.field_list[1].integer)
+        self.assertEqual(42, vars(self.test_resource)['integer'])
+
+    def test_lazy_fields_refresh(self):
+        self.assertEqual('a string', self.test_resource.string)
+        self.conn.get.return_value.json.return_value = dict(
+            self.json, String='new string')
+        self.test_resource.refresh()
+        self.assertEqual('new string', self.test_resource.string)
+
+    def test_lazy_fields_missing_required(self):
+        self.conn.get.return_value.json.return_value = {}
+        self.test_resource.refresh()
+        self.assertIsNone(self.test_resource.integer)
+        self.assertRaises(exceptions.MissingAttributeError,
+                          getattr, self.test_resource, 'string')
+
+    def test_eager_fields(self):
+        self.conn.client_options.lazy_fields = False
+        test_resource = LazyResource(self.conn, redfish_version='1.0.x')
+        self.assertIs(LazyResource, test_resource.__class__)
+        self.assertEqual(42, vars(test_resource)['integer'])
+
+
+class TestResource(resource_base.ResourceBase):
+    identity = resource_base.Field('Id', required=True)
+
+
+class TestResourceCollection(rsd_resource_base.ResourceCollectionBase):
+
+    @property
+    def _resource_type(self):
+        return TestResource
+
+
+class ResourceCollectionBaseTestCase(base.TestCase):
+
+    def setUp(self):
+        super(ResourceCollectionBaseTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.members = {
+            '/redfish/v1/Tests': {
+                'Members': [{'@odata.id': '/redfish/v1/Tests/%s' % i}
+                            for i in range(1, 6)]
+            }
+        }
+        for i in range(1, 6):
+            self.members['/redfish/v1/Tests/%s' % i] = {'Id': str(i)}
+        self.conn.get.side_effect = self._get
+        self.test_col = TestResourceCollection(self.conn, '/redfish/v1/Tests',
+                                               redfish_version='1.0.x')
+
+    def _get(self, path, *args, **kwargs):
+        body = self.members.get(path)
+        if body is None:
+            raise exceptions.ConnectionError(url=path, error='boom')
+        response = mock.Mock()
+        response.json.return_value = body
+        return response
+
+    def test_get_members_concurrently(self):
+        members, failures = self.test_col.get_members_concurrently(
+            max_workers=2)
+        self.assertEqual(['1', '2', '3', '4', '5'],
+                         [m.identity for m in members])
+        self.assertEqual({}, failures)
+        self.assertEqual(6, self.conn.get.call_count)
+
+    def test_get_members_concurrently_with_failures(self):
+        self.members.pop('/redfish/v1/Tests/2')
+        self.members['/redfish/v1/Tests/4'] = {}
+        members, failures = self.test_col.get_members_concurrently()
+        self.assertEqual(['1', '3', '5'], [m.identity for m in members])
+        self.assertEqual(['/redfish/v1/Tests/2', '/redfish/v1/Tests/4'],
+                         list(failures))
+        self.assertIsInstance(failures['/redfish/v1/Tests/2'],
+                              exceptions.ConnectionError)
+        self.assertIsInstance(failures['/redfish/v1/Tests/4'],
+                              exceptions.MissingAttributeError)
+
+    def test_get_members_concurrently_invalid_body(self):
+        get = self.conn.get.side_effect
+
+        def _get(path, *args, **kwargs):
+            response = get(path, *args, **kwargs)
+            if path == '/redfish/v1/Tests/3':
+                response.json.side_effect = ValueError('No JSON object')
+            return response
+
+        self.conn.get.side_effect = _get
+        members, failures = self.test_col.get_members_concurrently()
+        self.assertEqual(['1', '2', '4', '5'], [m.identity for m in members])
+        self.assertEqual(['/redfish/v1/Tests/3'], list(failures))
+        self.assertIsInstance(failures['/redfish/v1/Tests/3'], ValueError)
+
+    def test_get_members_concurrently_empty(self):
+        self.members['/redfish/v1/Tests'] = {'Members': []}
+        self.test_col.refresh()
+        self.assertEqual(([], {}), self.test_col.get_members_concurrently())
+
+
+class ExpandedResourceCollectionTestCase(base.TestCase):
+
+    def setUp(self):
+        super(ExpandedResourceCollectionTestCase, self).setUp()
+        self.conn = mock.Mock(client_options=rsd_resource_base.ClientOptions(
+            expand_query=True))
+        self.members = {
+            '/redfish/v1/Tests': {
+                'Members': [{'@odata.id': '/redfish/v1/Tests/%s' % i}
+                            for i in range(1, 4)]
+            },
+            '/redfish/v1/Tests?$expand=.': {
+                'Members': [{'@odata.id': '/redfish/v1/Tests/%s' % i,
+                             'Id': str(i)}
+                            for i in range(1, 4)]
+            }
+        }
+        for i in range(1, 4):
+            self.members['/redfish/v1/Tests/%s' % i] = {'Id': 'fetched'}
+        self.conn.get.side_effect = self._get
+        self.test_col = TestResourceCollection(self.conn, '/redfish/v1/Tests',
+                                               redfish_version='1.0.x')
+
+    def _get(self, path, *args, **kwargs):
+        body = self.members.get(path)
+        if body is None:
+            raise exceptions.BadRequestError('GET', path, mock.Mock())
+        response = mock.Mock()
+        response.json.return_value = body
+        return response
+
+    def _get_paths(self):
+        return [call[1]['path'] for call in self.conn.get.call_args_list]
+
+    def test_get_members(self):
+        members = self.test_col.get_members()
+        self.assertEqual(['1', '2', '3'], [m.identity for m in members])
+        self.assertEqual('/redfish/v1/Tests/2', members[1].path)
+        self.assertEqual(['/redfish/v1/Tests', '/redfish/v1/Tests?$expand=.'],
+                         self._get_paths())
+
+    def test_get_members_refresh(self):
+        member = self.test_col.get_members()[0]
+        self.assertIs(self.conn, member._conn)
+        member.refresh()
+        self.assertEqual('fetched', member.identity)
+        self.assertEqual('/redfish/v1/Tests/1', self._get_paths()[-1])
+
+    def test_get_members_not_inlined(self):
+        self.members['/redfish/v1/Tests?$expand=.']['Members'][1] = {
+            '@odata.id': '/redfish/v1/Tests/2'}
+        members = self.test_col.get_members()
+        self.assertEqual(['1', 'fetched', '3'], [m.identity for m in members])
+        self.assertEqual(['/redfish/v1/Tests', '/redfish/v1/Tests?$expand=.',
+                          '/redfish/v1/Tests/2'], self._get_paths())
+
+    def test_get_members_expand_failed(self):
+        self.members.pop('/redfish/v1/Tests?$expand=.')
+        members = self.test_col.get_members()
+        self.assertEqual(['fetched'] * 3, [m.identity for m in members])
+        self.assertEqual(5, self.conn.get.call_count)
+
+    def test_get_members_not_supported(self):
+        self.conn.client_options.expand_query = False
+        members = self.test_col.get_members()
+        self.assertEqual(['fetched'] * 3, [m.identity for m in members])
+        self.assertNotIn('/redfish/v1/Tests?$expand=.', self._get_paths())
+
+    def test_get_members_concurrently(self):
+        self.members['/redfish/v1/Tests?$expand=.']['Members'][2] = {
+            '@odata.id': '/redfish/v1/Tests/3', 'Name': 'no Id'}
+        members, failures = self.test_col.get_members_concurrently()
+        self.assertEqual(['1', '2'], [m.identity for m in members])
+        self.assertEqual(['/redfish/v1/Tests/3'], list(failures))
+        self.assertEqual(2, self.conn.get.call_count)
+
+
+class LoadFromBodyTestCase(base.TestCase):
+
+    def test_load_from_body(self):
+        conn = mock.Mock()
+        conn.get.return_value.json.return_value = {'Id': 'fetched'}
+        resource = rsd_resource_base.load_from_body(
+            TestResource, conn, '/redfish/v1/Tests/1', {'Id': '1'},
+            redfish_version='1.0.x')
+        self.assertEqual('1', resource.identity)
+        self.assertEqual('1.0.x', resource.redfish_version)
+        self.assertIs(conn, resource._conn)
+        conn.get.assert_not_called()
+
+        resource.refresh()
+        self.assertEqual('fetched', resource.identity)
+        conn.get.assert_called_once_with(path='/redfish/v1/Tests/1')
@@ -24,6 +24,7 @@ from sushy.resources.system import system
 from rsd_lib.resources.v2_1.node import constants as node_cons
 from rsd_lib.resources.v2_1.node import mappings as node_maps
 from rsd_lib.resources.v2_1.node import node
+from rsd_lib import task_monitor
 from rsd_lib.tests.unit.fakes import request_fakes
 
 
@@ -508,3 +509,84 @@ class NodeCollectionTestCase(testtools.TestCase):
         self.assertRaises(jsonschema.exceptions.ValidationError,
                           self.node_col.compose_node,
                           processor_req='invalid')
+
+    def _setup_compose_nodes(self, states):
+        """Serve the node through the given states, one per read"""
+        with open('rsd_lib/tests/unit/json_samples/v2_1/node.json', 'r') as f:
+            node_json = json.loads(f.read())
+        states = iter(states)
+
+        def _get(path, **kwargs):
+            if path == '/redfish/v1/Nodes':
+                return request_fakes.fake_request_get(
+                    self.node_col.json)
+            return request_fakes.fake_request_get(
+                dict(node_json, ComposedNodeState=next(states)))
+
+        self.conn.get.side_effect = _get
+
+    def test_compose_nodes(self):
+        self._setup_compose_nodes(['Allocating', 'Allocated', 'Assembling',
+                                   'Assembled'])
+        with task_monitor.Scheduler() as scheduler:
+            results = self.node_col.compose_nodes([{'name': 'test'}],
+                                                  interval=0,
+                                                  scheduler=scheduler)
+
+        self.assertEqual(1, len(results))
+        self.assertEqual('/redfish/v1/Nodes/1', results[0].path)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(node_cons.COMPOSED_NODE_STATE_ASSEMBLED,
+                         results[0].node.composed_node_state)
+        self.assertGreaterEqual(results[0].allocate_time, 0)
+        self.assertGreaterEqual(results[0].assemble_time, 0)
+        self.assertEqual(
+            [mock.call('/redfish/v1/Nodes/Actions/Allocate',
+                       data={'Name': 'test'}),
+             mock.call(
+                 '/redfish/v1/Nodes/Node1/Actions/ComposedNode.Assemble')],
+            self.conn.post.call_args_list)
+
+    def test_compose_nodes_failed(self):
+        self._setup_compose_nodes(['Allocated', 'Failed'])
+        with task_monitor.Scheduler() as scheduler:
+            results = self.node_col.compose_nodes([{'name': 'test'}],
+                                                  interval=0,
+                                                  scheduler=scheduler)
+
+        self.assertEqual('/redfish/v1/Nodes/1', results[0].path)
+        self.assertIsNone(results[0].node)
+        self.assertIsInstance(results[0].error, node.ComposeNodeError)
+        self.assertIn('the node state is Failed', str(results[0].error))
+
+    def test_compose_nodes_timeout(self):
+        # Polled after the interval, then at the deadline
+        self._setup_compose_nodes(['Allocating', 'Allocating'])
+        with task_monitor.Scheduler() as scheduler:
+            results = self.node_col.compose_nodes([{'name': 'test'}],
+                                                  interval=0.05,
+                                                  timeout=0.08,
+                                                  scheduler=scheduler)
+
+        self.assertIsInstance(results[0].error, node.ComposeNodeError)
+        self.assertIn('timed out waiting for state allocated',
+                      str(results[0].error))
+        self.conn.post.assert_called_once_with(
+            '/redfish/v1/Nodes/Actions/Allocate', data={'Name': 'test'})
+
+    def test_compose_nodes_allocate_error(self):
+        self.conn.post.side_effect = exceptions.HTTPError(
+            method='POST', url='/redfish/v1/Nodes/Actions/Allocate',
+            response=mock.MagicMock(status_code=409))
+        results = self.node_col.compose_nodes([{'name': 'test'}])
+
+        self.assertEqual(
+            [node.ComposeResult(None, None, self.conn.post.side_effect,
+                                None, None)],
+            results)
+
+    def test_compose_nodes_invalid_reqs(self):
+        self.assertRaises(jsonschema.exceptions.ValidationError,
+                          self.node_col.compose_nodes,
+                          [{'name': 'test'}, {'processor_req': 'invalid'}])
+        self.conn.post.assert_not_called()
@@ -0,0 +1,154 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import json
+
+import mock
+import testtools
+
+from rsd_lib.resources import base as rsd_base
+from rsd_lib.resources.v2_1.node import constants as node_cons
+from rsd_lib.resources.v2_1.node import node
+from rsd_lib.resources.v2_1.node import node_index
+from rsd_lib import utils
+
+
+class NodeIndexTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(NodeIndexTestCase, self).setUp()
+        with open('rsd_lib/tests/unit/json_samples/v2_1/node_collection.json',
+                  'r') as f:
+            self.collection_json = json.loads(f.read())
+        with open('rsd_lib/tests/unit/json_samples/v2_1/node.json',
+                  'r') as f:
+            node_json = json.loads(f.read())
+
+        self.bodies = {}
+        for i, state in ((1, 'Assembled'), (2, 'Allocated')):
+            body = copy.deepcopy(node_json)
+            body['@odata.id'] = '/redfish/v1/Nodes/Node%d' % i
+            body['Id'] = 'Node%d' % i
+            body['UUID'] = 'FA39D108-7D70-400A-9DB2-6940375C31C%d' % i
+            body['ComposedNodeState'] = state
+            body['Links']['ComputerSystem']['@odata.id'] = (
+                '/redfish/v1/Systems/System%d' % i)
+            self.bodies[body['@odata.id']] = body
+        self._set_members(['/redfish/v1/Nodes/Node1',
+                           '/redfish/v1/Nodes/Node2'])
+
+        self.conn = mock.Mock(client_options=rsd_base.ClientOptions())
+        self.conn.get.side_effect = self._get
+        self.node_col = node.NodeCollection(self.conn, '/redfish/v1/Nodes',
+                                            redfish_version='1.0.2')
+        self.index = node_index.NodeIndex(self.node_col)
+
+    def _set_members(self, paths):
+        self.collection_json['Members'] = [{'@odata.id': path}
+                                           for path in paths]
+
+    def _get(self, path, **kwargs):
+        if path == '/redfish/v1/Nodes':
+            return utils.JsonResponse(self.collection_json)
+        if path == '/redfish/v1/Nodes?$expand=.':
+            return utils.JsonResponse(dict(
+                self.collection_json,
+                Members=[self.bodies[member['@odata.id']]
+                         for member in self.collection_json['Members']]))
+        return utils.JsonResponse(self.bodies[path])
+
+    def _get_paths(self):
+        return [call[1]['path'] for call in self.conn.get.call_args_list]
+
+    def test_refresh(self):
+        self.assertEqual({}, self.index.refresh())
+
+        self.assertEqual(2, len(self.index))
+        self.assertIn('/redfish/v1/Nodes/Node1/', self.index)
+        node1 = self.index.get_by_uuid('fa39d108-7d70-400a-9db2-6940375c31c1')
+        self.assertEqual('Node1', node1.identity)
+        self.assertIsNone(self.index.get_by_uuid(None))
+        self.assertIs(node1,
+                      self.index.get_by_system('/redfish/v1/Systems/System1'))
+        self.assertEqual(
+            ['Node2'],
+            [node_inst.identity for node_inst in self.index.find(
+                composed_node_state=node_cons.COMPOSED_NODE_STATE_ALLOCATED,
+                power_state=node_cons.NODE_POWER_STATE_ON)])
+        self.assertEqual([], self.index.find(
+            power_state=node_cons.NODE_POWER_STATE_OFF))
+        self.assertEqual(2, len(self.index.find()))
+
+    def test_refresh_incremental(self):
+        self.index.refresh()
+        self.conn.get.reset_mock()
+        self.bodies['/redfish/v1/Nodes/Node3'] = dict(
+            self.bodies['/redfish/v1/Nodes/Node2'],
+            **{'@odata.id': '/redfish/v1/Nodes/Node3', 'Id': 'Node3',
+               'UUID': None, 'Links': {}})
+        self._set_members(['/redfish/v1/Nodes/Node1',
+                           '/redfish/v1/Nodes/Node3'])
+
+        self.index.refresh(nodes=False)
+
+        self.assertEqual(['/redfish/v1/Nodes', '/redfish/v1/Nodes/Node3'],
+                         self._get_paths())
+        self.assertNotIn('/redfish/v1/Nodes/Node2', self.index)
+        self.assertIsNone(
+            self.index.get_by_system('/redfish/v1/Systems/System2'))
+        self.assertEqual(['/redfish/v1/Nodes/Node1',
+                          '/redfish/v1/Nodes/Node3'],
+                         [node_inst.path for node_inst in self.index])
+
+    def test_refresh_nodes(self):
+        self.index.refresh()
+        self.conn.get.reset_mock()
+        self.bodies['/redfish/v1/Nodes/Node2']['ComposedNodeState'] = (
+            'Assembled')
+
+        self.index.refresh()
+
+        self.assertEqual(['/redfish/v1/Nodes', '/redfish/v1/Nodes/Node1',
+                          '/redfish/v1/Nodes/Node2'],
+                         sorted(self._get_paths()))
+        self.assertEqual(['Node1', 'Node2'], [
+            node_inst.identity for node_inst in self.index.find(
+                composed_node_state=node_cons.COMPOSED_NODE_STATE_ASSEMBLED)])
+        self.assertEqual([], self.index.find(
+            composed_node_state=node_cons.COMPOSED_NODE_STATE_ALLOCATED))
+
+    def test_refresh_expanded(self):
+        self.conn.client_options.expand_query = True
+        self.conn.get.reset_mock()
+        self.index.refresh()
+
+        self.assertEqual(['/redfish/v1/Nodes?$expand=.'], self._get_paths())
+        self.assertEqual(2, len(self.index))
+
+    def test_update_remove(self):
+        self.index.refresh()
+        node2 = self.index.get_by_system('/redfish/v1/Systems/System2')
+        node2._json['PowerState'] = 'Off'
+        node2._parse_attributes()
+        self.index.update(node2)
+        self.assertEqual([node2], self.index.find(
+            power_state=node_cons.NODE_POWER_STATE_OFF))
+
+        self.index.remove(node2.path)
+        self.assertEqual([], self.index.find(
+            power_state=node_cons.NODE_POWER_STATE_OFF))
+        self.assertIsNone(self.index.get_by_uuid(
+            'fa39d108-7d70-400a-9db2-6940375c31c2'))
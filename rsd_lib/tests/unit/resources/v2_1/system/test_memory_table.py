@@ -0,0 +1,171 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import json
+
+import mock
+from sushy import exceptions
+import testtools
+
+from rsd_lib import inventory
+from rsd_lib.resources import base as rsd_base
+from rsd_lib.resources.v2_1.system import memory_table
+from rsd_lib.resources.v2_1.system import system
+
+
+class MemoryTableTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(MemoryTableTestCase, self).setUp()
+        with open('rsd_lib/tests/unit/json_samples/v2_1/memory.json',
+                  'r') as f:
+            self.memory_json = json.loads(f.read())
+
+        self.table = memory_table.MemoryTable()
+        self.table.append('/redfish/v1/Systems/1', self.memory_json)
+        dimm = copy.deepcopy(self.memory_json)
+        dimm.update({'@odata.id': '/redfish/v1/Systems/1/Memory/Dimm2',
+                     'MemoryType': 'NVDIMM_N', 'CapacityMiB': 1024})
+        dimm.pop('OperatingSpeedMhz')
+        dimm['Status']['Health'] = 'Critical'
+        self.table.append('/redfish/v1/Systems/1', dimm)
+        self.table.append('/redfish/v1/Systems/2', self.memory_json)
+
+    def test_columns(self):
+        self.assertEqual(3, len(self.table))
+        self.assertEqual([16384, 1024, 16384],
+                         self.table.column('capacity_mib'))
+        self.assertEqual([2400, None, 2400],
+                         self.table.column('operating_speed_mhz'))
+        self.assertEqual(['/redfish/v1/Systems/1', '/redfish/v1/Systems/1',
+                          '/redfish/v1/Systems/2'],
+                         self.table.column('system'))
+
+    def test_strings_interned(self):
+        column = self.table.columns['memory_type']
+        self.assertEqual([None, 'DRAM', 'NVDIMM_N'], column.values)
+        self.assertEqual([1, 2, 1], list(column.codes))
+
+    def test_rows(self):
+        row = list(self.table.rows())[1]
+        self.assertEqual('/redfish/v1/Systems/1/Memory/Dimm2', row['path'])
+        self.assertEqual('Critical', row['health'])
+        self.assertEqual(1, row['slot'])
+        self.assertEqual(set(memory_table.COLUMNS), set(row))
+
+    def test_sum(self):
+        self.assertEqual(33792, self.table.sum('capacity_mib'))
+        self.assertEqual({'DRAM': 32768, 'NVDIMM_N': 1024},
+                         self.table.sum('capacity_mib', by='memory_type'))
+        self.assertEqual({'OK': 4800},
+                         self.table.sum('operating_speed_mhz', by='health'))
+
+    def test_invalid_integer(self):
+        dimm = dict(self.memory_json, CapacityMiB='16 GiB',
+                    OperatingSpeedMhz=[2400])
+        self.table.append('/redfish/v1/Systems/2', dimm)
+        self.assertEqual(4, len(self.table))
+        row = list(self.table.rows())[3]
+        self.assertIsNone(row['capacity_mib'])
+        self.assertIsNone(row['operating_speed_mhz'])
+        self.assertEqual(33792, self.table.sum('capacity_mib'))
+
+    def test_negative_integer(self):
+        self.table.append('/redfish/v1/Systems/2',
+                          dict(self.memory_json, CapacityMiB=-1))
+        self.assertEqual(-1, self.table.column('capacity_mib')[3])
+        self.assertEqual(33791, self.table.sum('capacity_mib'))
+
+    def test_count(self):
+        self.assertEqual({'OK': 2, 'Critical': 1},
+                         self.table.count('health'))
+
+
+class ExportMemoryTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(ExportMemoryTestCase, self).setUp()
+        with open('rsd_lib/tests/unit/json_samples/v2_1/memory.json',
+                  'r') as f:
+            memory_json = json.loads(f.read())
+
+        self.bodies = {
+            '/redfish/v1/Systems': {'Members': [
+                {'@odata.id': '/redfish/v1/Systems/1'},
+                {'@odata.id': '/redfish/v1/Systems/2'},
+                {'@odata.id': '/redfish/v1/Systems/3'}]},
+            '/redfish/v1/Systems/1': {
+                'Memory': {'@odata.id': '/redfish/v1/Systems/1/Memory'}},
+            '/redfish/v1/Systems/2': {},
+            '/redfish/v1/Systems/1/Memory': {'Members': [
+                {'@odata.id': '/redfish/v1/Systems/1/Memory/1'},
+                {'@odata.id': '/redfish/v1/Systems/1/Memory/2'},
+                {'@odata.id': '/redfish/v1/Systems/1/Memory/3'}]},
+        }
+        for i in (1, 2):
+            path = '/redfish/v1/Systems/1/Memory/%s' % i
+            self.bodies[path] = dict(memory_json, **{'@odata.id': path})
+
+        self.conn = mock.Mock()
+        self.conn.get.side_effect = self._get
+        self.systems = system.SystemCollection(
+            self.conn, '/redfish/v1/Systems', redfish_version='1.0.2')
+
+    def _get(self, path, *args, **kwargs):
+        body = self.bodies.get(path)
+        if body is None:
+            raise exceptions.ResourceNotFoundError(method='GET', url=path,
+                                                   response=mock.Mock())
+        response = mock.Mock()
+        response.json.return_value = body
+        return response
+
+    def test_export_memory(self):
+        table, failures = memory_table.export_memory(self.systems,
+                                                     max_workers=2)
+        self.assertEqual(['/redfish/v1/Systems/1/Memory/1',
+                          '/redfish/v1/Systems/1/Memory/2'],
+                         table.column('path'))
+        self.assertEqual(['/redfish/v1/Systems/3',
+                          '/redfish/v1/Systems/1/Memory/3'], list(failures))
+
+    def test_export_memory_invalid_body(self):
+        get = self.conn.get.side_effect
+
+        def _get(path, *args, **kwargs):
+            response = get(path, *args, **kwargs)
+            if path == '/redfish/v1/Systems/1/Memory/2':
+                response.json.side_effect = ValueError('No JSON object')
+            return response
+
+        self.conn.get.side_effect = _get
+        table, failures = memory_table.export_memory(self.systems)
+        self.assertEqual(['/redfish/v1/Systems/1/Memory/1'],
+                         table.column('path'))
+        self.assertIsInstance(failures['/redfish/v1/Systems/1/Memory/2'],
+                              inventory.InvalidBodyError)
+
+    def test_export_memory_expanded(self):
+        self.conn.client_options = rsd_base.ClientOptions(
+            expand_query=True)
+        self.bodies['/redfish/v1/Systems/1/Memory?$expand=.'] = {'Members': [
+            self.bodies['/redfish/v1/Systems/1/Memory/1'],
+            self.bodies['/redfish/v1/Systems/1/Memory/2']]}
+        table, failures = memory_table.export_memory(self.systems)
+
+        self.assertEqual([16384, 16384], table.column('capacity_mib'))
+        requested = [call[1]['path'] for call in self.conn.get.call_args_list]
+        self.assertNotIn('/redfish/v1/Systems/1/Memory/1', requested)
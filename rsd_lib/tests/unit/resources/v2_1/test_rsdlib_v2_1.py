@@ -17,12 +17,14 @@ import json
 import mock
 import testtools
 
+from rsd_lib import inventory
 from rsd_lib.resources import v2_1
 from rsd_lib.resources.v2_1.chassis import chassis
 from rsd_lib.resources.v2_1.fabric import fabric
 from rsd_lib.resources.v2_1.manager import manager
 from rsd_lib.resources.v2_1.node import node
 from rsd_lib.resources.v2_1.storage_service import storage_service
+from rsd_lib.resources.v2_1.system import memory_table
 from rsd_lib.resources.v2_1.system import system
 
 
@@ -134,3 +136,17 @@ class RSDLibV2_1TestCase(testtools.TestCase):
             self.rsd._conn, 'fake-manager-id',
             redfish_version=self.rsd.redfish_version
         )
+
+    @mock.patch.object(memory_table, 'export_memory', autospec=True)
+    @mock.patch.object(system, 'SystemCollection', autospec=True)
+    def test_export_memory(self, mock_system_collection, mock_export):
+        self.rsd.export_memory(max_workers=4)
+        mock_export.assert_called_once_with(
+            mock_system_collection.return_value, max_workers=4)
+
+    @mock.patch.object(inventory, 'crawl', autospec=True)
+    def test_snapshot(self, mock_crawl):
+        self.rsd.snapshot(max_workers=4)
+        mock_crawl.assert_called_once_with(
+            self.rsd._conn, '/redfish/v1/', root_json=self.rsd.json,
+            max_workers=4)
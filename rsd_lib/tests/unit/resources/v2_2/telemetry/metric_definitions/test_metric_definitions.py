@@ -51,6 +51,9 @@ class MetricDefinitionTestCase(testtools.TestCase):
                          self.metric_definition_inst.implementation)
         self.assertEqual('10.0s',
                          self.metric_definition_inst.sensing_interval)
+        self.assertEqual(
+            ['/redfish/v1/Systems/1-s-2/Memory/1-s-2-mm-4/Metrics'],
+            self.metric_definition_inst.metric_properties)
         self.assertEqual('SystemBoard',
                          self.metric_definition_inst.physical_context)
         self.assertEqual('Celsius',
@@ -0,0 +1,131 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+
+import mock
+from sushy import exceptions
+import testtools
+
+from rsd_lib.resources.v2_2.system import system
+from rsd_lib.resources.v2_2.telemetry import sampler
+
+SAMPLES = {
+    '/redfish/v1/Systems/System2': 'system.json',
+    '/redfish/v1/Systems/System2/Metrics': 'system_metrics.json',
+    '/redfish/v1/Systems/System2/Processors': 'processor_collection.json',
+    '/redfish/v1/Systems/System1/Processors/CPU1': 'processor.json',
+    '/redfish/v1/Systems/System1/Processors/CPU2': 'processor.json',
+    '/redfish/v1/Systems/System1/Processors/CPU1/Metrics':
+        'processor_metrics.json',
+    '/redfish/v1/Systems/System1/Memory': 'memory_collection.json',
+    '/redfish/v1/Systems/System1/Memory/Dimm1': 'memory.json',
+    '/redfish/v1/Systems/System1/Memory/Dimm2': 'memory.json',
+    '/redfish/v1/Systems/System1/Memory/Dimm1/Metrics':
+        'memory_metrics.json',
+}
+
+
+class SamplerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(SamplerTestCase, self).setUp()
+        self.bodies = {}
+        for path, name in SAMPLES.items():
+            with open('rsd_lib/tests/unit/json_samples/v2_2/' + name,
+                      'r') as f:
+                self.bodies[path] = json.loads(f.read())
+        self.requests = collections.Counter()
+        self.conn = mock.Mock()
+        self.conn.get.side_effect = self._get
+        self.system_inst = system.System(
+            self.conn, '/redfish/v1/Systems/System2',
+            redfish_version='1.0.2')
+
+        self.time = 100
+        patcher = mock.patch('time.time', side_effect=lambda: self.time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('time.sleep', autospec=True)
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, path, *args, **kwargs):
+        self.requests[path] += 1
+        body = self.bodies.get(path)
+        if body is None:
+            raise exceptions.ResourceNotFoundError(method='GET', url=path,
+                                                   response=mock.Mock())
+        response = mock.Mock()
+        response.json.return_value = body
+        return response
+
+    def test_samples(self):
+        samples = list(sampler.Sampler([self.system_inst]).samples(rounds=1))
+
+        self.assertEqual(16, len(samples))
+        self.assertEqual(
+            sampler.Sample(100, 'System2',
+                           '/redfish/v1/Systems/System2/Metrics',
+                           'processor_bandwidth_percent', 17),
+            samples[0])
+        self.assertEqual(
+            sampler.Sample(100, 'System2',
+                           '/redfish/v1/Systems/System1/Processors/CPU1/'
+                           'Metrics', 'temperature_celsius', 73),
+            samples[8])
+        self.assertEqual(
+            ('/redfish/v1/Systems/System1/Memory/Dimm1/Metrics',
+             'temperature_celsius', 46),
+            samples[-1][2:])
+        # Discovery fetched the metrics once, no second request
+        self.assertEqual(
+            1, self.requests['/redfish/v1/Systems/System2/Metrics'])
+        self.mock_sleep.assert_not_called()
+
+    def test_samples_rounds(self):
+        the_sampler = sampler.Sampler([self.system_inst], interval=5,
+                                      max_workers=2, memory=False)
+        samples = the_sampler.samples(rounds=3)
+        self.assertEqual(42, len(list(samples)))
+        self.assertEqual(
+            3, self.requests['/redfish/v1/Systems/System2/Metrics'])
+        self.assertEqual(0, self.requests['/redfish/v1/Systems/System1/'
+                                          'Memory/Dimm1/Metrics'])
+        self.assertEqual([mock.call(5), mock.call(5)],
+                         self.mock_sleep.call_args_list)
+
+    def test_samples_failure(self):
+        the_sampler = sampler.Sampler([self.system_inst], processors=False)
+        list(the_sampler.samples(rounds=1))
+        self.bodies.pop('/redfish/v1/Systems/System2/Metrics')
+        samples = list(the_sampler.samples(rounds=1))
+        self.assertEqual(
+            ['temperature_celsius'] * 2, [s.metric for s in samples])
+
+    def test_samples_backpressure(self):
+        the_sampler = sampler.Sampler([self.system_inst], max_workers=1)
+        samples = the_sampler.samples()
+        for _i in range(17):
+            next(samples)
+
+        # The second round is started, the next resources wait for the
+        # consumer
+        self.assertEqual(
+            2, self.requests['/redfish/v1/Systems/System2/Metrics'])
+        self.assertEqual(2, self.requests['/redfish/v1/Systems/System1/'
+                                          'Processors/CPU1/Metrics'])
+        samples.close()
@@ -0,0 +1,148 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import threading
+
+import mock
+import testtools
+
+from rsd_lib.resources.v2_2.telemetry.metric_definitions \
+    import metric_definitions
+from rsd_lib.resources.v2_2.telemetry import sampler
+from rsd_lib.resources.v2_2.telemetry import store
+
+CPU_METRICS = '/redfish/v1/Systems/System1/Processors/CPU1/Metrics'
+
+
+class ParseIntervalTestCase(testtools.TestCase):
+
+    def test_parse_interval(self):
+        self.assertEqual(1, store.parse_interval('PT1S'))
+        self.assertEqual(90.5, store.parse_interval('PT1M30.5S'))
+        self.assertEqual(86400 + 7200, store.parse_interval('P1DT2H'))
+        self.assertEqual(10, store.parse_interval('10.0s'))
+        self.assertIsNone(store.parse_interval(None))
+        self.assertIsNone(store.parse_interval('P'))
+        self.assertIsNone(store.parse_interval('often'))
+
+
+class RingBufferTestCase(testtools.TestCase):
+
+    def test_append(self):
+        buf = store.RingBuffer(capacity=3)
+        self.assertIsNone(buf.last())
+        for i in range(5):
+            buf.append(i, i * 10)
+        self.assertEqual(3, len(buf))
+        self.assertEqual([(2, 20), (3, 30), (4, 40)], buf.items())
+        self.assertEqual((4, 40), buf.last())
+
+    def test_invalid_capacity(self):
+        self.assertRaises(ValueError, store.RingBuffer, capacity=0)
+        self.assertRaises(ValueError, store.TelemetryStore, capacity=0)
+
+    def test_downsample(self):
+        buf = store.RingBuffer()
+        for timestamp, value in ((100, 4), (110, 2), (119, 6), (125, 1),
+                                 (150, 3)):
+            buf.append(timestamp, value)
+        self.assertEqual([store.Window(100, 2, 6, 4, 3),
+                          store.Window(120, 1, 1, 1, 1),
+                          store.Window(140, 3, 3, 3, 1)],
+                         buf.downsample(20))
+        self.assertEqual([store.Window(120, 1, 1, 1, 1),
+                          store.Window(140, 3, 3, 3, 1)],
+                         buf.downsample(20, since=120))
+        self.assertEqual([], store.RingBuffer().downsample(20))
+
+
+class TelemetryStoreTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(TelemetryStoreTestCase, self).setUp()
+        self.store = store.TelemetryStore(capacity=100, window=10)
+
+    def _sample(self, timestamp, value, metric='temperature_celsius',
+                resource=CPU_METRICS, system='System1'):
+        return sampler.Sample(timestamp, system, resource, metric, value)
+
+    def _definition(self, name):
+        conn = mock.Mock()
+        with open('rsd_lib/tests/unit/json_samples/v2_2/' + name, 'r') as f:
+            conn.get.return_value.json.return_value = json.loads(f.read())
+        return metric_definitions.MetricDefinition(conn, '/definition')
+
+    def test_extend(self):
+        self.store.extend([self._sample(100, 70), self._sample(105, 72),
+                           self._sample(100, 150, 'consumed_power_watt'),
+                           self._sample(100, 20, resource='/m',
+                                        system='System2')])
+        self.assertEqual([(100, 70), (105, 72)], self.store.get_buffer(
+            CPU_METRICS, 'temperature_celsius').items())
+        self.assertEqual(
+            sorted([(CPU_METRICS, 'temperature_celsius'),
+                    (CPU_METRICS, 'consumed_power_watt')]),
+            sorted(self.store.keys(system='System1')))
+        self.assertEqual(3, len(self.store.keys()))
+        self.assertIsNone(self.store.get_buffer('/m', 'missing'))
+
+    def test_append_concurrently(self):
+        threads = [threading.Thread(target=self.store.extend, args=(
+            [self._sample(start + i, i) for i in range(0, 1000, 4)],))
+            for start in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        buf = self.store.get_buffer(CPU_METRICS, 'temperature_celsius')
+        self.assertEqual(100, len(buf))
+        self.assertEqual(100, len(set(buf.items())))
+
+    def test_downsample(self):
+        self.store.extend(self._sample(t, t % 7) for t in range(100, 130))
+        windows = self.store.downsample(CPU_METRICS, 'temperature_celsius')
+        self.assertEqual([100, 110, 120], [w.start for w in windows])
+        self.assertEqual(10, windows[0].count)
+        self.assertEqual(
+            [store.Window(100, 0, 6, 89 / 30.0, 30)],
+            self.store.downsample(CPU_METRICS, 'temperature_celsius',
+                                  window=100))
+        self.assertEqual([], self.store.downsample('/missing', 'metric'))
+
+    def test_add_definitions(self):
+        self.store.add_definitions([
+            self._definition('cpu_temperature_metric_def.json'),
+            self._definition('cpu_bandwidth_metric_def.json'),
+            self._definition('metric_definition.json')])
+
+        # PT1S sensing interval, shorter than the default window
+        self.assertEqual(10, self.store.get_window(CPU_METRICS,
+                                                   'temperature_celsius'))
+        self.assertTrue(self.store.append(self._sample(100.5, 72)))
+        self.assertFalse(self.store.append(self._sample(100.9, 72)))
+        self.assertTrue(self.store.append(self._sample(101.5, 73)))
+        self.assertEqual(2, len(self.store.get_buffer(
+            CPU_METRICS, 'temperature_celsius')))
+
+        # Not a sampled metric
+        self.assertNotIn((CPU_METRICS, None), self.store._intervals)
+
+        # Definition of a whole resource, 10 seconds sensing interval
+        memory = '/redfish/v1/Systems/1-s-2/Memory/1-s-2-mm-4/Metrics'
+        self.store.window = 5
+        self.assertEqual(10, self.store.get_window(memory,
+                                                   'temperature_celsius'))
@@ -0,0 +1,216 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+import testtools
+
+from rsd_lib import cache
+from rsd_lib.resources.v2_3.node import node
+from rsd_lib import utils
+
+
+class ResourceCacheTestCase(testtools.TestCase):
+
+    def test_get_key(self):
+        self.assertEqual('/redfish/v1/Nodes',
+                         cache.get_key('http://podm/redfish/v1/Nodes/'))
+        self.assertEqual('/redfish/v1/Nodes?$expand=.',
+                         cache.get_key('/redfish/v1/Nodes?$expand=.'))
+
+    def test_get_ttl(self):
+        resource_cache = cache.ResourceCache(
+            ttl=5, ttls={'ComposedNode': 1})
+        self.assertEqual(1, resource_cache.get_ttl(
+            {'@odata.type': '#ComposedNode.v1_1_0.ComposedNode'}))
+        self.assertEqual(5, resource_cache.get_ttl(
+            {'@odata.type': '#Volume.v1_1_0.Volume'}))
+        self.assertEqual(5, resource_cache.get_ttl({}))
+
+    def test_lru_eviction(self):
+        resource_cache = cache.ResourceCache(max_size=2)
+        resource_cache._set('/redfish/v1/Nodes/1', {'Id': '1'}, None)
+        resource_cache._set('/redfish/v1/Nodes/2', {'Id': '2'}, None)
+        self.assertEqual({'Id': '1'},
+                         resource_cache.get('/redfish/v1/Nodes/1'))
+        resource_cache._set('/redfish/v1/Nodes/3', {'Id': '3'}, None)
+
+        self.assertEqual(2, len(resource_cache))
+        self.assertIn('/redfish/v1/Nodes/1', resource_cache)
+        self.assertNotIn('/redfish/v1/Nodes/2', resource_cache)
+        self.assertIn('/redfish/v1/Nodes/3', resource_cache)
+
+    def test_invalidate(self):
+        resource_cache = cache.ResourceCache()
+        resource_cache._set('/redfish/v1/Nodes/1', {'Id': '1'}, None)
+        resource_cache.invalidate('/redfish/v1/Nodes/1/')
+        self.assertIsNone(resource_cache.get('/redfish/v1/Nodes/1'))
+
+        resource_cache._set('/redfish/v1/Nodes/1', {'Id': '1'}, None)
+        resource_cache.clear()
+        self.assertEqual(0, len(resource_cache))
+
+
+class PersistentResourceCacheTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(PersistentResourceCacheTestCase, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'cache.sqlite')
+        self.cache = self._get_cache()
+
+    def _get_cache(self, namespace='http://podm:8443', ttl=10):
+        resource_cache = cache.PersistentResourceCache(
+            self.path, namespace=namespace, ttl=ttl)
+        self.addCleanup(resource_cache.close)
+        return resource_cache
+
+    def test_warm_start(self):
+        with mock.patch('time.time', return_value=100):
+            self.cache._set('/redfish/v1/Nodes/1', {'Id': '1'}, 'W/"1"')
+
+        # Another process
+        resource_cache = self._get_cache()
+        self.assertEqual(0, len(resource_cache))
+        entry = resource_cache._get('/redfish/v1/Nodes/1/')
+        self.assertEqual({'Id': '1'}, entry.body)
+        self.assertEqual('W/"1"', entry.etag)
+        self.assertEqual(100, entry.fetched_at)
+        self.assertEqual(110, entry.expires_at)
+        self.assertEqual(1, len(resource_cache))
+
+    def test_namespace(self):
+        self.cache._set('/redfish/v1/Nodes/1', {'Id': '1'}, None)
+        resource_cache = self._get_cache(namespace='http://other:8443')
+        self.assertNotIn('/redfish/v1/Nodes/1', resource_cache)
+
+    def test_invalidate(self):
+        self.cache._set('/redfish/v1/Nodes/1', {'Id': '1'}, None)
+        self.cache._set('/redfish/v1/Nodes/2', {'Id': '2'}, None)
+        self.cache.invalidate('/redfish/v1/Nodes/1')
+        self.assertNotIn('/redfish/v1/Nodes/1', self._get_cache())
+
+        self.cache.clear()
+        self.assertNotIn('/redfish/v1/Nodes/2', self._get_cache())
+
+    def test_caching_connector(self):
+        conn = mock.Mock()
+        conn.get.return_value = utils.JsonResponse(
+            {'@odata.id': '/redfish/v1/Nodes/Node1', 'Id': 'Node1'},
+            headers={'ETag': 'W/"1"'})
+        cache.CachingConnector(conn, self.cache).get('/redfish/v1/Nodes/Node1')
+
+        # A new process revalidates the expired resource
+        resource_cache = self._get_cache(ttl=0)
+        conn.get.return_value = utils.JsonResponse(None, 304)
+        response = cache.CachingConnector(conn, resource_cache).get(
+            '/redfish/v1/Nodes/Node1')
+        self.assertEqual('Node1', response.json()['Id'])
+        conn.get.assert_called_with(path='/redfish/v1/Nodes/Node1',
+                                    data=None,
+                                    headers={'If-None-Match': 'W/"1"'})
+        self.assertEqual(1, resource_cache.revalidations)
+
+
+class CachingConnectorTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(CachingConnectorTestCase, self).setUp()
+        with open('rsd_lib/tests/unit/json_samples/v2_3/node.json',
+                  'r') as f:
+            self.node_json = json.loads(f.read())
+        self.conn = mock.Mock()
+        self.conn.get.return_value = utils.JsonResponse(
+            self.node_json, headers={'ETag': 'W/"1"'})
+        self.cache = cache.ResourceCache(ttl=10)
+        self.caching_conn = cache.CachingConnector(self.conn, self.cache)
+
+        self.time = 100
+        patcher = mock.patch('time.time', side_effect=lambda: self.time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_fresh(self):
+        node_inst = node.Node(self.caching_conn, '/redfish/v1/Nodes/Node1')
+        node_inst.refresh()
+        self.assertEqual('Node1', node_inst.identity)
+        self.conn.get.assert_called_once_with(
+            path='/redfish/v1/Nodes/Node1', data=None, headers=None)
+        self.assertEqual((1, 0, 1), (self.cache.hits,
+                                     self.cache.revalidations,
+                                     self.cache.misses))
+
+    def test_get_not_modified(self):
+        node_inst = node.Node(self.caching_conn, '/redfish/v1/Nodes/Node1')
+        self.time = 111
+        self.conn.get.return_value = utils.JsonResponse(None, 304)
+        node_inst.refresh()
+
+        self.assertEqual('Node1', node_inst.identity)
+        self.conn.get.assert_called_with(
+            path='/redfish/v1/Nodes/Node1', data=None,
+            headers={'If-None-Match': 'W/"1"'})
+        self.assertEqual(1, self.cache.revalidations)
+
+        # Revalidated for another time to live
+        node_inst.refresh()
+        self.assertEqual(2, self.conn.get.call_count)
+
+    def test_get_modified(self):
+        node_inst = node.Node(self.caching_conn, '/redfish/v1/Nodes/Node1')
+        self.time = 111
+        node_json = dict(self.node_json, Id='Node2')
+        node_json['@odata.etag'] = 'W/"2"'
+        self.conn.get.return_value = utils.JsonResponse(node_json)
+        node_inst.refresh()
+
+        self.assertEqual('Node2', node_inst.identity)
+        self.assertEqual(2, self.cache.misses)
+        self.assertEqual('W/"2"', self.cache._get(node_inst.path).etag)
+
+    def test_get_not_json(self):
+        response = mock.Mock(status_code=200)
+        response.json.side_effect = ValueError
+        self.conn.get.return_value = response
+        self.assertIs(response,
+                      self.caching_conn.get('/redfish/v1/$metadata'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_action_invalidates(self):
+        node_inst = node.Node(self.caching_conn, '/redfish/v1/Nodes/Node1')
+        self.cache._set('/redfish/v1/Nodes', {}, None)
+        self.cache._set('/redfish/v1/Nodes?$expand=.', {}, None)
+        node_inst.assemble_node()
+
+        self.conn.post.assert_called_once_with(
+            path='/redfish/v1/Nodes/Node1/Actions/ComposedNode.Assemble',
+            data=None, headers=None)
+        self.assertEqual(0, len(self.cache))
+
+    def test_delete_invalidates(self):
+        self.cache._set('/redfish/v1/Nodes/Node1', {}, None)
+        self.cache._set('/redfish/v1/Nodes', {}, None)
+        self.cache._set('/redfish/v1/Systems', {}, None)
+        self.caching_conn.delete('/redfish/v1/Nodes/Node1')
+        self.assertEqual(['/redfish/v1/Systems'],
+                         list(self.cache._entries))
+
+    def test_getattr(self):
+        self.assertIs(self.conn.close, self.caching_conn.close)
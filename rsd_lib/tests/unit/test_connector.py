@@ -0,0 +1,238 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from requests import adapters
+from sushy import connector
+from sushy import exceptions
+import testtools
+
+from rsd_lib import connector as rsd_connector
+from rsd_lib import utils
+
+
+class HTTPAdapterTestCase(testtools.TestCase):
+
+    @mock.patch.object(adapters.HTTPAdapter, 'send', autospec=True)
+    def test_send_default_timeout(self, mock_send):
+        adapter = rsd_connector.HTTPAdapter(timeout=5)
+        request = mock.Mock()
+        adapter.send(request, timeout=None, verify=True)
+        mock_send.assert_called_once_with(adapter, request, timeout=5,
+                                          verify=True)
+
+    @mock.patch.object(adapters.HTTPAdapter, 'send', autospec=True)
+    def test_send_timeout(self, mock_send):
+        adapter = rsd_connector.HTTPAdapter(timeout=5)
+        request = mock.Mock()
+        adapter.send(request, timeout=1)
+        mock_send.assert_called_once_with(adapter, request, timeout=1)
+
+
+class ConfigureTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(ConfigureTestCase, self).setUp()
+        self.conn = connector.Connector('http://foo.bar:8442')
+        self.addCleanup(self.conn.close)
+
+    def test_configure(self):
+        rsd_connector.configure(self.conn, pool_size=50, pool_block=True,
+                                timeout=(3, 30), max_retries=2,
+                                backoff_factor=0.5)
+
+        adapter = self.conn._session.get_adapter('https://foo.bar:8442')
+        self.assertIsInstance(adapter, rsd_connector.HTTPAdapter)
+        self.assertIs(adapter,
+                      self.conn._session.get_adapter('http://foo.bar:8442'))
+        self.assertEqual(50, adapter._pool_maxsize)
+        self.assertEqual(50, adapter._pool_connections)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual((3, 30), adapter.timeout)
+        self.assertEqual(2, adapter.max_retries.total)
+        self.assertEqual(0.5, adapter.max_retries.backoff_factor)
+        self.assertEqual(rsd_connector.RETRY_STATUSES,
+                         adapter.max_retries.status_forcelist)
+        self.assertEqual('keep-alive',
+                         self.conn._session.headers['Connection'])
+
+    def test_configure_no_keep_alive(self):
+        rsd_connector.configure(self.conn, keep_alive=False)
+        self.assertEqual('close', self.conn._session.headers['Connection'])
+
+
+class GetConnectorTestCase(testtools.TestCase):
+
+    def test_get_connector(self):
+        conn = rsd_connector.get_connector('http://foo.bar:8442', 'foo',
+                                           'bar')
+        self.addCleanup(conn.close)
+        self.assertEqual(('foo', 'bar'), conn._session.auth)
+        self.assertFalse(conn._auth.can_refresh_session())
+
+    def test_get_connector_unauthorized(self):
+        conn = rsd_connector.get_connector('http://foo.bar:8442', 'foo',
+                                           'bar')
+        self.addCleanup(conn.close)
+        with mock.patch.object(conn._session, 'request', autospec=True,
+                               return_value=_response(401)):
+            self.assertRaises(exceptions.AccessError, conn.get,
+                              '/redfish/v1/Nodes')
+
+
+def _response(status_code, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = {}
+    return response
+
+
+class SessionAuthConnectorTestCase(testtools.TestCase):
+    """The session handled by a sushy SessionAuth, from sushy 1.3"""
+
+    def setUp(self):
+        super(SessionAuthConnectorTestCase, self).setUp()
+        self.conn = rsd_connector.get_connector('http://foo.bar:8442')
+        self.addCleanup(self.conn.close)
+        patcher = mock.patch.object(self.conn._session, 'request',
+                                    autospec=True)
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session_conn = rsd_connector.SessionConnector(
+            self.conn, 'foo', 'bar')
+
+    def _login(self, token, session):
+        return _response(201, {
+            'X-Auth-Token': token,
+            'Location': '/redfish/v1/SessionService/Sessions/' + session})
+
+    def test_login_once(self):
+        self.mock_request.side_effect = [self._login('token1', '1'),
+                                         _response(200), _response(200)]
+        self.session_conn.get('/redfish/v1/Nodes')
+        self.session_conn.get('/redfish/v1/Systems')
+
+        self.assertEqual(3, self.mock_request.call_count)
+        self.assertEqual('POST', self.mock_request.call_args_list[0][0][0])
+        self.assertEqual({'X-Auth-Token': None, 'Content-Type':
+                          'application/json'},
+                         self.mock_request.call_args_list[0][1]['headers'])
+        self.assertEqual('token1', self.conn._session.headers['X-Auth-Token'])
+
+    def test_login_again_on_unauthorized(self):
+        self.mock_request.side_effect = [
+            self._login('token1', '1'), _response(401),
+            self._login('token2', '2'), _response(200)]
+        response = self.session_conn.get('/redfish/v1/Nodes')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('token2', self.conn._session.headers['X-Auth-Token'])
+
+    def test_forbidden_login(self):
+        self.mock_request.return_value = _response(401)
+        self.assertRaises(exceptions.AccessError, self.session_conn.get,
+                          '/redfish/v1/Nodes')
+        self.assertEqual(1, self.mock_request.call_count)
+
+    def test_close(self):
+        self.mock_request.side_effect = [
+            self._login('token1', '1'), _response(401),
+            self._login('token2', '2'), _response(200), _response(204)]
+        self.session_conn.get('/redfish/v1/Nodes')
+        self.session_conn.close()
+
+        # The current session is deleted
+        self.assertEqual(
+            ('DELETE',
+             'http://foo.bar:8442/redfish/v1/SessionService/Sessions/2'),
+            self.mock_request.call_args[0])
+
+
+class SessionConnectorTestCase(testtools.TestCase):
+    """The session handled by the connector, before sushy 1.3"""
+
+    def setUp(self):
+        super(SessionConnectorTestCase, self).setUp()
+        patcher = mock.patch.object(rsd_connector, 'sushy_auth', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.conn = mock.Mock()
+        self.conn.post.return_value = utils.JsonResponse(
+            None, 201, {'X-Auth-Token': 'token1',
+                        'Location': '/redfish/v1/SessionService/Sessions/1'})
+        self.session_conn = rsd_connector.SessionConnector(
+            self.conn, 'foo', 'bar')
+
+    def _unauthorized(self):
+        return exceptions.AccessError(
+            method='GET', url='/redfish/v1/Nodes',
+            response=mock.MagicMock(status_code=401))
+
+    def test_login_once(self):
+        self.session_conn.get('/redfish/v1/Nodes')
+        self.session_conn.get('/redfish/v1/Systems', headers={'A': 'b'})
+
+        self.conn.post.assert_called_once_with(
+            path='/redfish/v1/SessionService/Sessions',
+            data={'UserName': 'foo', 'Password': 'bar'},
+            headers={'X-Auth-Token': None})
+        self.assertEqual(
+            [mock.call(path='/redfish/v1/Nodes', data=None,
+                       headers={'X-Auth-Token': 'token1'}),
+             mock.call(path='/redfish/v1/Systems', data=None,
+                       headers={'X-Auth-Token': 'token1', 'A': 'b'})],
+            self.conn.get.call_args_list)
+
+    def test_login_again_on_unauthorized(self):
+        self.session_conn.get('/redfish/v1/Nodes')
+        self.conn.post.return_value = utils.JsonResponse(
+            None, 201, {'X-Auth-Token': 'token2',
+                        'Location': '/redfish/v1/SessionService/Sessions/2'})
+        self.conn.get.side_effect = [self._unauthorized(), mock.sentinel.resp]
+
+        self.assertIs(mock.sentinel.resp,
+                      self.session_conn.get('/redfish/v1/Nodes'))
+        self.assertEqual(2, self.conn.post.call_count)
+        self.conn.get.assert_called_with(
+            path='/redfish/v1/Nodes', data=None,
+            headers={'X-Auth-Token': 'token2'})
+
+    def test_unauthorized_twice(self):
+        self.conn.get.side_effect = [self._unauthorized(),
+                                     self._unauthorized()]
+        self.assertRaises(exceptions.AccessError, self.session_conn.get,
+                          '/redfish/v1/Nodes')
+        self.assertEqual(2, self.conn.post.call_count)
+
+    def test_forbidden(self):
+        self.conn.get.side_effect = exceptions.AccessError(
+            method='GET', url='/redfish/v1/Nodes',
+            response=mock.MagicMock(status_code=403))
+        self.assertRaises(exceptions.AccessError, self.session_conn.get,
+                          '/redfish/v1/Nodes')
+        self.assertEqual(1, self.conn.post.call_count)
+
+    def test_close(self):
+        self.session_conn.get('/redfish/v1/Nodes')
+        self.session_conn.close()
+
+        self.conn.delete.assert_called_once_with(
+            path='/redfish/v1/SessionService/Sessions/1',
+            headers={'X-Auth-Token': 'token1'})
+        self.conn.close.assert_called_once_with()
+
+    def test_close_without_session(self):
+        self.session_conn.close()
+        self.conn.delete.assert_not_called()
+        self.conn.close.assert_called_once_with()
@@ -0,0 +1,145 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import testtools
+
+import rsd_lib
+from rsd_lib import inventory
+from rsd_lib.tests.emulator import pod
+from rsd_lib.tests.emulator import server
+
+
+class GenerateTestCase(testtools.TestCase):
+
+    def test_generate(self):
+        resources = pod.generate('2.3.0', systems=6, nodes=2, fabrics=2,
+                                 volumes=5, drives=9, processors=1,
+                                 memory=2)
+        types = [inventory.get_type_name(body)
+                 for body in resources.values()]
+        self.assertEqual(
+            (6, 6, 12, 2, 5, 3, 9, 2, 5 + 2, 2),
+            tuple(types.count(name) for name in (
+                'ComputerSystem', 'Processor', 'Memory', 'ComposedNode',
+                'Volume', 'StoragePool', 'Drive', 'Fabric', 'Endpoint',
+                'Zone')))
+        self.assertEqual('2.3.0', resources['/redfish/v1']['Oem'][
+            'Intel_RackScale']['ApiVersion'])
+
+        # Every link reaches a generated resource
+        for body in resources.values():
+            for link in inventory.iter_links(body):
+                self.assertIn(inventory.get_key(link), resources)
+
+    def test_generate_2_1(self):
+        resources = pod.generate('2.1.0', systems=2, volumes=3)
+        self.assertEqual(
+            [{'@odata.id': '/redfish/v1/Services/1/Targets/1'}],
+            resources['/redfish/v1/Nodes/1']['Links']['RemoteDrives'])
+        self.assertNotIn('ProtocolFeaturesSupported',
+                         resources['/redfish/v1'])
+
+    def test_generate_invalid(self):
+        self.assertRaises(ValueError, pod.generate, '2.4.0')
+        self.assertRaises(ValueError, pod.generate, systems=1, nodes=2)
+
+
+class PodmEmulatorTestCase(testtools.TestCase):
+
+    def _start(self, resources, **kwargs):
+        emulator = server.PodmEmulator(resources, **kwargs).start()
+        self.addCleanup(emulator.stop)
+        return emulator
+
+    def test_rsdlib(self):
+        emulator = self._start(pod.generate('2.3.0', systems=4, nodes=2,
+                                            expand=True))
+        rsd = rsd_lib.RSDLib(emulator.url, username='foo',
+                             password='bar').factory()
+        nodes = rsd.get_node_collection().get_members()
+        self.assertEqual(['1', '2'], [n.identity for n in nodes])
+        self.assertEqual('/redfish/v1/Systems/2', nodes[1].system.path)
+        # The members were inlined in the expanded collection
+        self.assertNotIn(('GET', '/redfish/v1/Nodes/1'), emulator.requests)
+
+        snapshot = rsd.snapshot()
+        self.assertEqual({}, dict(snapshot.failures))
+        # The event service is excluded from the snapshots
+        self.assertEqual(['/redfish/v1/EventService'],
+                         [path for path in emulator.resources
+                          if path not in snapshot])
+
+    def test_handle(self):
+        emulator = server.PodmEmulator(pod.generate(systems=2, nodes=1))
+        self.addCleanup(emulator.stop)
+
+        status_code, body, headers = emulator.handle(
+            'GET', '/redfish/v1/Nodes/1', '', None, {})
+        self.assertEqual((200, '1'), (status_code, body['Id']))
+        self.assertEqual(304, emulator.handle(
+            'GET', '/redfish/v1/Nodes/1', '', None,
+            {'If-None-Match': headers['ETag']})[0])
+
+        status_code, body, _headers = emulator.handle(
+            'PATCH', '/redfish/v1/Nodes/1', '', {'Description': 'Foo'}, {})
+        self.assertEqual('Foo', body['Description'])
+        self.assertEqual(204, emulator.handle(
+            'POST', '/redfish/v1/Nodes/1/Actions/ComposedNode.Assemble', '',
+            None, {})[0])
+
+        self.assertEqual(204, emulator.handle(
+            'DELETE', '/redfish/v1/Nodes/1', '', None, {})[0])
+        self.assertEqual(404, emulator.handle(
+            'GET', '/redfish/v1/Nodes/1', '', None, {})[0])
+        self.assertEqual([], emulator.resources['/redfish/v1/Nodes'][
+            'Members'])
+        self.assertEqual(3, emulator.requests[('GET', '/redfish/v1/Nodes/1')])
+        # An Allocate request without body
+        self.assertEqual(201, emulator.handle(
+            'POST', '/redfish/v1/Nodes/Actions/Allocate', '', None, {})[0])
+
+    def test_post(self):
+        emulator = self._start(pod.generate(systems=2, nodes=1, volumes=2))
+        rsd = rsd_lib.RSDLib(emulator.url, username='foo',
+                             password='bar').factory()
+        nodes = rsd.get_node_collection()
+        path = nodes.compose_node(name='Node2')
+        self.assertEqual('/redfish/v1/Nodes/2', path)
+        node = nodes.get_member(path)
+        self.assertEqual(('Node2', 'allocated'),
+                         (node.name, node.composed_node_state))
+        node.assemble_node()
+
+        volume = '/redfish/v1/StorageServices/1/Volumes/1'
+        node.attach_endpoint(volume)
+        node.refresh()
+        self.assertEqual('assembled', node.composed_node_state)
+        self.assertEqual((volume,), node.get_allowed_detach_endpoints())
+        node.detach_endpoint(volume)
+        node.refresh()
+        self.assertEqual((), node.get_allowed_detach_endpoints())
+
+        volumes = rsd.get_storage_service_collection().get_members()[
+            0].volumes
+        path = volumes.create_volume(1024)
+        self.assertEqual('/redfish/v1/StorageServices/1/Volumes/3', path)
+        self.assertEqual(1024, volumes.get_member(path).capacity_bytes)
+
+    def test_error_rate(self):
+        emulator = server.PodmEmulator(pod.generate(systems=1),
+                                       error_rate=1)
+        self.addCleanup(emulator.stop)
+        self.assertEqual(503, emulator.handle(
+            'GET', '/redfish/v1/Systems/1', '', None, {})[0])
@@ -0,0 +1,162 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import testtools
+
+from rsd_lib import graph
+from rsd_lib import inventory
+
+
+def _link(path):
+    return {'@odata.id': path}
+
+
+def _body(path, type_name, **properties):
+    properties['@odata.id'] = path
+    properties['@odata.type'] = '#%s.v1_0_0.%s' % (type_name, type_name)
+    return properties
+
+
+DRIVE1 = '/redfish/v1/Chassis/1/Drives/1'
+DRIVE2 = '/redfish/v1/Chassis/1/Drives/2'
+POOL1 = '/redfish/v1/StorageServices/1/StoragePools/1'
+POOL2 = '/redfish/v1/StorageServices/1/StoragePools/2'
+VOLUME1 = '/redfish/v1/StorageServices/1/Volumes/1'
+VOLUME2 = '/redfish/v1/StorageServices/1/Volumes/2'
+TARGET1 = '/redfish/v1/Fabrics/1/Endpoints/Target1'
+TARGET2 = '/redfish/v1/Fabrics/1/Endpoints/Target2'
+INITIATOR1 = '/redfish/v1/Fabrics/1/Endpoints/Initiator1'
+ZONE1 = '/redfish/v1/Fabrics/1/Zones/1'
+SYSTEM1 = '/redfish/v1/Systems/1'
+NODE1 = '/redfish/v1/Nodes/1'
+NODE2 = '/redfish/v1/Nodes/2'
+
+
+def _get_inventory():
+    resources = inventory.Inventory()
+    bodies = [
+        _body(DRIVE1, 'Drive', Links={
+            'Chassis': _link('/redfish/v1/Chassis/1'),
+            'Volumes': [_link(VOLUME1)]}),
+        _body(DRIVE2, 'Drive', Links={'Volumes': [_link(VOLUME2)]}),
+        _body(POOL1, 'StoragePool', CapacitySources=[
+            {'ProvidingDrives': [_link(DRIVE1)]}]),
+        _body(POOL2, 'StoragePool', CapacitySources=[
+            {'ProvidingDrives': [_link(DRIVE2)]}]),
+        _body(VOLUME1, 'Volume', CapacitySources=[
+            {'ProvidingPools': [_link(POOL1)]}],
+            Links={'Oem': {'Intel_RackScale': {
+                'Endpoints': [_link(TARGET1)]}}}),
+        _body(VOLUME2, 'Volume', CapacitySources=[
+            {'ProvidingPools': [_link(POOL2)]}]),
+        _body(TARGET1, 'Endpoint', ConnectedEntities=[
+            {'EntityRole': 'Target', 'EntityLink': _link(VOLUME1)}],
+            Links={'Oem': {'Intel_RackScale': {'Zones': [_link(ZONE1)]}}}),
+        _body(TARGET2, 'Endpoint', ConnectedEntities=[
+            {'EntityRole': 'Target', 'EntityLink': _link(VOLUME2)}]),
+        _body(INITIATOR1, 'Endpoint', ConnectedEntities=[
+            {'EntityRole': 'Initiator', 'EntityLink': _link(SYSTEM1)}],
+            Links={'Oem': {'Intel_RackScale': {'Zones': [_link(ZONE1)]}}}),
+        _body(ZONE1, 'Zone', Links={
+            'Endpoints': [_link(TARGET1), _link(INITIATOR1)],
+            'InvolvedSwitches': [_link('/redfish/v1/Fabrics/1/Switches/1')]}),
+        _body(SYSTEM1, 'ComputerSystem', Links={
+            'Chassis': [_link('/redfish/v1/Chassis/1')]}),
+        _body(NODE1, 'ComposedNode', Links={
+            'ComputerSystem': _link(SYSTEM1),
+            'ManagedBy': [_link('/redfish/v1/Managers/1')]}),
+        _body(NODE2, 'ComposedNode', Links={
+            'ComputerSystem': _link('/redfish/v1/Systems/2'),
+            'Oem': {'Intel_RackScale': {'RemoteDrives': [_link(TARGET2)]}}}),
+    ]
+    for body in bodies:
+        resources.add(body['@odata.id'], body)
+    return resources
+
+
+class IterRelationsTestCase(testtools.TestCase):
+
+    def test_iter_relations(self):
+        body = _body(TARGET1, 'Endpoint', Id='Target1', ConnectedEntities=[
+            {'EntityRole': 'Target', 'EntityLink': _link(VOLUME1),
+             'Identifiers': [{'DurableName': 'nqn'}]}],
+            Links={'Endpoints@odata.count': 0, 'Oem': {'Intel_RackScale': {
+                'Zones': [_link(ZONE1)]}}})
+        self.assertEqual(
+            [('Target', VOLUME1), ('Zones', ZONE1)],
+            sorted(graph.iter_relations(body)))
+
+    def test_iter_relations_capacity_sources(self):
+        body = _body(POOL1, 'StoragePool', CapacitySources=[
+            {'ProvidedCapacity': {'Data': {}},
+             'ProvidingDrives': [_link(DRIVE1), _link(DRIVE2)]}])
+        self.assertEqual(
+            [('ProvidingDrives', DRIVE1), ('ProvidingDrives', DRIVE2)],
+            sorted(graph.iter_relations(body)))
+
+
+class LinkGraphTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(LinkGraphTestCase, self).setUp()
+        self.graph = graph.LinkGraph.from_inventory(_get_inventory())
+
+    def test_links(self):
+        self.assertEqual(13, len(self.graph))
+        self.assertIn(ZONE1 + '/', self.graph)
+        self.assertEqual('Zone', self.graph.get_type_name(ZONE1))
+        self.assertEqual(
+            [INITIATOR1, TARGET1, '/redfish/v1/Fabrics/1/Switches/1'],
+            self.graph.links(ZONE1))
+        self.assertEqual(
+            ['/redfish/v1/Fabrics/1/Switches/1'],
+            self.graph.links(ZONE1, relation='InvolvedSwitches'))
+
+    def test_referrers(self):
+        self.assertEqual([INITIATOR1, TARGET1], self.graph.referrers(ZONE1))
+        self.assertEqual([POOL1], self.graph.referrers(
+            DRIVE1, relation='ProvidingDrives'))
+        self.assertEqual([], self.graph.referrers('/redfish/v1/Missing'))
+
+    def test_impact(self):
+        self.assertEqual([NODE1],
+                         self.graph.impact(DRIVE1, 'ComposedNode'))
+        self.assertEqual([NODE2],
+                         self.graph.impact(DRIVE2, 'ComposedNode'))
+        self.assertEqual([POOL1, VOLUME1, TARGET1, ZONE1, INITIATOR1,
+                          SYSTEM1, NODE1], self.graph.impact(DRIVE1))
+
+    def test_impact_structural(self):
+        # The other resources of the chassis don't depend on it
+        self.assertEqual([], self.graph.impact('/redfish/v1/Chassis/1'))
+
+    def test_dependencies(self):
+        self.assertEqual([DRIVE1],
+                         self.graph.dependencies(NODE1, 'Drive'))
+        self.assertNotIn(VOLUME2, self.graph.dependencies(NODE1))
+
+    def test_find_path(self):
+        # The drive links to its volume, skipping the pool
+        self.assertEqual(
+            [NODE1, SYSTEM1, INITIATOR1, ZONE1, TARGET1, VOLUME1, DRIVE1],
+            self.graph.find_path(NODE1 + '/', DRIVE1))
+        self.assertEqual([VOLUME1, POOL1],
+                         self.graph.find_path(VOLUME1, POOL1))
+        self.assertIsNone(self.graph.find_path(NODE1, DRIVE2))
+
+    def test_add_replaces(self):
+        self.graph.add(NODE2, _body(NODE2, 'ComposedNode', Links={}))
+        self.assertEqual([], self.graph.impact(DRIVE2, 'ComposedNode'))
+        self.assertEqual([], self.graph.referrers(TARGET2))
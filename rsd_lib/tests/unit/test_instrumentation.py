@@ -0,0 +1,197 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import mock
+from sushy import exceptions
+import testtools
+
+from rsd_lib import instrumentation
+from rsd_lib.resources import base as rsd_base
+from rsd_lib.resources.v2_3.node import node
+from rsd_lib import utils
+
+
+class HistogramTestCase(testtools.TestCase):
+
+    def test_observe(self):
+        histogram = instrumentation.Histogram((1, 10))
+        for value in (0.5, 1, 5, 20):
+            histogram.observe(value)
+        self.assertEqual([2, 1, 1], histogram.counts)
+        self.assertEqual(26.5, histogram.sum)
+        self.assertEqual(4, histogram.count)
+        self.assertEqual([(1, 2), (10, 3), (float('inf'), 4)],
+                         histogram.cumulative())
+
+
+class MetricsRegistryTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(MetricsRegistryTestCase, self).setUp()
+        self.metrics = instrumentation.MetricsRegistry()
+
+    def test_get_resource_type(self):
+        self.assertEqual('Volume', instrumentation.get_resource_type(
+            '/redfish/v1/StorageServices/1/Volumes/1',
+            {'@odata.type': '#Volume.v1_1_0.Volume'}))
+        self.assertEqual('ComposedNode', instrumentation.get_resource_type(
+            '/redfish/v1/Nodes/1/Actions/ComposedNode.Assemble', None))
+        self.assertEqual('unknown', instrumentation.get_resource_type(
+            '/redfish/v1/Nodes/1', None))
+
+    def test_observe_request(self):
+        body = {'@odata.type': '#ComposedNode.v1_1_0.ComposedNode'}
+        self.metrics.observe_request('GET', '/redfish/v1/Nodes/1', body, 200,
+                                     0.02, 2000, 0.001)
+        self.metrics.observe_request('GET', '/redfish/v1/Nodes/1', body, 200,
+                                     0.2, 2000, 0.001)
+        self.metrics.observe_request('GET', '/redfish/v1/Nodes/2', None, 404,
+                                     0.01)
+
+        self.assertEqual({('GET', 'ComposedNode', 200): 2,
+                          ('GET', 'unknown', 404): 1},
+                         dict(self.metrics.requests))
+        latency = self.metrics.latencies[('GET', 'ComposedNode')]
+        self.assertEqual(2, latency.count)
+        self.assertAlmostEqual(0.22, latency.sum)
+        self.assertEqual(4000, self.metrics.sizes[('GET',
+                                                   'ComposedNode')].sum)
+        self.assertEqual(['ComposedNode'], list(self.metrics.decode_times))
+
+    def test_listener(self):
+        measurements = []
+        self.metrics.add_listener(measurements.append)
+        self.metrics.add_listener(mock.Mock(side_effect=RuntimeError))
+        self.metrics.observe_request('DELETE', '/redfish/v1/Nodes/1', None,
+                                     204, 0.5)
+        self.metrics.observe_parse('/redfish/v1/Nodes/1', {}, 0.001)
+
+        self.assertEqual(
+            [instrumentation.Request('DELETE', '/redfish/v1/Nodes/1',
+                                     'unknown', 204, 0.5, 0, None),
+             instrumentation.Parse('/redfish/v1/Nodes/1', 'unknown', 0.001)],
+            measurements)
+
+        self.metrics.remove_listener(measurements.append)
+        self.metrics.observe_parse('/redfish/v1/Nodes/1', {}, 0.001)
+        self.assertEqual(2, len(measurements))
+
+    def test_export(self):
+        self.metrics.observe_request(
+            'GET', '/redfish/v1/Nodes/1',
+            {'@odata.type': '#ComposedNode.v1_1_0.ComposedNode'}, 200, 0.02,
+            2000, 0.001)
+        self.metrics.observe_request('GET', '/redfish/v1/Nodes/2', None,
+                                     None, 0.01)
+        self.metrics.observe_parse(
+            '/redfish/v1/Nodes/1',
+            {'@odata.type': '#ComposedNode.v1_1_0.ComposedNode'}, 0.0002)
+        lines = self.metrics.export().splitlines()
+
+        self.assertIn('# TYPE rsd_lib_requests_total counter', lines)
+        self.assertIn('rsd_lib_requests_total{method="GET",resource_type='
+                      '"ComposedNode",status="200"} 1', lines)
+        self.assertIn('rsd_lib_requests_total{method="GET",resource_type='
+                      '"unknown",status="error"} 1', lines)
+        self.assertIn('# TYPE rsd_lib_request_duration_seconds histogram',
+                      lines)
+        self.assertIn('rsd_lib_request_duration_seconds_bucket{method="GET",'
+                      'resource_type="ComposedNode",le="0.01"} 0', lines)
+        self.assertIn('rsd_lib_request_duration_seconds_bucket{method="GET",'
+                      'resource_type="ComposedNode",le="0.025"} 1', lines)
+        self.assertIn('rsd_lib_request_duration_seconds_bucket{method="GET",'
+                      'resource_type="ComposedNode",le="+Inf"} 1', lines)
+        self.assertIn('rsd_lib_response_size_bytes_sum{method="GET",'
+                      'resource_type="ComposedNode"} 2000.0', lines)
+        self.assertIn('rsd_lib_decode_duration_seconds_count{resource_type='
+                      '"ComposedNode"} 1', lines)
+        self.assertIn('rsd_lib_parse_duration_seconds_bucket{resource_type='
+                      '"ComposedNode",le="0.00025"} 1', lines)
+
+    def test_reset(self):
+        self.metrics.observe_request('GET', '/redfish/v1', None, 200, 0.01)
+        self.metrics.reset()
+        self.assertEqual(0, len(self.metrics.requests))
+        self.assertEqual({}, self.metrics.latencies)
+
+
+class InstrumentedConnectorTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(InstrumentedConnectorTestCase, self).setUp()
+        with open('rsd_lib/tests/unit/json_samples/v2_3/node.json',
+                  'r') as f:
+            self.content = f.read().encode('utf-8')
+        self.conn = mock.Mock()
+        response = self.conn.get.return_value
+        response.status_code = 200
+        response.content = self.content
+        response.json.return_value = json.loads(self.content)
+        self.metrics = instrumentation.MetricsRegistry()
+        self.instrumented_conn = instrumentation.InstrumentedConnector(
+            self.conn, self.metrics)
+
+    def test_get(self):
+        response = self.instrumented_conn.get('/redfish/v1/Nodes/Node1')
+        self.assertIsInstance(response, utils.JsonResponse)
+        self.assertEqual('Node1', response.json()['Id'])
+        self.conn.get.return_value.json.assert_called_once_with()
+
+        self.assertEqual({('GET', 'ComposedNode', 200): 1},
+                         dict(self.metrics.requests))
+        self.assertEqual(len(self.content),
+                         self.metrics.sizes[('GET', 'ComposedNode')].sum)
+        self.assertEqual(1, self.metrics.decode_times['ComposedNode'].count)
+
+    def test_parse_time(self):
+        options = rsd_base.ClientOptions(metrics=self.metrics)
+        conn = rsd_base.ClientConnector(self.instrumented_conn, options)
+        node_inst = node.Node(conn, '/redfish/v1/Nodes/Node1')
+        node_inst.refresh()
+        self.assertEqual(2, self.metrics.parse_times['ComposedNode'].count)
+
+    def test_action(self):
+        self.conn.post.return_value = mock.Mock(status_code=204, content=b'')
+        self.conn.post.return_value.json.side_effect = ValueError
+        response = self.instrumented_conn.post(
+            '/redfish/v1/Nodes/Node1/Actions/ComposedNode.Assemble')
+        self.assertIs(self.conn.post.return_value, response)
+        self.assertEqual({('POST', 'ComposedNode', 204): 1},
+                         dict(self.metrics.requests))
+        self.assertEqual({}, self.metrics.decode_times)
+
+    def test_errors(self):
+        response = mock.Mock(status_code=404)
+        response.json.return_value = {}
+        self.conn.delete.side_effect = exceptions.HTTPError(
+            'DELETE', '/redfish/v1/Nodes/Node2', response)
+        self.assertRaises(exceptions.HTTPError,
+                          self.instrumented_conn.delete,
+                          '/redfish/v1/Nodes/Node2')
+
+        self.conn.get.side_effect = exceptions.ConnectionError(
+            url='/redfish/v1/Nodes/Node1', error='refused')
+        self.assertRaises(exceptions.ConnectionError,
+                          self.instrumented_conn.get,
+                          '/redfish/v1/Nodes/Node1')
+
+        self.assertEqual({('DELETE', 'unknown', 404): 1,
+                          ('GET', 'unknown', None): 1},
+                         dict(self.metrics.requests))
+
+    def test_getattr(self):
+        self.assertIs(self.conn.close, self.instrumented_conn.close)
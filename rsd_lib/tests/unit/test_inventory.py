@@ -0,0 +1,151 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+
+import mock
+from sushy import exceptions
+import testtools
+
+from rsd_lib import inventory
+from rsd_lib.resources.v2_3.storage_service import storage_service
+from rsd_lib.tests.unit.fakes import request_fakes
+
+
+def _load(name):
+    with open('rsd_lib/tests/unit/json_samples/%s' % name, 'r') as f:
+        return json.loads(f.read())
+
+
+class InventoryTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(InventoryTestCase, self).setUp()
+        root = _load('v2_3/root.json')
+        for name in ('Systems', 'Chassis', 'Managers', 'Fabrics'):
+            root.pop(name)
+        self.bodies = {
+            '/redfish/v1/': root,
+            '/redfish/v1/StorageServices':
+                _load('v2_3/storage_service_collection.json'),
+            '/redfish/v1/StorageServices/NVMeoE1':
+                _load('v2_3/storage_service.json'),
+            '/redfish/v1/StorageServices/1/Volumes':
+                _load('v2_3/volume_collection.json'),
+            '/redfish/v1/StorageServices/NVMeoE1/Volumes/1':
+                _load('v2_3/volume.json'),
+            '/redfish/v1/Nodes': {
+                '@odata.id': '/redfish/v1/Nodes',
+                'Members': [
+                    {'@odata.id': '/redfish/v1/StorageServices/NVMeoE1/'
+                                  'Volumes/1'}]},
+        }
+        self.requests = collections.Counter()
+        self.conn = mock.Mock()
+        self.conn.get.side_effect = self._get
+
+    def _get(self, path, *args, **kwargs):
+        self.requests[path] += 1
+        if path not in self.bodies:
+            raise exceptions.ConnectionError(url=path, error='boom')
+        return request_fakes.fake_request_get(self.bodies[path])
+
+    def test_get_key(self):
+        self.assertEqual('/redfish/v1/Nodes/1',
+                         inventory.get_key('https://podm:8443/redfish/v1/'
+                                           'Nodes/1/'))
+        self.assertEqual('/redfish/v1/Systems/1',
+                         inventory.get_key('/redfish/v1/Systems/1#/Oem'))
+        self.assertEqual('/', inventory.get_key('/'))
+
+    def test_iter_links(self):
+        body = {'@odata.id': '/a',
+                'Links': {'Oem': {'Items': [{'@odata.id': '/b'},
+                                            {'@odata.id': '/c'}]}},
+                'Members': [{'@odata.id': '/d'}]}
+        self.assertEqual(['/b', '/c', '/d'],
+                         sorted(inventory.iter_links(body)))
+
+    def test_crawl(self):
+        inv = inventory.crawl(self.conn, max_workers=2)
+
+        self.assertIn('/redfish/v1/StorageServices/NVMeoE1/Volumes/1', inv)
+        self.assertIn('/redfish/v1/', inv)
+        self.assertEqual('1.1.0', inv.redfish_version)
+        # Shared resources are fetched once
+        self.assertEqual(
+            1, self.requests['/redfish/v1/StorageServices/NVMeoE1/Volumes/1'])
+        self.assertEqual([1], list(set(self.requests.values())))
+        # Links outside the inventory aren't followed
+        self.assertNotIn('/redfish/v1/EventService', self.requests)
+        self.assertIn('/redfish/v1/StorageServices/1/StoragePools',
+                      inv.failures)
+        self.assertIsInstance(
+            inv.failures['/redfish/v1/StorageServices/1/StoragePools'],
+            exceptions.ConnectionError)
+
+    def test_crawl_invalid_json(self):
+        invalid = mock.Mock()
+        invalid.json.side_effect = ValueError('No JSON object')
+        self.conn.get.side_effect = lambda path, *args, **kwargs: (
+            invalid if path == '/redfish/v1/StorageServices/NVMeoE1'
+            else self._get(path))
+        inv = inventory.crawl(self.conn)
+
+        self.assertIsInstance(
+            inv.failures['/redfish/v1/StorageServices/NVMeoE1'],
+            inventory.InvalidBodyError)
+        self.assertIn('/redfish/v1/Nodes', inv)
+
+    def test_crawl_with_root_json(self):
+        inv = inventory.crawl(self.conn, root_json=self.bodies['/redfish/v1/'],
+                              excludes=('/redfish/v1/StorageServices',))
+        self.assertEqual(0, self.requests['/redfish/v1/'])
+        self.assertEqual(0, self.requests['/redfish/v1/StorageServices'])
+        self.assertIn('/redfish/v1/Nodes', inv)
+
+    def test_find(self):
+        inv = inventory.crawl(self.conn)
+        self.assertEqual(['/redfish/v1/StorageServices/NVMeoE1/Volumes/1'],
+                         inv.find('Volume'))
+        self.assertEqual([], inv.find('Drive'))
+
+    def test_materialize(self):
+        inv = inventory.crawl(self.conn)
+        self.conn.get.reset_mock()
+
+        service = inv.materialize(storage_service.StorageService,
+                                  '/redfish/v1/StorageServices/NVMeoE1')
+        volumes = service.volumes.get_members()
+        self.assertEqual('1.1.0', service.redfish_version)
+        self.assertEqual(['1'], [v.identity for v in volumes])
+        self.assertFalse(self.conn.get.called)
+
+        # Actions are sent through the crawling connector
+        volumes[0].delete()
+        self.conn.delete.assert_called_once_with(
+            '/redfish/v1/StorageServices/NVMeoE1/Volumes/1', data=None,
+            headers=None)
+
+    def test_materialize_offline(self):
+        inv = inventory.Inventory()
+        inv.add('/redfish/v1/StorageServices/NVMeoE1',
+                self.bodies['/redfish/v1/StorageServices/NVMeoE1'])
+        service = inv.materialize(storage_service.StorageService,
+                                  '/redfish/v1/StorageServices/NVMeoE1/')
+        self.assertEqual('NVMeoE1', service.identity)
+        self.assertRaises(exceptions.ResourceNotFoundError,
+                          getattr, service, 'volumes')
@@ -19,6 +19,9 @@ import mock
 from sushy import connector
 import testtools
 
+from rsd_lib import cache
+from rsd_lib import connector as rsd_connector
+from rsd_lib import instrumentation
 from rsd_lib import main
 from rsd_lib.resources import v2_1
 from rsd_lib.resources import v2_2
@@ -41,30 +44,130 @@ class RSDLibTestCase(testtools.TestCase):
         self.rsd._parse_attributes()
         self.assertEqual("2.1.0", self.rsd._rsd_api_version)
         self.assertEqual("1.0.2", self.rsd._redfish_version)
+        self.assertFalse(self.rsd._expand_query)
+
+    def test_expand_query(self):
+        self.assertFalse(self.rsd._options.expand_query)
+
+        self.rsd.json['ProtocolFeaturesSupported'] = {
+            'ExpandQuery': {'ExpandAll': False, 'NoLinks': True}}
+        self.rsd._parse_attributes()
+        self.assertTrue(self.rsd._expand_query)
+
+    def test_lazy_fields(self):
+        self.assertFalse(self.rsd._options.lazy_fields)
+
+    @mock.patch.object(connector, 'Connector', autospec=True)
+    def test_cache(self, mock_connector):
+        mock_connector.return_value = self.conn
+        resource_cache = cache.ResourceCache(ttl=60)
+        rsd = main.RSDLib('http://foo.bar:8442', cache=resource_cache)
+        self.assertIsInstance(rsd._conn._conn, cache.CachingConnector)
+        self.assertIs(resource_cache, rsd._conn.cache)
+        self.assertIn('/redfish/v1/', resource_cache)
+
+    @mock.patch.object(connector, 'Connector', autospec=True)
+    def test_metrics(self, mock_connector):
+        mock_connector.return_value = self.conn
+        self.conn.get.return_value.status_code = 200
+        self.conn.get.return_value.content = b'{}'
+        metrics = instrumentation.MetricsRegistry()
+        resource_cache = cache.ResourceCache(ttl=60)
+        rsd = main.RSDLib('http://foo.bar:8442', cache=resource_cache,
+                          metrics=metrics)
+
+        self.assertIs(metrics, rsd._options.metrics)
+        self.assertIsInstance(rsd._conn._conn._conn,
+                              instrumentation.InstrumentedConnector)
+        self.assertEqual({('GET', 'ServiceRoot', 200): 1},
+                         dict(metrics.requests))
+
+        # The versioned root is parsed from the body already fetched
+        rsd.factory()
+        self.assertEqual(1, metrics.parse_times['ServiceRoot'].count)
+        self.assertEqual(1, sum(metrics.requests.values()))
+
+    def test_metrics_disabled(self):
+        self.assertIsNone(self.rsd._options.metrics)
+
+    @mock.patch.object(rsd_connector, 'configure', autospec=True)
+    @mock.patch.object(connector, 'Connector', autospec=True)
+    def test_http_options(self, mock_connector, mock_configure):
+        mock_connector.return_value = self.conn
+        main.RSDLib('http://foo.bar:8442', pool_size=40, timeout=30,
+                    max_retries=3)
+        mock_configure.assert_called_once_with(
+            self.conn, pool_size=40, pool_block=False, keep_alive=True,
+            timeout=30, max_retries=3, backoff_factor=0)
+
+    @mock.patch.object(rsd_connector, 'configure', autospec=True)
+    @mock.patch.object(connector, 'Connector', autospec=True)
+    def test_connector(self, mock_connector, mock_configure):
+        rsd = main.RSDLib('http://foo.bar:8442', connector=self.conn,
+                          lazy_fields=True)
+        self.assertIs(self.conn, rsd._conn._conn)
+        self.assertIs(rsd._conn, rsd.factory()._conn)
+        # The options are kept by the client, not set on the connector
+        self.assertIs(rsd._options, rsd._conn.client_options)
+        self.assertNotIsInstance(self.conn.lazy_fields, bool)
+        mock_connector.assert_not_called()
+        mock_configure.assert_not_called()
+
+    @mock.patch.object(rsd_connector, 'configure', autospec=True)
+    @mock.patch.object(connector, 'Connector', autospec=True)
+    def test_session_auth(self, mock_connector, mock_configure):
+        conn = mock_connector.return_value
+        conn.get.return_value.json.return_value = self.rsd.json
+        conn.post.return_value.headers = {
+            'X-Auth-Token': 'token1',
+            'Location': '/redfish/v1/SessionService/Sessions/1'}
+        rsd = main.RSDLib('http://foo.bar:8442', username='foo',
+                          password='bar', session_auth=True)
+
+        mock_connector.assert_called_once_with('http://foo.bar:8442',
+                                               verify=True)
+        self.assertIsInstance(rsd._conn._conn,
+                              rsd_connector.SessionConnector)
+        conn.post.assert_called_once_with(
+            path='/redfish/v1/SessionService/Sessions',
+            data={'UserName': 'foo', 'Password': 'bar'},
+            headers={'X-Auth-Token': None})
+        # The sushy SessionAuth sets the token of the connector
+        conn.set_http_session_auth.assert_called_once_with('token1')
+        conn.get.assert_called_once_with(path='/redfish/v1/', data=None,
+                                         headers=None)
+
+        rsd.close()
+        conn.delete.assert_called_once_with(
+            '/redfish/v1/SessionService/Sessions/1')
+        conn.close.assert_called_once_with()
 
     @mock.patch.object(v2_3, 'RSDLibV2_3', autospec=True)
     @mock.patch.object(v2_2, 'RSDLibV2_2', autospec=True)
     @mock.patch.object(v2_1, 'RSDLibV2_1', autospec=True)
     def test_factory(self, mock_rsdlibv2_1, mock_rsdlibv2_2, mock_rsdlibv2_3):
-        self.rsd.factory()
-        mock_rsdlibv2_1.assert_called_once_with(
-            self.rsd._conn,
-            self.rsd._root_prefix,
-            redfish_version=self.rsd._redfish_version)
-
-        self.rsd._rsd_api_version = "2.2.0"
-        self.rsd.factory()
-        mock_rsdlibv2_2.assert_called_once_with(
-            self.rsd._conn,
-            self.rsd._root_prefix,
-            redfish_version=self.rsd._redfish_version)
-
-        self.rsd._rsd_api_version = "2.3.0"
-        self.rsd.factory()
-        mock_rsdlibv2_3.assert_called_once_with(
-            self.rsd._conn,
-            self.rsd._root_prefix,
-            redfish_version=self.rsd._redfish_version)
+        for api_version, mock_root_class in (("2.1.0", mock_rsdlibv2_1),
+                                             ("2.2.0", mock_rsdlibv2_2),
+                                             ("2.3.0", mock_rsdlibv2_3)):
+            self.rsd._rsd_api_version = api_version
+            root = self.rsd.factory()
+            self.assertIs(mock_root_class.return_value, root)
+            mock_root_class.assert_called_once_with(
+                mock.ANY, self.rsd._root_prefix,
+                redfish_version=self.rsd._redfish_version)
+            conn = mock_root_class.call_args[0][0]
+            self.assertIs(self.rsd._conn, conn._conn)
+            self.assertIs(self.rsd._conn, root._conn)
+
+    def test_factory_single_fetch(self):
+        rsd = self.rsd.factory()
+        self.assertIsInstance(rsd, v2_1.RSDLibV2_1)
+        self.assertIs(self.rsd._conn, rsd._conn)
+        self.assertEqual('/redfish/v1/Systems', rsd._systems_path)
+        self.conn.get.assert_called_once_with(path='/redfish/v1/')
+
+        rsd.refresh()
+        self.assertEqual(2, self.conn.get.call_count)
 
     def test_factory_unsupported_version(self):
         self.rsd._rsd_api_version = "10.0.0"
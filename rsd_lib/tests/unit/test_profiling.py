@@ -0,0 +1,115 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import testtools
+
+import rsd_lib
+from rsd_lib import instrumentation
+from rsd_lib import profiling
+from rsd_lib.tests.emulator import pod
+from rsd_lib.tests.emulator import server
+
+
+class RequestProfilerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(RequestProfilerTestCase, self).setUp()
+        self.metrics = instrumentation.MetricsRegistry()
+
+    def _get(self, path, latency=0.01):
+        self.metrics.observe_request('GET', path, None, 200, latency)
+
+    def test_get_uri_template(self):
+        self.assertEqual('/redfish/v1/Nodes/{id}',
+                         profiling.get_uri_template(
+                             'http://podm:8443/redfish/v1/Nodes/Node1/'))
+        self.assertEqual('/redfish/v1/Systems/{id}/Processors/{id}',
+                         profiling.get_uri_template(
+                             '/redfish/v1/Systems/System1/Processors/CPU1'))
+        self.assertEqual('/redfish/v1/Nodes/{id}/Actions/'
+                         'ComposedNode.Assemble',
+                         profiling.get_uri_template(
+                             '/redfish/v1/Nodes/1/Actions/'
+                             'ComposedNode.Assemble'))
+        self.assertEqual('/redfish/v1/Nodes?$expand=.',
+                         profiling.get_uri_template(
+                             '/redfish/v1/Nodes?$expand=.'))
+        self.assertEqual('/redfish/v1/Chassis', profiling.get_uri_template(
+            '/redfish/v1/Chassis'))
+
+    def test_profile(self):
+        self._get('/redfish/v1/Systems/0')
+        with profiling.RequestProfiler(self.metrics,
+                                       threshold=3) as profiler:
+            self._get('/redfish/v1/Nodes')
+            for i in range(3):
+                self._get('/redfish/v1/Nodes/%d' % i)
+                self._get('/redfish/v1/Systems/%d' % i, latency=0.1)
+            self._get('/redfish/v1/Nodes/0')
+            self._get('/redfish/v1/Managers/1')
+            self.metrics.observe_request(
+                'POST', '/redfish/v1/Nodes/1/Actions/ComposedNode.Assemble',
+                None, 204, 0.5)
+        self._get('/redfish/v1/Systems/4')
+
+        self.assertEqual(10, len(profiler.requests))
+        self.assertIsNotNone(profiler.duration)
+        templates = profiler.get_templates()
+        self.assertEqual((4, 0.04),
+                         templates[('GET', '/redfish/v1/Nodes/{id}')])
+        self.assertEqual(('GET', '/redfish/v1/Nodes/{id}'),
+                         list(templates)[0])
+        self.assertEqual(3, templates[('GET',
+                                       '/redfish/v1/Systems/{id}')][0])
+        self.assertEqual({'/redfish/v1/Nodes/0': 2},
+                         dict(profiler.get_repeated()))
+        self.assertEqual(
+            [profiling.Pattern('/redfish/v1/Nodes/{id}', 3,
+                               '/redfish/v1/Nodes'),
+             profiling.Pattern('/redfish/v1/Systems/{id}', 3, None)],
+            profiler.get_patterns())
+
+    def test_report(self):
+        with profiling.RequestProfiler(self.metrics,
+                                       threshold=2) as profiler:
+            self._get('/redfish/v1/Nodes')
+            self._get('/redfish/v1/Nodes/1')
+            self._get('/redfish/v1/Nodes/2')
+            self._get('/redfish/v1/Nodes/2')
+        lines = profiler.report().splitlines()
+
+        self.assertTrue(lines[0].startswith('4 requests in '))
+        self.assertIn('     3     0.030s  GET /redfish/v1/Nodes/{id}', lines)
+        self.assertIn('     2  GET /redfish/v1/Nodes/2', lines)
+        self.assertEqual(['N+1 patterns:',
+                          '     2  GET /redfish/v1/Nodes/{id}',
+                          '        members of GET /redfish/v1/Nodes, read '
+                          'them from the expanded collection'], lines[-3:])
+
+    def test_rsdlib(self):
+        with server.PodmEmulator(pod.generate(systems=4, nodes=4)) as emulator:
+            rsd = rsd_lib.RSDLib(emulator.url,
+                                 metrics=self.metrics).factory()
+            with profiling.RequestProfiler(self.metrics,
+                                           threshold=4) as profiler:
+                nodes = rsd.get_node_collection()
+                [node_inst.system for node_inst in nodes.get_members()]
+
+        self.assertEqual([profiling.Pattern('/redfish/v1/Nodes/{id}', 4,
+                                            '/redfish/v1/Nodes'),
+                          profiling.Pattern('/redfish/v1/Systems/{id}', 4,
+                                            None)],
+                         profiler.get_patterns())
+        self.assertEqual([], self.metrics._listeners)
@@ -0,0 +1,129 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+from sushy import connector
+from sushy import exceptions
+import testtools
+
+import rsd_lib
+from rsd_lib import recording
+from rsd_lib.tests.emulator import pod
+from rsd_lib.tests.emulator import server
+from rsd_lib import utils
+
+
+class RecordingTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(RecordingTestCase, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'podm.json.gz')
+        self.conn = mock.Mock(_url='http://podm:8443')
+        self.recording_conn = recording.RecordingConnector(self.conn,
+                                                           self.path)
+
+    def _read(self):
+        with gzip.open(self.path, 'rb') as f:
+            return [json.loads(line.decode('utf-8')) for line in f]
+
+    def test_record(self):
+        self.conn.get.return_value = utils.JsonResponse(
+            {'Id': 'Node1'}, headers={'ETag': 'W/"1"', 'Server': 'PODM'})
+        self.conn.post.return_value = utils.JsonResponse(
+            None, 201, headers={'Location': '/redfish/v1/Nodes/Node2',
+                                'X-Auth-Token': 'secret'})
+        response = self.recording_conn.get('/redfish/v1/Nodes/Node1')
+        self.assertEqual({'Id': 'Node1'}, response.json())
+        self.recording_conn.post('/redfish/v1/Nodes/Actions/Allocate',
+                                 data={'Name': 'Node2', 'Password': 'pwd'},
+                                 headers={'X-Auth-Token': 'secret'})
+        self.recording_conn.close()
+        self.conn.close.assert_called_once_with()
+
+        header, get, post = self._read()
+        self.assertEqual({'version': 1, 'base_url': 'http://podm:8443'},
+                         header)
+        self.assertEqual(
+            ('GET', '/redfish/v1/Nodes/Node1', 200, {'ETag': 'W/"1"'},
+             {'Id': 'Node1'}),
+            (get['method'], get['path'], get['status_code'],
+             get['response_headers'], get['body']))
+        self.assertEqual({'Name': 'Node2', 'Password': '***'}, post['data'])
+        self.assertEqual({'X-Auth-Token': '***'}, post['headers'])
+        self.assertEqual({'Location': '/redfish/v1/Nodes/Node2',
+                          'X-Auth-Token': '***'}, post['response_headers'])
+
+    def test_replay(self):
+        responses = [utils.JsonResponse({'Id': 'Node1', 'Power': 'On'}),
+                     utils.JsonResponse({'Id': 'Node1', 'Power': 'Off'})]
+        self.conn.get.side_effect = responses
+        self.conn.delete.side_effect = exceptions.ResourceNotFoundError(
+            'DELETE', '/redfish/v1/Nodes/Node2', utils.JsonResponse(
+                {'error': {'code': 'Base.1.0.ResourceMissingAtURI'}}, 404))
+        for _i in range(2):
+            self.recording_conn.get('/redfish/v1/Nodes/Node1')
+        self.assertRaises(exceptions.ResourceNotFoundError,
+                          self.recording_conn.delete,
+                          '/redfish/v1/Nodes/Node2')
+        self.recording_conn.close()
+
+        replay_conn = recording.ReplayConnector(self.path)
+        # The responses are replayed in order, then the last one repeats
+        self.assertEqual(
+            ['On', 'Off', 'Off'],
+            [replay_conn.get('/redfish/v1/Nodes/Node1/').json()['Power']
+             for _i in range(3)])
+        error = self.assertRaises(exceptions.ResourceNotFoundError,
+                                  replay_conn.delete,
+                                  '/redfish/v1/Nodes/Node2')
+        self.assertEqual('Base.1.0.ResourceMissingAtURI', error.code)
+        self.assertRaises(recording.MissingRecordError, replay_conn.get,
+                          '/redfish/v1/Nodes/Node3')
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_replay_latency(self, mock_sleep):
+        self.conn.get.return_value = utils.JsonResponse({})
+        self.recording_conn.get('/redfish/v1/Nodes')
+        self.recording_conn.close()
+
+        recording.ReplayConnector(self.path).get('/redfish/v1/Nodes')
+        self.assertFalse(mock_sleep.called)
+        recording.ReplayConnector(self.path, emulate_latency=True).get(
+            '/redfish/v1/Nodes')
+        self.assertEqual(1, mock_sleep.call_count)
+
+    def test_rsdlib(self):
+        with server.PodmEmulator(pod.generate(systems=2)) as emulator:
+            conn = recording.RecordingConnector(
+                connector.Connector(emulator.url), self.path)
+            rsd = rsd_lib.RSDLib(emulator.url, connector=conn).factory()
+            nodes = [node.identity for node in
+                     rsd.get_node_collection().get_members()]
+            conn.close()
+
+        # The emulator is gone
+        rsd = rsd_lib.RSDLib(
+            'http://podm:8443',
+            connector=recording.ReplayConnector(self.path)).factory()
+        self.assertEqual(nodes, [node.identity for node in
+                                 rsd.get_node_collection().get_members()])
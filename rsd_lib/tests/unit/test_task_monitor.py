@@ -0,0 +1,186 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import threading
+
+from concurrent import futures
+import mock
+from sushy import exceptions
+import testtools
+
+from rsd_lib.resources.v2_1.node import node
+from rsd_lib.resources.v2_3.storage_service import volume
+from rsd_lib import task_monitor
+from rsd_lib import utils
+
+
+class SchedulerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(SchedulerTestCase, self).setUp()
+        self.scheduler = task_monitor.Scheduler(interval=0)
+        self.addCleanup(self.scheduler.close)
+
+    def test_watch(self):
+        results = iter([(False, None), (False, None), (True, 'done')])
+        poll = mock.Mock(side_effect=lambda: next(results))
+        future = self.scheduler.watch(poll)
+
+        self.assertEqual('done', future.result(timeout=5))
+        self.assertEqual(3, poll.call_count)
+
+    def test_watch_backoff(self):
+        scheduler = task_monitor.Scheduler(interval=1, max_interval=3)
+        operation = task_monitor._Operation(
+            mock.Mock(return_value=(False, None)), None, futures.Future(),
+            1, None)
+        with mock.patch.object(scheduler, '_schedule',
+                               autospec=True) as mock_schedule:
+            for _i in range(3):
+                scheduler._poll(operation)
+        self.assertEqual([mock.call(operation, 2), mock.call(operation, 3),
+                          mock.call(operation, 3)],
+                         mock_schedule.call_args_list)
+
+    def test_watch_error(self):
+        future = self.scheduler.watch(
+            mock.Mock(side_effect=exceptions.ConnectionError(
+                url='/redfish/v1/Nodes/Node1', error='refused')))
+        self.assertRaises(exceptions.ConnectionError, future.result,
+                          timeout=5)
+
+    def test_watch_timeout(self):
+        scheduler = task_monitor.Scheduler(interval=0.05)
+        self.addCleanup(scheduler.close)
+        poll = mock.Mock(return_value=(False, None))
+        future = scheduler.watch(poll, name='/redfish/v1/Nodes/Node1',
+                                 timeout=0.08)
+
+        self.assertRaises(task_monitor.TaskError, future.result, timeout=5)
+        # At the first interval, then at the deadline
+        self.assertEqual(2, poll.call_count)
+
+    def test_watch_cancel(self):
+        scheduler = task_monitor.Scheduler(interval=0.05)
+        self.addCleanup(scheduler.close)
+        poll = mock.Mock()
+        future = scheduler.watch(poll)
+        self.assertTrue(future.cancel())
+        scheduler._poll(scheduler._heap[0][2])
+        poll.assert_not_called()
+
+    def test_watch_closed(self):
+        self.scheduler.close()
+        self.assertRaises(RuntimeError, self.scheduler.watch, mock.Mock())
+
+    def test_close_pending(self):
+        scheduler = task_monitor.Scheduler(interval=60)
+        future = scheduler.watch(mock.Mock(),
+                                 name='/redfish/v1/Nodes/Node1')
+        scheduler.close()
+        self.assertRaises(task_monitor.TaskError, future.result, timeout=0)
+
+    def test_close_while_polling(self):
+        scheduler = task_monitor.Scheduler(interval=0)
+        closed = threading.Event()
+
+        def _poll():
+            scheduler.close()
+            closed.set()
+            return False, None
+
+        future = scheduler.watch(_poll)
+        self.assertTrue(closed.wait(5))
+        self.assertRaises(task_monitor.TaskError, future.result, timeout=5)
+
+    def test_watch_task(self):
+        conn = mock.Mock()
+        conn.get.side_effect = [utils.JsonResponse(None, 202),
+                                utils.JsonResponse({}, 200)]
+        response = utils.JsonResponse(
+            None, 202, {'Location': '/redfish/v1/TaskService/Tasks/1'})
+        future = self.scheduler.watch_task(conn, response)
+
+        self.assertEqual(200, future.result(timeout=5).status_code)
+        conn.get.assert_called_with(path='/redfish/v1/TaskService/Tasks/1')
+        self.assertEqual(2, conn.get.call_count)
+
+    def test_watch_task_not_accepted(self):
+        response = utils.JsonResponse(None, 204)
+        future = self.scheduler.watch_task(mock.Mock(), response)
+        self.assertIs(response, future.result(timeout=0))
+
+
+class WatchTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(WatchTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.scheduler = task_monitor.Scheduler(interval=0)
+        self.addCleanup(self.scheduler.close)
+
+    def _get_resource(self, resource_class, sample, path, states):
+        with open('rsd_lib/tests/unit/json_samples/' + sample, 'r') as f:
+            body = json.loads(f.read())
+        self.conn.get.return_value = utils.JsonResponse(body)
+        resource = resource_class(self.conn, path)
+        self.conn.get.side_effect = [
+            utils.JsonResponse(dict(body, **state)) for state in states]
+        return resource
+
+    def test_watch_assembly(self):
+        node_inst = self._get_resource(
+            node.Node, 'v2_1/node.json', '/redfish/v1/Nodes/Node1',
+            [{'ComposedNodeState': 'Assembling'},
+             {'ComposedNodeState': 'Assembled'}])
+        future = task_monitor.watch_assembly(node_inst,
+                                             scheduler=self.scheduler)
+        self.assertIs(node_inst, future.result(timeout=5))
+
+    def test_watch_assembly_failed(self):
+        node_inst = self._get_resource(
+            node.Node, 'v2_1/node.json', '/redfish/v1/Nodes/Node1',
+            [{'ComposedNodeState': 'Failed'}])
+        future = task_monitor.watch_assembly(node_inst,
+                                             scheduler=self.scheduler)
+        self.assertRaises(task_monitor.TaskError, future.result, timeout=5)
+
+    def test_watch_volume(self):
+        volume_inst = self._get_resource(
+            volume.Volume, 'v2_3/volume.json',
+            '/redfish/v1/StorageServices/NVMeoE1/Volumes/1',
+            [{'Status': {'State': 'Starting'}},
+             {'Status': {'State': 'Enabled'}}])
+        future = task_monitor.watch_volume(volume_inst,
+                                           scheduler=self.scheduler)
+        self.assertIs(volume_inst, future.result(timeout=5))
+
+    def test_watch_deletion(self):
+        node_inst = self._get_resource(
+            node.Node, 'v2_1/node.json', '/redfish/v1/Nodes/Node1', [{}])
+        self.conn.get.side_effect = [
+            utils.JsonResponse(node_inst.json),
+            exceptions.ResourceNotFoundError(
+                method='GET', url='/redfish/v1/Nodes/Node1',
+                response=mock.MagicMock(status_code=404))]
+        future = task_monitor.watch_deletion(node_inst,
+                                             scheduler=self.scheduler)
+        self.assertIsNone(future.result(timeout=5))
+        self.assertEqual(3, self.conn.get.call_count)
+
+    def test_get_scheduler(self):
+        self.assertIs(task_monitor.get_scheduler(),
+                      task_monitor.get_scheduler())
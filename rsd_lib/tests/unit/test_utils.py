@@ -0,0 +1,50 @@
+# Copyright 2018 Intel, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+import testtools
+
+from rsd_lib.resources.v2_1.node import schemas as node_schemas
+from rsd_lib import utils
+
+
+class ValidateTestCase(testtools.TestCase):
+
+    def test_get_validator_cached(self):
+        validator = utils.get_validator(node_schemas.processor_req_schema)
+        self.assertIs(validator,
+                      utils.get_validator(node_schemas.processor_req_schema))
+        self.assertIsNot(validator,
+                         utils.get_validator(node_schemas.memory_req_schema))
+
+    @mock.patch.object(utils, '_validators', {})
+    def test_get_validator_checks_schema_once(self):
+        schema = {'type': 'integer'}
+        with mock.patch.object(jsonschema.Draft4Validator, 'check_schema',
+                               autospec=True) as mock_check_schema:
+            utils.get_validator(schema)
+            utils.get_validator(schema)
+        mock_check_schema.assert_called_once_with(schema)
+
+    def test_get_validator_invalid_schema(self):
+        self.assertRaises(jsonschema.exceptions.SchemaError,
+                          utils.get_validator, {'type': 'invalid'})
+
+    def test_validate(self):
+        utils.validate(8, node_schemas.total_system_core_req_schema)
+        self.assertRaises(jsonschema.exceptions.ValidationError,
+                          utils.validate, 'invalid',
+                          node_schemas.total_system_core_req_schema)
@@ -13,9 +13,66 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
+_validators = {}
+_validators_lock = threading.Lock()
+
 
 def get_resource_identity(resource):
     if resource is None:
         return None
     else:
         return resource.get('@odata.id')
+
+
+class JsonResponse(object):
+    """A response carrying an already decoded JSON body
+
+    It mimics the parts of the requests library response used by the
+    resources, for connectors answering without a HTTP request.
+    """
+
+    def __init__(self, body, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+def get_validator(schema):
+    """Return the validator of a JSON schema
+
+    The schema is checked and its validator built on first use only, then
+    the validator is reused by every validation against the same schema
+    object.
+
+    :param schema: A JSON schema, e.g. ``node_schemas.processor_req_schema``
+    :returns: A jsonschema validator instance
+    :raises: SchemaError, if the schema itself is invalid
+    """
+    cached = _validators.get(id(schema))
+    if cached is None:
+        # jsonschema is only loaded by the first validation
+        from jsonschema import validators
+
+        validator_class = validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        with _validators_lock:
+            # The schema is kept alive with its validator, its id can't be
+            # reused by another object
+            cached = _validators.setdefault(
+                id(schema), (schema, validator_class(schema)))
+    return cached[1]
+
+
+def validate(instance, schema):
+    """Validate an instance against a JSON schema, like jsonschema.validate
+
+    :param instance: The instance to validate
+    :param schema: A JSON schema, its validator is cached
+    :raises: ValidationError, if the instance is invalid
+    """
+    get_validator(schema).validate(instance)